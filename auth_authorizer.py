@@ -4,8 +4,19 @@
 Custom Lambda Authorizer for API Gateway (REQUEST/TOKEN compatible)
 - Validates HMAC-SHA256 JWT from Authorization header: "Bearer <token>"
 - Returns IAM policy (Allow/Deny) and exposes email in context
+- Keeps verified tokens in an in-container LRU (honoring exp) so repeat calls skip verification
+- Emits one structured JSON log line per decision, sampled for Allow
 
 No external libraries; uses only Python stdlib.
+
+Environment:
+- AUTH_CACHE_SIZE      : max verified tokens kept per container (default: 1024, 0 disables)
+- AUTH_LOG_MODE        : all / sampled / off (default: sampled; Deny is always logged unless off)
+- AUTH_LOG_SAMPLE_RATE : fraction of Allow decisions logged in sampled mode (default: 0.01)
+- AUTH_POLICY_SCOPE    : method / stage (default: stage, as in template.yaml). With "stage", Allow
+                         policies cover every method and path of the stage, so API Gateway's
+                         authorizer result cache (AuthorizerResultTtl in template.yaml) serves the
+                         whole session. Deny policies always stay scoped to the requested methodArn.
 """
 
 import os
@@ -14,7 +25,19 @@ import time
 import hmac
 import hashlib
 import base64
-from typing import Dict, Any
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+AUTH_CACHE_SIZE = int(os.environ.get("AUTH_CACHE_SIZE", "1024"))
+AUTH_LOG_MODE = os.environ.get("AUTH_LOG_MODE", "sampled").lower()
+AUTH_LOG_SAMPLE_RATE = float(os.environ.get("AUTH_LOG_SAMPLE_RATE", "0.01"))
+AUTH_POLICY_SCOPE = os.environ.get("AUTH_POLICY_SCOPE", "stage").lower()
+
+# sha256(secret + token) -> (payload, exp)
+_token_cache: "OrderedDict[bytes, Tuple[Dict[str, Any], Optional[float]]]" = OrderedDict()
+_cache_lock = threading.Lock()
 
 
 def _b64url_encode(data: bytes) -> str:
@@ -55,6 +78,71 @@ def _jwt_verify(token: str, secret: str) -> Dict[str, Any]:
     return payload
 
 
+def _cache_key(token: str, secret: str) -> bytes:
+    # 秘密鍵を含めるので、鍵を入れ替えると以前の検証結果は使われない
+    return hashlib.sha256(f"{secret}\0{token}".encode("utf-8")).digest()
+
+
+def _cached_verify(token: str, secret: str) -> Tuple[Dict[str, Any], bool]:
+    """Verify with the container LRU in front of _jwt_verify. Returns (payload, cache_hit)."""
+    if AUTH_CACHE_SIZE <= 0:
+        return _jwt_verify(token, secret), False
+    key = _cache_key(token, secret)
+    with _cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            payload, exp = entry
+            if exp is None or time.time() <= exp:
+                _token_cache.move_to_end(key)
+                return payload, True
+            del _token_cache[key]
+    # 期限切れのトークンはここで改めて検証され、token expired になる
+    payload = _jwt_verify(token, secret)
+    exp = payload.get("exp")
+    with _cache_lock:
+        _token_cache[key] = (payload, float(exp) if isinstance(exp, (int, float)) else None)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > AUTH_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload, False
+
+
+def clear_token_cache() -> None:
+    with _cache_lock:
+        _token_cache.clear()
+
+
+def _log(decision: str, started: float, always: bool = False, **fields: Any) -> None:
+    """One JSON line per decision. Allow is sampled; Deny is always logged (unless mode is off)."""
+    if AUTH_LOG_MODE == "off":
+        return
+    if AUTH_LOG_MODE == "sampled" and not always and random.random() >= AUTH_LOG_SAMPLE_RATE:
+        return
+    record = {
+        "logger": "authorizer",
+        "decision": decision,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        **fields,
+    }
+    if AUTH_LOG_MODE == "sampled" and not always:
+        record["sample_rate"] = AUTH_LOG_SAMPLE_RATE
+    print(json.dumps(record, separators=(",", ":")))
+
+
+def _allow_resource(method_arn: str) -> str:
+    """Resource for Allow policies.
+
+    methodArn: arn:aws:execute-api:{region}:{account}:{api_id}/{stage}/{METHOD}/{path...}
+    stage scope -> arn:aws:execute-api:{region}:{account}:{api_id}/{stage}/*/*
+    """
+    if AUTH_POLICY_SCOPE != "stage" or not method_arn or method_arn == "*":
+        return method_arn or "*"
+    parts = method_arn.split("/", 2)
+    if len(parts) < 2:
+        return method_arn
+    return f"{parts[0]}/{parts[1]}/*/*"
+
+
 def _generate_policy(principal_id: str, effect: str, resource: str, context: Dict[str, Any]):
     if effect not in ("Allow", "Deny"):
         effect = "Deny"
@@ -77,16 +165,16 @@ def _generate_policy(principal_id: str, effect: str, resource: str, context: Dic
 
 def lambda_handler(event, context):  # noqa: D401
     """Entry point for API Gateway Lambda Authorizer."""
+    started = time.perf_counter()
     secret = os.environ.get("JWT_SECRET", "")
     if not secret:
         # If no secret configured, deny by default
-        print("[Authorizer] missing JWT_SECRET")
+        _log("Deny", started, always=True, reason="no_secret", type=event.get("type"))
         return _generate_policy("anonymous", "Deny", event.get("methodArn", "*"), {"reason": "no_secret"})
 
     # Support TOKEN and REQUEST authorizer inputs
     token = None
     if isinstance(event, dict):
-        print(f"[Authorizer] invoked type={event.get('type')} keys={list(event.keys())[:6]}")
         token = event.get("authorizationToken")
         # TOKENタイプでは authorizationToken に "Bearer ..." がそのまま入るケースがある
         if token and token.lower().startswith("bearer "):
@@ -99,16 +187,14 @@ def lambda_handler(event, context):  # noqa: D401
                 token = authz.split(" ", 1)[1].strip()
 
     if not token:
-        print("[Authorizer] no token found")
+        _log("Deny", started, always=True, reason="no_token", type=event.get("type"))
         return _generate_policy("anonymous", "Deny", event.get("methodArn", "*"), {"reason": "no_token"})
 
     try:
-        payload = _jwt_verify(token, secret)
-        email = payload.get("sub") or payload.get("email") or "user"
-        print(f"[Authorizer] verified email={email}")
-        return _generate_policy(email, "Allow", event.get("methodArn", "*"), {"email": email})
+        payload, cache_hit = _cached_verify(token, secret)
     except Exception as e:  # pylint: disable=broad-except
-        print(f"[Authorizer] verification failed: {e}")
+        _log("Deny", started, always=True, reason=str(e), type=event.get("type"))
         return _generate_policy("anonymous", "Deny", event.get("methodArn", "*"), {"reason": str(e)})
-
-
+    email = payload.get("sub") or payload.get("email") or "user"
+    _log("Allow", started, cache="hit" if cache_hit else "miss", type=event.get("type"))
+    return _generate_policy(email, "Allow", _allow_resource(event.get("methodArn", "*")), {"email": email})
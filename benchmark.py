@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+YFinance API ベンチマークツール
+Lambda関数のコールドスタートなど、ネットワークに依存しない性能指標を計測する
+
+使用例:
+  python benchmark.py imports                 # ルート別のimport時間プロファイル
+  python benchmark.py imports --runs 5 --top 15
+  python benchmark.py dispatch                # ルート解決のオーバーヘッド（旧if/elifチェーンとの比較）
+  python benchmark.py authorizer              # Lambda Authorizer の認可スループット（キャッシュ・ログ設定別）
+  python benchmark.py login                   # パスワード検証のログイン数/秒（ハッシュ設定 × Lambdaメモリ別の推定）
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+from typing import Dict, List, Optional, Tuple
+
+# 計測シナリオ: 新しいPythonプロセスで「モジュール読み込み + 最初の1リクエスト」を実行する
+# （ネットワークやDynamoDBに到達する前に応答が返るイベントのみを使用）
+IMPORT_SCENARIOS = {
+    'module_only': None,
+    'auth_login': {'resource': '/auth/login', 'httpMethod': 'POST', 'body': '{}'},
+    'swagger_ui': {'resource': '/', 'httpMethod': 'GET', 'headers': {'Host': 'localhost'}},
+    'ticker_price_400': {'resource': '/ticker/price', 'httpMethod': 'GET', 'queryStringParameters': {}},
+}
+
+HEAVY_MODULES = ['yfinance', 'pandas', 'numpy', 'matplotlib', 'mplfinance', 'feedparser', 'boto3', 'botocore']
+
+
+def _scenario_code(module: str, event) -> str:
+    code = [
+        'import sys, time, json',
+        't0 = time.perf_counter()',
+        f'import {module} as m',
+        't1 = time.perf_counter()',
+    ]
+    if event is not None:
+        code.append(f'm.lambda_handler(json.loads({json.dumps(json.dumps(event))}), None)')
+    code += [
+        't2 = time.perf_counter()',
+        f'heavy = [n for n in {HEAVY_MODULES!r} if n in sys.modules]',
+        'print("@@" + json.dumps({"import_ms": (t1 - t0) * 1000, "first_request_ms": (t2 - t1) * 1000, "heavy": heavy}))',
+    ]
+    return '\n'.join(code)
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, float, int]]:
+    """-X importtime の出力を (モジュール名, 累積ms, 階層) のリストに変換
+
+    インタプリタ起動時の import（site まで）は計測対象外とする
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip(' '))) // 2
+            rows.append((name.strip(), int(cumulative) / 1000.0, depth))
+        except ValueError:
+            continue
+    startup_end = max((i for i, row in enumerate(rows) if row[0] == 'site' and row[2] <= 1), default=-1)
+    return rows[startup_end + 1:]
+
+
+def profile_imports(module: str = 'lambda_function', runs: int = 3, top: int = 10) -> Dict[str, Dict]:
+    """シナリオごとにコールドプロセスを起動し、import時間（モジュール別ms）を計測する"""
+    env = dict(os.environ)
+    env.pop('USERS_TABLE', None)  # DynamoDBに到達させない
+    report = {}
+    for name, event in IMPORT_SCENARIOS.items():
+        totals, firsts, heavy = [], [], []
+        per_module: Dict[str, List[float]] = {}
+        for _ in range(runs):
+            proc = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', _scenario_code(module, event)],
+                capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__))
+            )
+            marker = [l for l in proc.stdout.splitlines() if l.startswith('@@')]
+            if proc.returncode != 0 or not marker:
+                raise RuntimeError(f'{name}: 計測プロセスが失敗しました\n{proc.stderr[-2000:]}')
+            stats = json.loads(marker[-1][2:])
+            totals.append(stats['import_ms'])
+            firsts.append(stats['first_request_ms'])
+            heavy = stats['heavy']
+            # 最上位（ユーザーコードから直接importされた）モジュールの累積時間を集計
+            for mod, cumulative_ms, depth in _parse_importtime(proc.stderr):
+                if depth <= 1:
+                    per_module.setdefault(mod, []).append(cumulative_ms)
+        modules = sorted(((m, statistics.median(v)) for m, v in per_module.items()), key=lambda x: x[1], reverse=True)
+        report[name] = {
+            'import_ms': round(statistics.median(totals), 1),
+            'first_request_ms': round(statistics.median(firsts), 1),
+            'heavy_modules_loaded': heavy,
+            'top_modules_ms': [{'module': m, 'ms': round(ms, 1)} for m, ms in modules[:top]],
+        }
+    return report
+
+
+def _print_import_report(report: Dict[str, Dict]) -> None:
+    for name, stats in report.items():
+        print(f"\n=== {name} ===")
+        print(f"モジュール読み込み: {stats['import_ms']:.1f} ms / 初回リクエスト: {stats['first_request_ms']:.1f} ms")
+        print(f"読み込まれた重量モジュール: {', '.join(stats['heavy_modules_loaded']) or 'なし'}")
+        for row in stats['top_modules_ms']:
+            print(f"  {row['ms']:>9.1f} ms  {row['module']}")
+
+
+# 旧 lambda_handler の部分一致チェーン（評価順どおり）。dispatch ベンチマークの比較対象
+LEGACY_CHAIN = [
+    ('/auth/register', 'POST'), ('/auth/login', 'POST'), ('/user/me', 'GET'), ('/user/me', 'PUT'),
+    ('/search', None), ('/tickerDetail', None), ('/ticker/basic', None), ('/ticker/price', None),
+    ('/ticker/history', None), ('/ticker/financials', None), ('/ticker/analysts', None),
+    ('/ticker/holders', None), ('/ticker/events', None), ('/ticker/news', None), ('/ticker/options', None),
+    ('/ticker/sustainability', None), ('/chart', None), ('/home', None), ('/news/rss', None),
+    ('/rankings/stocks', None), ('/rankings/sectors', None), ('/rankings/crypto', None),
+    ('/markets/overview', None), ('/markets/indices', None), ('/markets/currencies', None), ('/markets/commodities', None),
+    ('/markets/status', None),
+]
+
+
+def _legacy_match(resource: str, method: str) -> Optional[int]:
+    if resource == '/' or resource == '':
+        return -1
+    for i, (fragment, required_method) in enumerate(LEGACY_CHAIN):
+        if fragment in resource and (required_method is None or method == required_method):
+            return i
+    return None
+
+
+def profile_dispatch(number: int = 200000) -> Dict[str, Dict]:
+    """ルートごとに「旧チェーン」と「(resource, method) テーブル」の解決時間を計測する（ns/回）"""
+    from yfinance_api.routes import ROUTES, find_route
+
+    report = {}
+    for resource, method in ROUTES:
+        legacy = min(timeit.repeat(lambda: _legacy_match(resource, method), number=number, repeat=3))
+        table = min(timeit.repeat(lambda: find_route(resource, method), number=number, repeat=3))
+        report[f'{method} {resource}'] = {
+            'legacy_ns': round(legacy / number * 1e9, 1),
+            'table_ns': round(table / number * 1e9, 1),
+        }
+    return report
+
+
+def _print_dispatch_report(report: Dict[str, Dict]) -> None:
+    print(f"{'route':<32} {'legacy(ns)':>11} {'table(ns)':>10} {'speedup':>8}")
+    for name, stats in report.items():
+        speedup = stats['legacy_ns'] / stats['table_ns'] if stats['table_ns'] else 0
+        print(f"{name:<32} {stats['legacy_ns']:>11.1f} {stats['table_ns']:>10.1f} {speedup:>7.1f}x")
+    legacy_avg = statistics.mean(s['legacy_ns'] for s in report.values())
+    table_avg = statistics.mean(s['table_ns'] for s in report.values())
+    print(f"{'平均':<30} {legacy_avg:>11.1f} {table_avg:>10.1f} {legacy_avg / table_avg:>7.1f}x")
+
+
+# (AUTH_CACHE_SIZE, AUTH_LOG_MODE): before は従来動作（毎回検証・毎回ログ出力）に相当
+AUTHORIZER_SCENARIOS = {
+    'before': (0, 'all'),
+    'cache_only': (1024, 'all'),
+    'after': (1024, 'sampled'),
+}
+
+
+def profile_authorizer(number: int = 20000, sessions: int = 50) -> Dict[str, Dict]:
+    """同じトークンが繰り返し届く状況（sessions 人が交互にアクセス）での認可数/秒を計測する
+
+    ログは /dev/null に捨てるため、CloudWatch への書き込みコストは含まない。
+    """
+    import auth_authorizer
+    from yfinance_api.auth import _jwt_sign
+
+    secret = 'benchmark-secret'
+    os.environ['JWT_SECRET'] = secret
+    events = [
+        {
+            'type': 'REQUEST',
+            'methodArn': 'arn:aws:execute-api:ap-northeast-1:123456789012:abcdef/prod/GET/user/base',
+            'headers': {'Authorization': f"Bearer {_jwt_sign({'sub': f'user{i}@example.com'}, secret)}"},
+        }
+        for i in range(sessions)
+    ]
+
+    report = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for name, (cache_size, log_mode) in AUTHORIZER_SCENARIOS.items():
+            auth_authorizer.AUTH_CACHE_SIZE = cache_size
+            auth_authorizer.AUTH_LOG_MODE = log_mode
+            auth_authorizer.clear_token_cache()
+            calls = iter(range(10 ** 12))
+
+            def authorize():
+                auth_authorizer.lambda_handler(events[next(calls) % sessions], None)
+
+            elapsed = min(timeit.repeat(authorize, number=number, repeat=3))
+            report[name] = {
+                'auth_per_sec': round(number / elapsed),
+                'us_per_auth': round(elapsed / number * 1e6, 2),
+            }
+    return report
+
+
+def _print_authorizer_report(report: Dict[str, Dict]) -> None:
+    base = report['before']['auth_per_sec']
+    print(f"{'scenario':<12} {'auth/s':>10} {'us/auth':>9} {'speedup':>8}")
+    for name, stats in report.items():
+        print(f"{name:<12} {stats['auth_per_sec']:>10} {stats['us_per_auth']:>9.2f} "
+              f"{stats['auth_per_sec'] / base:>7.1f}x")
+
+
+# 比較するパスワードハッシュ設定（現在の環境変数の設定も 'current' として加える）
+LOGIN_POLICIES = {
+    'pbkdf2_100k': {'algo': 'pbkdf2_sha256', 'iter': 100_000},
+    'pbkdf2_310k': {'algo': 'pbkdf2_sha256', 'iter': 310_000},
+    'pbkdf2_600k': {'algo': 'pbkdf2_sha256', 'iter': 600_000},
+    'scrypt_n14': {'algo': 'scrypt', 'n': 2 ** 14, 'r': 8, 'p': 1},
+    'scrypt_n15': {'algo': 'scrypt', 'n': 2 ** 15, 'r': 8, 'p': 1},
+}
+# Lambda は 1769MB で 1 vCPU 相当、それ未満はメモリに比例した CPU が割り当てられる
+LAMBDA_FULL_VCPU_MB = 1769
+LAMBDA_MEMORY_SIZES = [256, 512, 1024, 1769]
+
+
+def profile_login(runs: int = 5, memory_sizes: Optional[List[int]] = None) -> Dict[str, Dict]:
+    """ハッシュ設定ごとにパスワード検証1回の時間を計測し、Lambdaメモリ別のログイン数/秒を推定する
+
+    推定値 = 手元の1コアでの検証数/秒 × min(1, メモリ / 1769MB)。
+    ハッシュ計算は1スレッドで完結するため、1769MB を超えても1リクエストあたりの速度は上がらない。
+    """
+    from yfinance_api.auth import _hash_password, _verify_password, password_hash_policy
+
+    memory_sizes = memory_sizes or LAMBDA_MEMORY_SIZES
+    policies = dict(LOGIN_POLICIES, current=password_hash_policy())
+    report = {}
+    for name, policy in policies.items():
+        stored = _hash_password('benchmark-password', policy=policy)
+        elapsed = min(timeit.repeat(lambda: _verify_password('benchmark-password', stored), number=1, repeat=runs))
+        per_sec = 1 / elapsed
+        report[name] = {
+            'policy': policy,
+            'ms_per_login': round(elapsed * 1000, 2),
+            'logins_per_sec': {
+                str(mb): round(per_sec * min(1.0, mb / LAMBDA_FULL_VCPU_MB), 1) for mb in memory_sizes
+            },
+        }
+    return report
+
+
+def _print_login_report(report: Dict[str, Dict]) -> None:
+    sizes = list(next(iter(report.values()))['logins_per_sec'])
+    print(f"{'policy':<14} {'ms/login':>9} " + ' '.join(f"{s + 'MB':>9}" for s in sizes) + '  (logins/s 推定)')
+    for name, stats in report.items():
+        print(f"{name:<14} {stats['ms_per_login']:>9.2f} "
+              + ' '.join(f"{stats['logins_per_sec'][s]:>9.1f}" for s in sizes))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='YFinance API ベンチマークツール',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    subparsers = parser.add_subparsers(dest='command', help='計測対象')
+
+    imports_parser = subparsers.add_parser('imports', help='コールドスタート時のimport時間をルート別に計測')
+    imports_parser.add_argument('--module', default='lambda_function', help='ハンドラーモジュール名')
+    imports_parser.add_argument('--runs', type=int, default=3, help='計測回数（中央値を表示）')
+    imports_parser.add_argument('--top', type=int, default=10, help='表示するモジュール数')
+    imports_parser.add_argument('--json', action='store_true', help='JSONで出力')
+
+    dispatch_parser = subparsers.add_parser('dispatch', help='ルート解決のオーバーヘッドを旧if/elifチェーンと比較')
+    dispatch_parser.add_argument('--number', type=int, default=200000, help='1計測あたりの解決回数')
+    dispatch_parser.add_argument('--json', action='store_true', help='JSONで出力')
+
+    authorizer_parser = subparsers.add_parser('authorizer', help='Lambda Authorizer の認可スループットを計測')
+    authorizer_parser.add_argument('--number', type=int, default=20000, help='1計測あたりの認可回数')
+    authorizer_parser.add_argument('--sessions', type=int, default=50, help='交互にアクセスするユーザー数（トークン数）')
+    authorizer_parser.add_argument('--json', action='store_true', help='JSONで出力')
+
+    login_parser = subparsers.add_parser('login', help='パスワード検証のログイン数/秒をハッシュ設定・メモリ別に計測')
+    login_parser.add_argument('--runs', type=int, default=5, help='計測回数（最小値を採用）')
+    login_parser.add_argument('--memory', type=int, nargs='*', help='推定するLambdaメモリ（MB）')
+    login_parser.add_argument('--json', action='store_true', help='JSONで出力')
+
+    args = parser.parse_args()
+    if args.command == 'imports':
+        report = profile_imports(args.module, args.runs, args.top)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            _print_import_report(report)
+    elif args.command == 'dispatch':
+        report = profile_dispatch(args.number)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            _print_dispatch_report(report)
+    elif args.command == 'authorizer':
+        report = profile_authorizer(args.number, args.sessions)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            _print_authorizer_report(report)
+    elif args.command == 'login':
+        report = profile_login(args.runs, args.memory)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            _print_login_report(report)
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
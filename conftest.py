@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture
+def dynamo_tables(monkeypatch):
+    """moto 上に取引・保有テーブルを作り、環境変数とテーブルキャッシュを差し替える"""
+    boto3 = pytest.importorskip('boto3')
+    moto = pytest.importorskip('moto')
+    from yfinance_api.dynamo import reset_dynamodb_cache
+
+    for name, value in {
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'TRANSACTIONS_TABLE': 'test-Transactions',
+        'HOLDINGS_TABLE': 'test-Holdings',
+    }.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv('DYNAMODB_ENDPOINT_URL', raising=False)
+
+    with moto.mock_aws():
+        resource = boto3.resource('dynamodb')
+        for table_name, sort_key in (('test-Transactions', 'sk'), ('test-Holdings', 'symbol')):
+            resource.create_table(
+                TableName=table_name,
+                KeySchema=[{'AttributeName': 'email', 'KeyType': 'HASH'},
+                           {'AttributeName': sort_key, 'KeyType': 'RANGE'}],
+                AttributeDefinitions=[{'AttributeName': 'email', 'AttributeType': 'S'},
+                                      {'AttributeName': sort_key, 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST',
+            )
+        reset_dynamodb_cache()
+        yield resource
+    reset_dynamodb_cache()
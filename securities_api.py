@@ -3,22 +3,41 @@
 
 from __future__ import annotations
 
-import os
 import json
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from typing import Any, Dict, List, Optional, Tuple
 import uuid
 
 from botocore.exceptions import ClientError
 
 # 既存のユーザー管理・JWT・DynamoDBユーティリティを再利用
-from lambda_function import (  # type: ignore
+from yfinance_api.auth import (  # type: ignore
     _get_users_table,
     _get_authorized_email,
     _get_json_body,
     handle_auth_login,
     handle_auth_register,
 )
+from yfinance_api.holdings import (  # type: ignore
+    OversellError,
+    delete_all_holdings,
+    list_holdings,
+    record_transaction,
+)
+from yfinance_api.transactions import (  # type: ignore
+    delete_all_transactions,
+    parse_page_parameters,
+    query_transactions,
+)
+from yfinance_api.user_items import (  # type: ignore
+    UserItem,
+    call_table,
+    capacity_debug_enabled,
+    consumed_capacity,
+    get_user_attributes,
+    reset_consumed_capacity,
+)
 
 
 # =============
@@ -33,11 +52,20 @@ def _cors_headers() -> Dict[str, str]:
     }
 
 
-def _response(status: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+def _json_default(value: Any) -> Any:
+    # DynamoDB の数値は Decimal で返る
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _response(status: int, payload: Any) -> Dict[str, Any]:
     return {
         "statusCode": status,
         "headers": _cors_headers(),
-        "body": json.dumps(payload, ensure_ascii=False),
+        "body": json.dumps(payload, ensure_ascii=False, default=_json_default),
     }
 
 
@@ -56,36 +84,21 @@ def _method(event: Dict[str, Any]) -> str:
 # =============
 # データモデル（DynamoDB 上のユーザーアイテム内に格納）
 # =============
-def _ensure_user(email: str) -> Dict[str, Any]:
-    table = _get_users_table()
-    res = table.get_item(Key={"email": email})
-    if "Item" in res and res["Item"]:
-        return res["Item"]
-    # 未登録であれば最小項目で作成
-    item = {
-        "email": email,
-        "name": "",
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat(),
-        "profile": {},
-        "base": {},
-        "securities": {},
-        "holdings": [],
-        "favorites": [],
-        "transactions": [],
-    }
-    table.put_item(Item=item)
-    return item
-
-
 def _require_auth_email(event: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
     email = _get_authorized_email(event)
     if not email:
         return None, _response(401, {"error": "未認証です"})
-    _ensure_user(email)
     return email, None
 
 
+def _require_auth_user(event: Dict[str, Any]) -> Tuple[Optional[UserItem], Optional[Dict[str, Any]]]:
+    """認証済みユーザーのアイテムローダー（読み込みは get() / route() を呼んだときだけ）"""
+    email, err = _require_auth_email(event)
+    if err:
+        return None, err
+    return UserItem(email, _get_users_table()), None
+
+
 # =============
 # ルート実装
 # =============
@@ -124,20 +137,17 @@ def _handle_user_login(event: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _handle_user_base_get(event: Dict[str, Any]) -> Dict[str, Any]:
-    email, err = _require_auth_email(event)
+    user, err = _require_auth_user(event)
     if err:
         return err
-    table = _get_users_table()
-    res = table.get_item(Key={"email": email})
-    user = res.get("Item") or {}
-    base = user.get("base") or {}
+    base = user.route("user_base")["base"] or {}
     # email フィールドは常に返す
-    base_out = {"email": email, **base}
+    base_out = {"email": user.email, **base}
     return _response(200, base_out)
 
 
 def _handle_user_base_put(event: Dict[str, Any]) -> Dict[str, Any]:
-    email, err = _require_auth_email(event)
+    user, err = _require_auth_user(event)
     if err:
         return err
     data = _get_json_body(event)
@@ -151,12 +161,11 @@ def _handle_user_base_put(event: Dict[str, Any]) -> Dict[str, Any]:
         "phone_number",
     }
     incoming = {k: v for k, v in (data or {}).items() if k in allowed}
-    table = _get_users_table()
-    cur = table.get_item(Key={"email": email}).get("Item") or {}
-    base = {**(cur.get("base") or {}), **incoming}
+    base = {**(user.route("user_base")["base"] or {}), **incoming}
     base["updated_at"] = datetime.utcnow().isoformat()
-    table.update_item(
-        Key={"email": email},
+    call_table(
+        user.table, "update_item", "user_base",
+        Key={"email": user.email},
         UpdateExpression="SET #b = :b, updated_at = :u",
         ExpressionAttributeNames={"#b": "base"},
         ExpressionAttributeValues={":b": base, ":u": datetime.utcnow().isoformat()},
@@ -173,37 +182,42 @@ def _handle_user_base_delete_via_post(event: Dict[str, Any]) -> Dict[str, Any]:
         return _response(400, {"error": "confirm=true が必要です"})
     table = _get_users_table()
     try:
-        table.delete_item(Key={"email": email})
+        call_table(table, "delete_item", "user_base", Key={"email": email})
         return _response(202, {"status": "accepted", "message": "削除を受け付けました"})
     except ClientError as e:
         return _response(500, {"error": e.response.get("Error", {}).get("Message", str(e))})
 
 
 def _handle_user_securities(event: Dict[str, Any]) -> Dict[str, Any]:
-    email, err = _require_auth_email(event)
+    user, err = _require_auth_user(event)
     if err:
         return err
     method = _method(event)
-    table = _get_users_table()
     if method == "GET":
-        d = table.get_item(Key={"email": email}).get("Item") or {}
-        return _response(200, d.get("securities") or {})
+        return _response(200, user.route("user_securities")["securities"] or {})
     data = _get_json_body(event) or {}
     if method in ("POST", "PUT"):
-        d = table.get_item(Key={"email": email}).get("Item") or {}
-        new_val = {**(d.get("securities") or {}), **data}
-        table.update_item(
-            Key={"email": email},
+        new_val = {**(user.route("user_securities")["securities"] or {}), **data}
+        call_table(
+            user.table, "update_item", "user_securities",
+            Key={"email": user.email},
             UpdateExpression="SET securities = :s, updated_at = :u",
             ExpressionAttributeValues={":s": new_val, ":u": datetime.utcnow().isoformat()},
         )
         return _response(200, new_val)
     if method == "DELETE":
-        table.update_item(
-            Key={"email": email},
-            UpdateExpression="REMOVE securities SET updated_at = :u",
-            ExpressionAttributeValues={":u": datetime.utcnow().isoformat()},
-        )
+        # アイテムが無ければ消すものも無い（読み込みも作成もしない）
+        try:
+            call_table(
+                user.table, "update_item", "user_securities",
+                Key={"email": user.email},
+                UpdateExpression="REMOVE securities SET updated_at = :u",
+                ConditionExpression="attribute_exists(email)",
+                ExpressionAttributeValues={":u": datetime.utcnow().isoformat()},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
         return _no_content()
     return _response(405, {"error": "method not allowed"})
 
@@ -212,85 +226,184 @@ def _handle_user_holdings_get(event: Dict[str, Any]) -> Dict[str, Any]:
     email, err = _require_auth_email(event)
     if err:
         return err
-    table = _get_users_table()
-    d = table.get_item(Key={"email": email}).get("Item") or {}
-    return _response(200, d.get("holdings") or [])
+    q = event.get("queryStringParameters") or {}
+    include_closed = str(q.get("include_closed", "0")).lower() in ("1", "true", "yes")
+    return _response(200, list_holdings(email, include_closed))
 
 
-def _handle_user_favorites(event: Dict[str, Any], symbol: Optional[str]) -> Dict[str, Any]:
+def _handle_user_portfolio_valuation(event: Dict[str, Any]) -> Dict[str, Any]:
     email, err = _require_auth_email(event)
+    if err:
+        return err
+    # pandas / yfinance は評価APIを呼んだときだけ読み込む
+    from yfinance_api.portfolio import get_portfolio_valuation
+
+    return _response(200, get_portfolio_valuation(email))
+
+
+def _favorite_symbols(item: Dict[str, Any]) -> List[str]:
+    """お気に入りシンボル（文字列セット + 旧形式のリスト）"""
+    symbols = set(item.get("favorite_symbols") or [])
+    symbols.update(x.get("symbol") for x in (item.get("favorites") or []) if x.get("symbol"))
+    return sorted(symbols)
+
+
+def _migrate_legacy_favorites(table: Any, email: str) -> None:
+    """旧形式の favorites（[{symbol}] のリスト）を文字列セット favorite_symbols へ移す
+
+    読み取った時点のリストと一致する場合だけ置き換える（同時更新で失われないよう条件付き）。
+    """
+    item = get_user_attributes(table, email, ("favorites",), label="user_favorites") or {}
+    legacy = item.get("favorites") or []
+    symbols = {x.get("symbol") for x in legacy if x.get("symbol")}
+    try:
+        if symbols:
+            call_table(
+                table, "update_item", "user_favorites",
+                Key={"email": email},
+                UpdateExpression="ADD favorite_symbols :s REMOVE favorites",
+                ConditionExpression="favorites = :old",
+                ExpressionAttributeValues={":s": symbols, ":old": legacy},
+            )
+        else:
+            call_table(
+                table, "update_item", "user_favorites",
+                Key={"email": email},
+                UpdateExpression="REMOVE favorites",
+                ConditionExpression="favorites = :old",
+                ExpressionAttributeValues={":old": legacy},
+            )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+
+
+def _update_favorites(table: Any, email: str, action: str, sym: str) -> None:
+    """favorite_symbols に1シンボルだけ ADD / DELETE する（1回の書き込み）
+
+    旧形式の favorites リストが残っている場合は条件で弾かれるので、移行してから再実行する。
+    """
+    params = {
+        "Key": {"email": email},
+        # アイテムが無い場合はここで作られるので created_at も補う
+        "UpdateExpression": f"{action} favorite_symbols :s SET updated_at = :u, created_at = if_not_exists(created_at, :u)",
+        "ConditionExpression": "attribute_not_exists(favorites) OR size(favorites) = :zero",
+        "ExpressionAttributeValues": {":s": {sym}, ":u": datetime.utcnow().isoformat(), ":zero": 0},
+    }
+    try:
+        call_table(table, "update_item", "user_favorites", **params)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+        _migrate_legacy_favorites(table, email)
+        call_table(table, "update_item", "user_favorites", **params)
+
+
+def _favorites_with_quotes(symbols: List[str]) -> List[Dict[str, Any]]:
+    """お気に入りに価格・前日比を付ける（全銘柄を1回の一括取得で、ランキングとキャッシュ共有）"""
+    from yfinance_api.quotes import get_quote_snapshots
+
+    snapshots, errors = get_quote_snapshots(symbols)
+    rows = []
+    for sym in symbols:
+        snap = snapshots.get(sym.upper())
+        if snap is None:
+            rows.append({"symbol": sym, "error": errors.get(sym.upper(), "価格データが見つかりません")})
+            continue
+        rows.append({
+            "symbol": sym,
+            "price": snap["price"],
+            "previous_close": snap["previous_close"],
+            "change": snap["change"],
+            "change_percent": snap["change_percent"],
+            "as_of": snap["as_of"],
+        })
+    return rows
+
+
+def _handle_user_favorites(event: Dict[str, Any], symbol: Optional[str]) -> Dict[str, Any]:
+    user, err = _require_auth_user(event)
     if err:
         return err
     method = _method(event)
-    table = _get_users_table()
+    email, table = user.email, user.table
     if method == "GET" and symbol is None:
-        d = table.get_item(Key={"email": email}).get("Item") or {}
-        return _response(200, d.get("favorites") or [])
+        symbols = _favorite_symbols(user.route("user_favorites"))
+        q = event.get("queryStringParameters") or {}
+        if str(q.get("with_quotes", "0")).lower() in ("1", "true", "yes"):
+            return _response(200, _favorites_with_quotes(symbols))
+        return _response(200, [{"symbol": s} for s in symbols])
     if method == "POST" and symbol is None:
         data = _get_json_body(event) or {}
         sym = (data.get("symbol") or "").strip().upper()
         if not sym:
             return _response(400, {"error": "symbol は必須です"})
-        d = table.get_item(Key={"email": email}).get("Item") or {}
-        favs: List[Dict[str, Any]] = list(d.get("favorites") or [])
-        if all(x.get("symbol") != sym for x in favs):
-            favs.append({"symbol": sym})
-            table.update_item(
-                Key={"email": email},
-                UpdateExpression="SET favorites = :f, updated_at = :u",
-                ExpressionAttributeValues={":f": favs, ":u": datetime.utcnow().isoformat()},
-            )
+        _update_favorites(table, email, "ADD", sym)
         return _response(201, {"status": "created"})
     if method == "DELETE" and symbol:
         sym = symbol.strip().upper()
-        d = table.get_item(Key={"email": email}).get("Item") or {}
-        favs: List[Dict[str, Any]] = [x for x in (d.get("favorites") or []) if x.get("symbol") != sym]
-        table.update_item(
-            Key={"email": email},
-            UpdateExpression="SET favorites = :f, updated_at = :u",
-            ExpressionAttributeValues={":f": favs, ":u": datetime.utcnow().isoformat()},
-        )
+        if sym:
+            _update_favorites(table, email, "DELETE", sym)
         return _no_content()
     return _response(405, {"error": "method not allowed"})
 
 
+def _parse_number(value: Any) -> Optional[Decimal]:
+    """リクエストの数値を Decimal にする（数値でない・NaN / Infinity・真偽値は None）"""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        return None
+    return number if number.is_finite() else None
+
+
 def _handle_user_transactions(event: Dict[str, Any]) -> Dict[str, Any]:
     email, err = _require_auth_email(event)
     if err:
         return err
     method = _method(event)
-    table = _get_users_table()
     if method == "GET":
-        d = table.get_item(Key={"email": email}).get("Item") or {}
-        return _response(200, d.get("transactions") or [])
+        params, perr = parse_page_parameters(event.get("queryStringParameters") or {})
+        if perr:
+            return _response(400, {"error": perr})
+        try:
+            return _response(200, query_transactions(email, **params))
+        except ValueError as e:
+            return _response(400, {"error": str(e)})
     if method == "POST":
         data = _get_json_body(event) or {}
         for req in ("symbol", "quantity", "side"):
-            if req not in data:
+            if data.get(req) is None:
                 return _response(400, {"error": f"{req} は必須です"})
+        side = str(data.get("side")).upper()
+        if side not in ("BUY", "SELL"):
+            return _response(400, {"error": "side は BUY または SELL を指定してください"})
+        quantity = _parse_number(data.get("quantity"))
+        if quantity is None or quantity != quantity.to_integral_value() or quantity <= 0:
+            return _response(400, {"error": "quantity は1以上の整数で指定してください"})
+        price = None
+        if data.get("price") is not None:
+            price = _parse_number(data.get("price"))
+            if price is None or price <= 0:
+                return _response(400, {"error": "price は0より大きい数値で指定してください"})
         txn = {
             "id": str(uuid.uuid4()),
             "symbol": str(data.get("symbol")).upper(),
-            "price": float(data.get("price")) if data.get("price") is not None else None,
-            "quantity": int(data.get("quantity")),
-            "type": str(data.get("side")).upper(),
+            "price": price,
+            "quantity": int(quantity),
+            "type": side,
             "timestamp": datetime.utcnow().isoformat(),
         }
-        d = table.get_item(Key={"email": email}).get("Item") or {}
-        txns: List[Dict[str, Any]] = list(d.get("transactions") or [])
-        txns.append(txn)
-        table.update_item(
-            Key={"email": email},
-            UpdateExpression="SET transactions = :t, updated_at = :u",
-            ExpressionAttributeValues={":t": txns, ":u": datetime.utcnow().isoformat()},
-        )
-        return _response(201, txn)
+        try:
+            holding = record_transaction(email, txn)
+        except OversellError as e:
+            return _response(400, {"error": str(e)})
+        return _response(201, {**txn, "holding": holding})
     if method == "DELETE":
-        table.update_item(
-            Key={"email": email},
-            UpdateExpression="SET transactions = :t, updated_at = :u",
-            ExpressionAttributeValues={":t": [], ":u": datetime.utcnow().isoformat()},
-        )
+        delete_all_transactions(email)
+        delete_all_holdings(email)
         return _no_content()
     return _response(405, {"error": "method not allowed"})
 
@@ -319,6 +432,18 @@ def _handle_symbol_get(symbol: str) -> Dict[str, Any]:
 # エントリポイント
 # =============
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:  # noqa: D401
+    if not capacity_debug_enabled():
+        return _route(event)
+    reset_consumed_capacity()
+    response = _route(event)
+    capacity = consumed_capacity()
+    response.setdefault("headers", {})["X-DynamoDB-Consumed-Capacity"] = str(capacity["capacity_units"])
+    print(json.dumps({"logger": "dynamodb", "path": _path(event), "method": _method(event), **capacity},
+                     ensure_ascii=False))
+    return response
+
+
+def _route(event: Dict[str, Any]) -> Dict[str, Any]:
     method = _method(event)
     path = _path(event)
 
@@ -347,6 +472,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:  # no
     if path == "/user/holdings" and method == "GET":
         return _handle_user_holdings_get(event)
 
+    if path == "/user/portfolio/valuation" and method == "GET":
+        return _handle_user_portfolio_valuation(event)
+
     if path == "/user/favorites" and method in ("GET", "POST"):
         return _handle_user_favorites(event, None)
 
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from yfinance_api.downsample import downsample_history, lttb_indices, ohlc_bucket_downsample
+
+
+def _history(n):
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(size=n))
+    return pd.DataFrame(
+        {
+            'Open': close + rng.normal(size=n),
+            'High': close + 2,
+            'Low': close - 2,
+            'Close': close,
+            'Volume': rng.integers(1, 1000, size=n),
+        },
+        index=pd.date_range('2024-01-01', periods=n, freq='D'),
+    )
+
+
+@pytest.mark.parametrize('n_out', [None, 5, 10, 0])
+def test_lttb_returns_all_points_when_not_reducing(n_out):
+    np.testing.assert_array_equal(lttb_indices(np.arange(5.0), n_out), np.arange(5))
+
+
+def test_lttb_threshold_two_keeps_endpoints():
+    np.testing.assert_array_equal(lttb_indices(np.arange(50.0), 2), [0, 49])
+
+
+def test_lttb_threshold_three_picks_extreme_middle_point():
+    y = np.zeros(21)
+    y[7] = 10.0
+    np.testing.assert_array_equal(lttb_indices(y, 3), [0, 7, 20])
+
+
+@pytest.mark.parametrize('n_out', [3, 4, 17, 99])
+def test_lttb_indices_are_strictly_increasing_with_endpoints(n_out):
+    y = _history(100)['Close'].to_numpy()
+    idx = lttb_indices(y, n_out)
+    assert len(idx) == n_out
+    assert idx[0] == 0 and idx[-1] == 99
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_ohlc_bucket_aggregates_each_bucket():
+    hist = _history(10)
+    out = ohlc_bucket_downsample(hist, 3)
+    assert len(out) == 3
+    # np.arange(10) * 3 // 10 -> バケット [0:4], [4:7], [7:10]
+    for row, (lo, hi) in enumerate([(0, 4), (4, 7), (7, 10)]):
+        chunk = hist.iloc[lo:hi]
+        assert out.index[row] == chunk.index[0]
+        assert out['Open'].iloc[row] == chunk['Open'].iloc[0]
+        assert out['High'].iloc[row] == chunk['High'].max()
+        assert out['Low'].iloc[row] == chunk['Low'].min()
+        assert out['Close'].iloc[row] == chunk['Close'].iloc[-1]
+        assert out['Volume'].iloc[row] == chunk['Volume'].sum()
+
+
+@pytest.mark.parametrize('n_out', [10, 20, 0])
+def test_ohlc_bucket_returns_history_unchanged_when_not_reducing(n_out):
+    hist = _history(10)
+    assert ohlc_bucket_downsample(hist, n_out) is hist
+
+
+@pytest.mark.parametrize('method', ['lttb', 'ohlc'])
+def test_downsample_history_respects_max_points(method):
+    hist = _history(200)
+    for max_points in (2, 3, 50):
+        assert len(downsample_history(hist, max_points, method)) <= max_points
+    assert downsample_history(hist, 500, method) is hist
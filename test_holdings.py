@@ -0,0 +1,110 @@
+from decimal import Decimal
+
+import pytest
+
+from yfinance_api.holdings import (
+    OversellError,
+    apply_transaction,
+    compute_holdings,
+    list_holdings,
+    rebuild_holdings,
+    record_transaction,
+)
+
+EMAIL = 'user@example.com'
+
+
+def _txn(n, side, quantity, price=None, symbol='AAPL'):
+    txn = {'id': f'txn-{n}', 'timestamp': f'2025-01-{n:02d}T09:00:00', 'symbol': symbol,
+           'type': side, 'quantity': quantity}
+    if price is not None:
+        txn['price'] = Decimal(str(price))
+    return txn
+
+
+def test_partial_sell_releases_moving_average_cost():
+    state = {}
+    for txn in (_txn(1, 'BUY', 10, 100), _txn(2, 'BUY', 10, 200)):
+        state = apply_transaction(state, txn)
+    assert state['cost_basis'] / state['quantity'] == 150
+
+    state = apply_transaction(state, _txn(3, 'SELL', 5, 300))
+    assert state['quantity'] == 15
+    assert state['cost_basis'] == 2250  # 3000 - 150 * 5
+    assert state['realized_pnl'] == 750  # (300 - 150) * 5
+    # 売却後も平均取得単価は変わらない
+    assert state['cost_basis'] / state['quantity'] == 150
+
+
+def test_selling_everything_releases_the_whole_cost_basis():
+    state = {}
+    for txn in (_txn(1, 'BUY', 3, 100), _txn(2, 'BUY', 3, 101), _txn(3, 'SELL', 1, 90)):
+        state = apply_transaction(state, txn)
+    state = apply_transaction(state, _txn(4, 'SELL', 5, 110))
+    assert state['quantity'] == 0
+    assert state['cost_basis'] == 0
+    # 端数が残らず、実現損益の合計 = 売却代金 - 取得原価
+    assert state['realized_pnl'] == 90 + 5 * 110 - (300 + 303)
+
+
+def test_sell_without_price_records_no_pnl():
+    state = apply_transaction(apply_transaction({}, _txn(1, 'BUY', 4, 100)), _txn(2, 'SELL', 1))
+    assert state == {'quantity': 3, 'cost_basis': 300, 'realized_pnl': 0}
+
+
+def test_oversell_is_rejected():
+    state = apply_transaction({}, _txn(1, 'BUY', 2, 100))
+    with pytest.raises(OversellError):
+        apply_transaction(state, _txn(2, 'SELL', 3, 100))
+
+
+def test_compute_holdings_skips_and_reports_oversells():
+    states, rejected = compute_holdings([
+        _txn(1, 'BUY', 5, 100),
+        _txn(2, 'SELL', 6, 120),
+        _txn(3, 'SELL', 2, 120),
+        _txn(4, 'SELL', 1, 50, symbol='MSFT'),
+        {'id': 'txn-5', 'timestamp': '2025-01-05', 'symbol': 'AAPL', 'type': 'DIVIDEND', 'quantity': 1},
+    ])
+    assert states['AAPL'] == {'quantity': 3, 'cost_basis': 300, 'realized_pnl': 40}
+    assert 'MSFT' not in states
+    assert [r['id'] for r in rejected] == ['txn-2', 'txn-4']
+
+
+def test_record_transaction_updates_holding_and_rejects_oversell(dynamo_tables):
+    record_transaction(EMAIL, _txn(1, 'BUY', 10, 100))
+    record_transaction(EMAIL, _txn(2, 'BUY', 10, 200))
+    holding = record_transaction(EMAIL, _txn(3, 'SELL', 5, 300))
+    assert holding['quantity'] == 15
+    assert holding['average_cost'] == 150
+    assert holding['realized_pnl'] == 750
+
+    with pytest.raises(OversellError):
+        record_transaction(EMAIL, _txn(4, 'SELL', 16, 300))
+    # 拒否された取引は保存されない
+    assert rebuild_holdings(EMAIL, verify=True)['transactions'] == 3
+
+
+def test_rebuild_verify_reports_diffs_without_writing(dynamo_tables):
+    record_transaction(EMAIL, _txn(1, 'BUY', 10, 100))
+    record_transaction(EMAIL, _txn(2, 'SELL', 4, 120))
+    holdings = dynamo_tables.Table('test-Holdings')
+    holdings.update_item(Key={'email': EMAIL, 'symbol': 'AAPL'},
+                         UpdateExpression='SET quantity = :q', ExpressionAttributeValues={':q': 99})
+    holdings.put_item(Item={'email': EMAIL, 'symbol': 'MSFT', 'quantity': 1,
+                            'cost_basis': 10, 'realized_pnl': 0})
+
+    report = rebuild_holdings(EMAIL, verify=True)
+    assert report['transactions'] == 2
+    assert report['rejected'] == []
+    diffs = {d['symbol']: d for d in report['diffs']}
+    assert set(diffs) == {'AAPL', 'MSFT'}
+    assert diffs['AAPL']['expected']['quantity'] == 6
+    assert diffs['AAPL']['stored']['quantity'] == 99
+    assert diffs['MSFT']['expected']['quantity'] == 0
+    # verify では書き込まない
+    assert {h['symbol']: h['quantity'] for h in list_holdings(EMAIL, include_closed=True)} == {'AAPL': 99, 'MSFT': 1}
+
+    assert len(rebuild_holdings(EMAIL)['diffs']) == 2
+    assert rebuild_holdings(EMAIL, verify=True)['diffs'] == []
+    assert [(h['symbol'], h['quantity']) for h in list_holdings(EMAIL)] == [('AAPL', 6)]
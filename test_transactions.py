@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+import pytest
+
+from yfinance_api.holdings import list_holdings
+from yfinance_api.transactions import (
+    decode_cursor,
+    encode_cursor,
+    migrate_embedded_transactions,
+    parse_page_parameters,
+    put_transaction,
+    query_transactions,
+)
+
+EMAIL = 'user@example.com'
+
+
+def _put(email, n):
+    put_transaction(email, {'id': f'txn-{n}', 'timestamp': f'2025-01-{n:02d}T09:00:00',
+                            'symbol': 'AAPL', 'type': 'BUY', 'quantity': 1})
+
+
+def _all_pages(**kwargs):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = query_transactions(EMAIL, cursor=cursor, **kwargs)
+        ids += [t['id'] for t in page['transactions']]
+        pages += 1
+        cursor = page['next_cursor']
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_paging_walks_every_transaction_once(dynamo_tables):
+    for n in range(1, 8):
+        _put(EMAIL, n)
+    _put('other@example.com', 9)
+
+    ids, pages = _all_pages(limit=3)
+    assert ids == [f'txn-{n}' for n in range(1, 8)]
+    assert pages >= 3
+
+    ids, _ = _all_pages(limit=2, descending=True)
+    assert ids == [f'txn-{n}' for n in range(7, 0, -1)]
+
+
+def test_since_until_are_inclusive(dynamo_tables):
+    for n in range(1, 8):
+        _put(EMAIL, n)
+    ids, _ = _all_pages(limit=2, since='2025-01-03', until='2025-01-05')
+    assert ids == ['txn-3', 'txn-4', 'txn-5']
+
+
+def test_cursor_for_another_user_is_rejected(dynamo_tables):
+    for n in range(1, 4):
+        _put(EMAIL, n)
+    cursor = query_transactions(EMAIL, limit=1)['next_cursor']
+    assert decode_cursor(cursor, EMAIL)['email'] == EMAIL
+    with pytest.raises(ValueError):
+        query_transactions('other@example.com', cursor=cursor)
+
+
+@pytest.mark.parametrize('cursor', [
+    'not-a-cursor!',
+    encode_cursor({'email': EMAIL}),
+    encode_cursor({'email': EMAIL, 'sk': 1}),
+    'WzEsMl0',  # [1,2]
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, EMAIL)
+
+
+def test_invalid_date_bound_is_rejected(dynamo_tables):
+    with pytest.raises(ValueError):
+        query_transactions(EMAIL, since='yesterday')
+
+
+def test_parse_page_parameters():
+    params, error = parse_page_parameters({'limit': '20', 'order': 'DESC', 'cursor': 'abc'})
+    assert error is None
+    assert params == {'since': None, 'until': None, 'limit': 20, 'cursor': 'abc', 'descending': True}
+    assert parse_page_parameters(None)[0]['limit'] == 50
+    assert parse_page_parameters({'limit': 'ten'})[1]
+    assert parse_page_parameters({'order': 'newest'})[1]
+
+
+def test_migration_rebuilds_holdings(dynamo_tables):
+    users = dynamo_tables.create_table(
+        TableName='test-Users',
+        KeySchema=[{'AttributeName': 'email', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'email', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    users.put_item(Item={'email': EMAIL, 'transactions': [
+        {'id': 'a', 'timestamp': '2025-01-01T09:00:00', 'symbol': 'AAPL', 'type': 'BUY',
+         'quantity': 4, 'price': Decimal('100')},
+        {'id': 'b', 'timestamp': '2025-01-02T09:00:00', 'symbol': 'AAPL', 'type': 'SELL',
+         'quantity': 1, 'price': Decimal('130')},
+    ]})
+
+    assert migrate_embedded_transactions(users, dry_run=True)['holdings_rebuilt'] == 0
+    assert list_holdings(EMAIL) == []
+
+    stats = migrate_embedded_transactions(users)
+    assert stats['transactions'] == 2 and stats['holdings_rebuilt'] == 1
+    holding, = list_holdings(EMAIL)
+    assert (holding['symbol'], holding['quantity'], holding['realized_pnl']) == ('AAPL', 3, 30)
+    assert 'transactions' not in users.get_item(Key={'email': EMAIL})['Item']
@@ -0,0 +1,18 @@
+"""
+YFinance API パッケージ
+
+ルートグループごとにモジュールを分割し、router が必要なモジュールだけを初回利用時に読み込む。
+
+- router.py    : lambda_handler（薄いルーター）
+- common.py    : JSON変換・バリデーションなどの共通関数
+- auth.py      : /auth/*, /user/me（JWT・パスワードハッシュ・DynamoDB）
+- ticker.py    : /search, /tickerDetail, /ticker/*
+- charts.py    : /chart とランキングチャート（png / svg / json）
+- downsample.py: LTTB / OHLCバケット集約による系列の間引き
+- news.py      : /news/rss
+- rankings.py  : /rankings/*
+- markets.py   : /markets/*
+- home.py      : /home（各グループを統合）
+- docs.py      : Swagger UI（/）
+- display.py   : CLI向けの表示ヘルパー
+"""
@@ -0,0 +1,158 @@
+"""非同期の上流取得層（aiohttp）
+
+検索・RSS・検索結果の価格（v8 chart API）など yfinance を通さない HTTP 取得を、コンテナで1つのイベントループと
+ClientSession（ウォーム起動をまたいで接続を再利用）でまとめて並行実行する。
+スレッドは増やさずに数百件のリクエストを同時に待てる。上流ホストごとのセマフォで
+同じホストへの同時リクエスト数を抑える。送信レートとサーキットブレーカーは upstream.py のものを使う。
+
+既存の get_*_api は同期関数のため、fetch_many() / fetch_json() の同期ラッパーから使う
+（どのスレッドから呼んでもよい。イベントループは専用のバックグラウンドスレッドで動く）。
+タイムアウトはリクエストのデッドラインの残り時間に合わせる。
+
+環境変数:
+- AIO_HOST_CONCURRENCY : 上流ホストごとの同時リクエスト数（既定: 20）
+- AIO_TOTAL_CONCURRENCY: 全体の同時接続数（既定: 100）
+- AIO_REQUEST_TIMEOUT  : 1リクエストのタイムアウト秒（既定: 10）
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from .deadline import fetch_timeout
+from .upstream import UpstreamUnavailable, before_request_async, is_failure_status
+
+AIO_HOST_CONCURRENCY = int(os.environ.get('AIO_HOST_CONCURRENCY', '20'))
+AIO_TOTAL_CONCURRENCY = int(os.environ.get('AIO_TOTAL_CONCURRENCY', '100'))
+AIO_REQUEST_TIMEOUT = float(os.environ.get('AIO_REQUEST_TIMEOUT', '10'))
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+# 以下はイベントループのスレッドからだけ触る
+_session = None
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_host_in_flight: Dict[str, int] = {}
+_stats = {'requests': 0, 'errors': 0, 'in_flight': 0, 'max_in_flight': 0}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """バックグラウンドスレッドで動くイベントループ（初回呼び出し時に起動）"""
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='yfapi-aio', daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+async def _get_session():
+    global _session
+    if _session is None or _session.closed:
+        import aiohttp  # lazy import
+
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=AIO_TOTAL_CONCURRENCY, ttl_dns_cache=300),
+            headers={'User-Agent': USER_AGENT},
+        )
+    return _session
+
+
+def _semaphore(host: str) -> asyncio.Semaphore:
+    semaphore = _semaphores.get(host)
+    if semaphore is None:
+        semaphore = _semaphores[host] = asyncio.Semaphore(AIO_HOST_CONCURRENCY)
+    return semaphore
+
+
+async def _fetch(request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    """1件の GET（ホストの空き待ちも含めて timeout 秒で打ち切る）"""
+    import aiohttp  # lazy import
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    url = request['url']
+    host = urlsplit(url).hostname or ''
+    result: Dict[str, Any] = {'url': url, 'status': None, 'body': None, 'error': None}
+    semaphore = _semaphore(host)
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout)
+    except asyncio.TimeoutError:
+        _stats['errors'] += 1
+        result['error'] = f'タイムアウト（{timeout:.1f}秒、{host} の空き待ち）'
+        return result
+    try:
+        guard = await before_request_async(url)
+    except UpstreamUnavailable as e:
+        semaphore.release()
+        _stats['errors'] += 1
+        result['error'] = str(e)
+        return result
+
+    _stats['requests'] += 1
+    _stats['in_flight'] += 1
+    _stats['max_in_flight'] = max(_stats['max_in_flight'], _stats['in_flight'])
+    _host_in_flight[host] = _host_in_flight.get(host, 0) + 1
+    try:
+        session = await _get_session()
+        client_timeout = aiohttp.ClientTimeout(total=max(deadline - loop.time(), 0.01))
+        async with session.get(url, params=request.get('params'), headers=request.get('headers'),
+                               timeout=client_timeout) as response:
+            result['status'] = response.status
+            result['body'] = await response.read()
+            if response.status >= 400:
+                result['error'] = f'HTTP {response.status}'
+    except asyncio.TimeoutError:
+        result['error'] = f'タイムアウト（{timeout:.1f}秒）'
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    finally:
+        _stats['in_flight'] -= 1
+        _host_in_flight[host] -= 1
+        semaphore.release()
+    guard.record(result['status'] is not None and not is_failure_status(result['status']))
+    if result['error']:
+        _stats['errors'] += 1
+    return result
+
+
+async def _fetch_all(requests: List[Dict[str, Any]], timeout: float) -> List[Dict[str, Any]]:
+    return list(await asyncio.gather(*(_fetch(request, timeout) for request in requests)))
+
+
+def fetch_many(requests: Iterable[Dict[str, Any]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+    """複数の GET を並行に実行して、入力と同じ順に結果を返す（同期ラッパー）
+
+    requests: {'url': ..., 'params': {...}, 'headers': {...}} のリスト
+    戻り値  : {'url', 'status', 'body'(bytes), 'error'} のリスト。失敗は error に入り、例外にはしない
+    タイムアウトは timeout（既定 AIO_REQUEST_TIMEOUT）とデッドラインの残り時間の短い方
+    （期限切れなら DeadlineExceeded）。
+    """
+    requests = list(requests)
+    if not requests:
+        return []
+    timeout = fetch_timeout(AIO_REQUEST_TIMEOUT if timeout is None else timeout)
+    future = asyncio.run_coroutine_threadsafe(_fetch_all(requests, timeout), _get_loop())
+    return future.result()
+
+
+def fetch_json(url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+    """1件の GET の JSON を返す（失敗は RuntimeError）"""
+    result = fetch_many([{'url': url, 'params': params}], timeout=timeout)[0]
+    if result['error']:
+        raise RuntimeError(result['error'])
+    return json.loads(result['body'])
+
+
+def aio_stats() -> Dict[str, Any]:
+    """リクエスト数・エラー数・同時実行数（現在/最大）とホストごとの実行中リクエスト数"""
+    return {
+        **_stats,
+        'host_in_flight': dict(_host_in_flight),
+        'host_concurrency': AIO_HOST_CONCURRENCY,
+    }
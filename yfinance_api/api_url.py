@@ -0,0 +1,114 @@
+"""API GatewayのベースURL解決（コンテナ単位でメモ化）
+
+リクエスト処理中は AWS API を呼ばない。CloudFormation の Outputs は
+prime_api_gateway_url() を初期化時（またはバックグラウンド）に呼んだ場合だけ参照する。
+"""
+
+import os
+import threading
+
+DEFAULT_API_URL = 'https://zwtiey61i2.execute-api.ap-northeast-1.amazonaws.com/prod'
+DEFAULT_STACK_NAME = 'yfinance-api-stack'
+
+_MISSING = object()
+_lock = threading.Lock()
+# 環境変数の値（'' = 未設定）と CloudFormation の取得結果（None = 取得できなかった）を保持
+_env_url = _MISSING
+_stack_url = _MISSING
+_prime_thread = None
+
+
+def _configured_url():
+    global _env_url
+    if _env_url is _MISSING:
+        _env_url = os.environ.get('API_GATEWAY_URL', '') or os.environ.get('AWS_API_GATEWAY_URL', '')
+    return _env_url
+
+
+def _fetch_stack_url(stack_name):
+    """CloudFormation の Outputs から YFinanceApiUrl を取得（失敗時は None）"""
+    try:
+        import boto3
+        from botocore.config import Config
+        cloudformation = boto3.client(
+            'cloudformation',
+            config=Config(connect_timeout=2, read_timeout=2, retries={'max_attempts': 1})
+        )
+        response = cloudformation.describe_stacks(StackName=stack_name)
+        for output in response['Stacks'][0].get('Outputs', []):
+            if output['OutputKey'] == 'YFinanceApiUrl':
+                return output['OutputValue']
+    except Exception as e:
+        print(f"API URL prime failed ({stack_name}): {str(e)}")
+    return None
+
+
+def prime_api_gateway_url(stack_name=None, background=False):
+    """CloudFormation からURLを1回だけ取得してキャッシュする（取得できなかった結果もキャッシュ）
+
+    background=True の場合はデーモンスレッドで取得し、完了を待たずに戻る。
+    """
+    global _prime_thread
+    stack_name = stack_name or os.environ.get('API_STACK_NAME') or DEFAULT_STACK_NAME
+
+    def _prime():
+        global _stack_url
+        url = _fetch_stack_url(stack_name)
+        with _lock:
+            _stack_url = url
+
+    with _lock:
+        if _stack_url is not _MISSING or _prime_thread is not None:
+            return _prime_thread
+        if background:
+            _prime_thread = threading.Thread(target=_prime, name='api-url-prime', daemon=True)
+            _prime_thread.start()
+            return _prime_thread
+    _prime()
+    return None
+
+
+def reset_api_gateway_url_cache():
+    """キャッシュを破棄する（環境変数を変えたテストなど）"""
+    global _env_url, _stack_url, _prime_thread
+    with _lock:
+        _env_url = _MISSING
+        _stack_url = _MISSING
+        _prime_thread = None
+
+
+def get_api_gateway_url(event=None, context=None):
+    """API GatewayのURLを取得する（AWS APIは呼ばない）"""
+    # 1. 環境変数（API_GATEWAY_URL → AWS_API_GATEWAY_URL）
+    api_url = _configured_url()
+    if api_url:
+        return api_url
+
+    # 2. リクエストヘッダーから取得
+    if event:
+        headers = event.get('headers') or {}
+        host = headers.get('Host', '')
+        if host:
+            protocol = 'https' if headers.get('X-Forwarded-Proto') == 'https' else 'http'
+            return f"{protocol}://{host}"
+
+    # 3. 初期化時に CloudFormation から取得済みの値
+    #    （旧実装ではコンテキストの後だったが、コンテキストから作るURLには API ID が入らないため先に使う）
+    stack_url = _stack_url
+    if stack_url is not _MISSING and stack_url:
+        return stack_url
+
+    # 4. Lambdaコンテキストから取得（リージョンのみの推定）
+    if context:
+        try:
+            function_arn = context.invoked_function_arn
+            if function_arn:
+                parts = function_arn.split(':')
+                if len(parts) >= 4:
+                    region = parts[3]
+                    return f"https://execute-api.{region}.amazonaws.com/prod/"
+        except Exception:
+            pass
+
+    # 5. 最後の手段として固定URLを使用
+    return DEFAULT_API_URL
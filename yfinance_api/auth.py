@@ -0,0 +1,296 @@
+"""認証/ユーザー管理（/auth/register, /auth/login, /user/me）
+
+YFinance系のモジュールには依存しないため、認証専用の関数からも単独で読み込める。
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .dynamo import get_table
+from .user_items import call_table, get_route_attributes
+
+
+def _b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64url_decode(data_str: str) -> bytes:
+    padding = '=' * (-len(data_str) % 4)
+    return base64.urlsafe_b64decode(data_str + padding)
+
+
+def _jwt_sign(payload: dict, secret: str, expires_in_seconds: int = 3600) -> str:
+    header = {"alg": "HS256", "typ": "JWT"}
+    now = int(time.time())
+    payload = {
+        **payload,
+        "iat": now,
+        "exp": now + int(expires_in_seconds),
+    }
+    header_b64 = _b64url_encode(json.dumps(header, separators=(',', ':')).encode('utf-8'))
+    payload_b64 = _b64url_encode(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+    signing_input = f"{header_b64}.{payload_b64}".encode('utf-8')
+    sig = hmac.new(secret.encode('utf-8'), signing_input, hashlib.sha256).digest()
+    signature_b64 = _b64url_encode(sig)
+    return f"{header_b64}.{payload_b64}.{signature_b64}"
+
+
+def _get_json_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    body = event.get('body')
+    if not body:
+        return {}
+    if event.get('isBase64Encoded'):
+        try:
+            body = base64.b64decode(body).decode('utf-8')
+        except Exception:
+            return {}
+    try:
+        return json.loads(body)
+    except Exception:
+        return {}
+
+
+def _get_users_table():
+    table_name = os.environ.get('USERS_TABLE', '')
+    if not table_name:
+        raise RuntimeError('USERS_TABLE is not configured')
+    return get_table(table_name)
+
+
+def password_hash_policy() -> Dict[str, Any]:
+    """現在のパスワードハッシュ設定（環境変数から。保存形式と同じキー）
+
+    - PASSWORD_HASH_ALGO          : pbkdf2_sha256 / scrypt（既定: pbkdf2_sha256）
+    - PASSWORD_PBKDF2_ITERATIONS  : PBKDF2 の反復回数（既定: 100000）
+    - PASSWORD_SCRYPT_N / _R / _P : scrypt のコストパラメータ（既定: 16384 / 8 / 1）
+    """
+    algo = os.environ.get('PASSWORD_HASH_ALGO', 'pbkdf2_sha256').lower()
+    if algo == 'scrypt':
+        return {
+            'algo': 'scrypt',
+            'n': int(os.environ.get('PASSWORD_SCRYPT_N', '16384')),
+            'r': int(os.environ.get('PASSWORD_SCRYPT_R', '8')),
+            'p': int(os.environ.get('PASSWORD_SCRYPT_P', '1')),
+        }
+    return {'algo': 'pbkdf2_sha256', 'iter': int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', '100000'))}
+
+
+def _derive(password: str, salt: bytes, params: Dict[str, Any]) -> bytes:
+    if params.get('algo') == 'scrypt':
+        n, r, p = int(params['n']), int(params['r']), int(params['p'])
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                              maxmem=128 * r * (n + p + 2) + 1024 * 1024, dklen=32)
+    if params.get('algo') == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, int(params.get('iter', 100_000)))
+    raise ValueError(f"unsupported password algo: {params.get('algo')}")
+
+
+def _hash_password(password: str, salt: Optional[bytes] = None, iterations: Optional[int] = None,
+                   policy: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """パスワードをハッシュ化する（policy 省略時は password_hash_policy()、iterations 指定時は PBKDF2 固定）"""
+    if salt is None:
+        salt = os.urandom(16)
+    if iterations is not None:
+        policy = {'algo': 'pbkdf2_sha256', 'iter': iterations}
+    params = dict(policy or password_hash_policy())
+    dk = _derive(password, salt, params)
+    return {
+        **params,
+        'salt': base64.b64encode(salt).decode('ascii'),
+        'hash': base64.b64encode(dk).decode('ascii'),
+    }
+
+
+def _verify_password(password: str, stored: Dict[str, Any]) -> bool:
+    """保存時のアルゴリズム・パラメータで検証する（現在の設定と違っていても検証できる）"""
+    try:
+        salt = base64.b64decode(stored['salt'])
+        expected = base64.b64decode(stored['hash'])
+        dk = _derive(password, salt, stored)
+        return hmac.compare_digest(dk, expected)
+    except Exception:
+        return False
+
+
+def _needs_rehash(stored: Dict[str, Any], policy: Optional[Dict[str, Any]] = None) -> bool:
+    """保存済みハッシュのアルゴリズム・パラメータが現在の設定と違うか"""
+    policy = policy or password_hash_policy()
+    for key, value in policy.items():
+        stored_value = stored.get(key)
+        if key == 'algo':
+            if stored_value != value:
+                return True
+        elif stored_value is None or int(stored_value) != int(value):
+            return True
+    return False
+
+
+def _rehash_password(table: Any, email: str, password: str, stored: Dict[str, Any]) -> bool:
+    """ログイン成功時に現在の設定でハッシュを作り直す（同時に変更されていれば何もしない）"""
+    from botocore.exceptions import ClientError
+    try:
+        call_table(
+            table, 'update_item', 'auth_login',
+            Key={'email': email},
+            UpdateExpression='SET #pw = :new',
+            ConditionExpression='#pw.#h = :old',
+            ExpressionAttributeNames={'#pw': 'password', '#h': 'hash'},
+            ExpressionAttributeValues={':new': _hash_password(password), ':old': stored.get('hash')},
+        )
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+            print(f"password rehash failed ({email}): {str(e)}")
+        return False
+    except Exception as e:
+        # 移行できなくてもログイン自体は成功させる（次回のログインで再試行）
+        print(f"password rehash failed ({email}): {str(e)}")
+        return False
+
+
+def handle_auth_register(event: Dict[str, Any]) -> Dict[str, Any]:
+    from botocore.exceptions import ClientError
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': 'GET, POST, PUT, OPTIONS',
+        'Access-Control-Allow-Headers': 'Content-Type, Authorization'
+    }
+    data = _get_json_body(event)
+    email = (data.get('email') or '').strip().lower()
+    password = data.get('password') or ''
+    name = (data.get('name') or '').strip()
+    profile_in = data.get('profile') if isinstance(data.get('profile'), dict) else {}
+    if not email or not password:
+        return {'error': 'emailとpasswordは必須です'}
+    table = _get_users_table()
+    try:
+        # 既存チェック
+        if get_route_attributes(table, email, 'auth_exists') is not None:
+            return {'error': 'このメールは既に登録されています'}
+        pw = _hash_password(password)
+        item = {
+            'email': email,
+            'password': pw,
+            'name': name,
+            'created_at': datetime.utcnow().isoformat(),
+            'updated_at': datetime.utcnow().isoformat(),
+            'profile': profile_in,
+        }
+        call_table(table, 'put_item', 'auth_register', Item=item, ConditionExpression='attribute_not_exists(email)')
+        return {'status': 'ok'}
+    except ClientError as e:
+        return {'error': f'DynamoDBエラー: {e.response.get("Error", {}).get("Message", str(e))}'}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def handle_auth_login(event: Dict[str, Any]) -> Dict[str, Any]:
+    data = _get_json_body(event)
+    email = (data.get('email') or '').strip().lower()
+    password = data.get('password') or ''
+    if not email or not password:
+        return {'error': 'emailとpasswordは必須です'}
+    table = _get_users_table()
+    try:
+        user = get_route_attributes(table, email, 'auth_login')
+        if not user or not _verify_password(password, user.get('password', {})):
+            return {'error': '認証に失敗しました'}
+        secret = os.environ.get('JWT_SECRET', '')
+        if not secret:
+            return {'error': 'サーバー設定エラー（JWT_SECRET未設定）'}
+        if _needs_rehash(user.get('password', {})):
+            # 設定変更後の初回ログインで、保存済みハッシュを現在のアルゴリズム・コストに移行する
+            _rehash_password(table, email, password, user['password'])
+        token = _jwt_sign({'sub': email, 'email': email}, secret, expires_in_seconds=3600)
+        return {'token': token, 'token_type': 'Bearer', 'expires_in': 3600}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _get_authorized_email(event: Dict[str, Any]) -> Optional[str]:
+    try:
+        rc = event.get('requestContext') or {}
+        authz = rc.get('authorizer') or {}
+        email = authz.get('email') or authz.get('principalId')
+        return email
+    except Exception:
+        return None
+
+
+def handle_user_me_get(event: Dict[str, Any]) -> Dict[str, Any]:
+    email = _get_authorized_email(event)
+    if not email:
+        return {'error': '未認証です'}
+    table = _get_users_table()
+    try:
+        user = get_route_attributes(table, email, 'user_me')
+        if not user:
+            return {'error': 'ユーザーが見つかりません'}
+        # 機密情報除去
+        basic = {
+            'email': user.get('email'),
+            'name': user.get('name'),
+            'profile': user.get('profile') or {},
+            'created_at': user.get('created_at'),
+            'updated_at': user.get('updated_at'),
+        }
+        return {'status': 'ok', 'user': basic}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def handle_user_me_put(event: Dict[str, Any]) -> Dict[str, Any]:
+    email = _get_authorized_email(event)
+    if not email:
+        return {'error': '未認証です'}
+    data = _get_json_body(event)
+    # 更新可能なフィールド
+    name = data.get('name')
+    profile_updates = data.get('profile') if isinstance(data.get('profile'), dict) else None
+    if name is None and profile_updates is None:
+        return {'error': '更新フィールドがありません'}
+    table = _get_users_table()
+    try:
+        update_expr = []
+        expr_vals = {':u': datetime.utcnow().isoformat()}
+        expr_names = {}
+        if name is not None:
+            update_expr.append('#n = :n')
+            expr_vals[':n'] = name
+            expr_names['#n'] = 'name'
+        if profile_updates is not None:
+            # 既存profileにマージ（上書き）
+            # DynamoDBのUpdateExpressionだけでネストマージは難しいため、まず現状を取得してマージしてから全体をSET
+            cur = get_route_attributes(table, email, 'user_profile') or {}
+            merged_profile = {**(cur.get('profile') or {}), **profile_updates}
+            update_expr.append('#p = :p')
+            expr_vals[':p'] = merged_profile
+            expr_names['#p'] = 'profile'
+        update_expr.append('updated_at = :u')
+        update_str = 'SET ' + ', '.join(update_expr)
+        res = call_table(
+            table, 'update_item', 'user_me',
+            Key={'email': email},
+            UpdateExpression=update_str,
+            ExpressionAttributeValues=expr_vals,
+            ExpressionAttributeNames=expr_names if expr_names else None,
+            ReturnValues='ALL_NEW'
+        )
+        attrs = res.get('Attributes') or {}
+        basic = {
+            'email': attrs.get('email'),
+            'name': attrs.get('name'),
+            'profile': attrs.get('profile') or {},
+            'created_at': attrs.get('created_at'),
+            'updated_at': attrs.get('updated_at'),
+        }
+        return {'status': 'ok', 'user': basic}
+    except Exception as e:
+        return {'error': str(e)}
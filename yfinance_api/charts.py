@@ -0,0 +1,327 @@
+"""チャート生成（/chart とランキングチャート）
+
+png は matplotlib / mplfinance を初回描画時に読み込み、svg / json は matplotlib を使わずに生成する。
+"""
+
+import base64
+from datetime import datetime
+from html import escape as html_escape
+from io import BytesIO
+
+from .common import yf
+from .deadline import fetch_timeout
+from .downsample import downsample_history
+
+
+CHART_FORMATS = ('png', 'svg', 'json')
+# 履歴取得のタイムアウト秒（リクエストの残り時間が短ければそちらに合わせる）
+CHART_FETCH_TIMEOUT = 10
+
+def _parse_chart_size(size):
+    """'800x400' 形式のサイズ文字列を (width, height) に変換（不正値は既定サイズ）"""
+    try:
+        width, height = map(int, str(size).lower().split('x'))
+        if width <= 0 or height <= 0:
+            raise ValueError(size)
+        return width, height
+    except Exception:
+        return 800, 400
+
+def _default_chart_points(width, chart_type):
+    """出力幅(px)から描画点数の上限を決める（ローソク足は1本3px程度を確保）"""
+    return max(width // 3, 2) if chart_type == 'candle' else width
+
+def _svg_escape(text):
+    return html_escape(str(text), quote=True)
+
+def _svg_document(width, height, title, body):
+    """SVGドキュメントの外枠（背景・タイトル）を組み立てる"""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">'
+        f'<rect width="{width}" height="{height}" fill="#fff"/>'
+        f'<text x="{width / 2:.1f}" y="18" text-anchor="middle" font-size="14">{_svg_escape(title)}</text>'
+        f'{body}</svg>'
+    )
+
+def _svg_value_axis(x0, y0, plot_w, plot_h, vmin, vmax):
+    """縦軸（最小・最大値ラベルと枠線）"""
+    return (
+        f'<rect x="{x0}" y="{y0}" width="{plot_w}" height="{plot_h}" fill="none" stroke="#ccc"/>'
+        f'<text x="{x0 - 4}" y="{y0 + 4}" text-anchor="end">{vmax:,.2f}</text>'
+        f'<text x="{x0 - 4}" y="{y0 + plot_h}" text-anchor="end">{vmin:,.2f}</text>'
+    )
+
+def build_line_chart_svg(labels, values, width=800, height=400, title=''):
+    """折れ線チャートをmatplotlibを使わずにSVG文字列で生成する"""
+    x0, y0 = 60, 30
+    plot_w, plot_h = max(width - x0 - 20, 1), max(height - y0 - 30, 1)
+    body = ''
+    if values:
+        vmin, vmax = min(values), max(values)
+        span = (vmax - vmin) or 1.0
+        n = len(values)
+        points = ' '.join(
+            f'{x0 + (plot_w * i / (n - 1) if n > 1 else plot_w / 2):.1f},'
+            f'{y0 + plot_h - (v - vmin) / span * plot_h:.1f}'
+            for i, v in enumerate(values)
+        )
+        body = (
+            _svg_value_axis(x0, y0, plot_w, plot_h, vmin, vmax)
+            + f'<polyline fill="none" stroke="#1f77b4" stroke-width="1.5" points="{points}"/>'
+            + f'<text x="{x0}" y="{height - 8}">{_svg_escape(labels[0])}</text>'
+            + f'<text x="{x0 + plot_w}" y="{height - 8}" text-anchor="end">{_svg_escape(labels[-1])}</text>'
+        )
+    return _svg_document(width, height, title, body)
+
+def build_candle_chart_svg(labels, opens, highs, lows, closes, width=800, height=400, title=''):
+    """ローソク足チャートをmatplotlibを使わずにSVG文字列で生成する"""
+    x0, y0 = 60, 30
+    plot_w, plot_h = max(width - x0 - 20, 1), max(height - y0 - 30, 1)
+    body = ''
+    n = len(closes)
+    if n:
+        vmin, vmax = min(lows), max(highs)
+        span = (vmax - vmin) or 1.0
+
+        def y(v):
+            return y0 + plot_h - (v - vmin) / span * plot_h
+
+        slot = plot_w / n
+        candle_w = max(slot * 0.6, 1.0)
+        parts = [_svg_value_axis(x0, y0, plot_w, plot_h, vmin, vmax)]
+        for i in range(n):
+            cx = x0 + slot * (i + 0.5)
+            color = '#26a69a' if closes[i] >= opens[i] else '#ef5350'
+            top, bottom = y(max(opens[i], closes[i])), y(min(opens[i], closes[i]))
+            parts.append(
+                f'<line x1="{cx:.1f}" y1="{y(highs[i]):.1f}" x2="{cx:.1f}" y2="{y(lows[i]):.1f}" stroke="{color}"/>'
+                f'<rect x="{cx - candle_w / 2:.1f}" y="{top:.1f}" width="{candle_w:.1f}" '
+                f'height="{max(bottom - top, 1.0):.1f}" fill="{color}"/>'
+            )
+        parts.append(f'<text x="{x0}" y="{height - 8}">{_svg_escape(labels[0])}</text>')
+        parts.append(f'<text x="{x0 + plot_w}" y="{height - 8}" text-anchor="end">{_svg_escape(labels[-1])}</text>')
+        body = ''.join(parts)
+    return _svg_document(width, height, title, body)
+
+def build_bar_chart_svg(labels, values, width=800, height=400, title='', xlabel='', colors=None):
+    """横棒グラフ（ランキング用）をmatplotlibを使わずにSVG文字列で生成する"""
+    x0, y0 = 90, 30
+    plot_w, plot_h = max(width - x0 - 50, 1), max(height - y0 - 30, 1)
+    body = ''
+    n = len(values)
+    if n:
+        vmin, vmax = min(min(values), 0.0), max(max(values), 0.0)
+        span = (vmax - vmin) or 1.0
+        zero_x = x0 + (0.0 - vmin) / span * plot_w
+        slot = plot_h / n
+        parts = [f'<line x1="{zero_x:.1f}" y1="{y0}" x2="{zero_x:.1f}" y2="{y0 + plot_h}" stroke="#999"/>']
+        for i, (label, value) in enumerate(zip(labels, values)):
+            color = (colors[i] if colors else '#1f77b4')
+            bar_x = x0 + (min(value, 0.0) - vmin) / span * plot_w
+            bar_w = max(abs(value) / span * plot_w, 1.0)
+            bar_y = y0 + slot * i + slot * 0.15
+            text_y = y0 + slot * (i + 0.5) + 4
+            parts.append(
+                f'<text x="{x0 - 4}" y="{text_y:.1f}" text-anchor="end">{_svg_escape(label)}</text>'
+                f'<rect x="{bar_x:.1f}" y="{bar_y:.1f}" width="{bar_w:.1f}" height="{slot * 0.7:.1f}" fill="{color}"/>'
+                f'<text x="{bar_x + bar_w + 4:.1f}" y="{text_y:.1f}">{value:.1f}</text>'
+            )
+        parts.append(f'<text x="{x0 + plot_w / 2:.1f}" y="{height - 8}" text-anchor="middle">{_svg_escape(xlabel)}</text>')
+        body = ''.join(parts)
+    return _svg_document(width, height, title, body)
+
+def build_chart_series_json(hist, ticker, period, chart_type='line', max_points=None):
+    """クライアント描画用に間引いた系列データ（JSON）を生成する"""
+    is_candle = chart_type == 'candle' and 'Open' in hist.columns
+    sampled = downsample_history(hist, max_points, 'ohlc' if is_candle else 'lttb')
+    series = {
+        'date': [d.strftime('%Y-%m-%d') for d in sampled.index],
+        'close': [round(float(v), 4) for v in sampled['Close']],
+    }
+    if is_candle:
+        series['open'] = [round(float(v), 4) for v in sampled['Open']]
+        series['high'] = [round(float(v), 4) for v in sampled['High']]
+        series['low'] = [round(float(v), 4) for v in sampled['Low']]
+    if 'Volume' in hist.columns:
+        series['volume'] = [int(v) for v in sampled['Volume']]
+    return {
+        'ticker': ticker,
+        'period': period,
+        'type': chart_type,
+        'format': 'json',
+        'points': len(sampled),
+        'original_points': len(hist),
+        'series': series,
+        'timestamp': datetime.now().isoformat()
+    }
+
+def get_stock_chart_api(ticker, period='1mo', size='800x400', chart_type='line', chart_format='png', points=None):
+    """株価チャートを生成して (payload, error) で返却する
+
+    - png: base64 文字列（従来互換）
+    - svg: SVG文字列（matplotlib不使用）
+    - json: クライアント描画用に間引いた系列データ（dict）
+    points 未指定時は出力幅(px)に収まる点数まで間引く（折れ線: LTTB / ローソク足: OHLCバケット集約）
+    """
+    try:
+        width, height = _parse_chart_size(size)
+        if chart_format not in CHART_FORMATS:
+            return None, f'無効なチャート形式: {chart_format}（png, svg, json のいずれか）'
+
+        stock = yf.Ticker(ticker)
+        hist = stock.history(period=period, timeout=fetch_timeout(CHART_FETCH_TIMEOUT))
+        if hist.empty:
+            return None, f'履歴データが取得できませんでした: {ticker}'
+
+        is_candle = chart_type == 'candle' and 'Open' in hist.columns
+        max_points = points or _default_chart_points(width, chart_type)
+
+        if chart_format == 'json':
+            return build_chart_series_json(hist, ticker, period, chart_type, max_points=max_points), None
+
+        # 横幅(px)を超える点数は描画しても見えないため間引いてから描画する
+        hist = downsample_history(hist, max_points, 'ohlc' if is_candle else 'lttb')
+
+        if chart_format == 'svg':
+            labels = [d.strftime('%Y-%m-%d') for d in hist.index]
+            if is_candle:
+                svg = build_candle_chart_svg(
+                    labels,
+                    [float(v) for v in hist['Open']],
+                    [float(v) for v in hist['High']],
+                    [float(v) for v in hist['Low']],
+                    [float(v) for v in hist['Close']],
+                    width, height, f'{ticker} {period} candlestick'
+                )
+            else:
+                svg = build_line_chart_svg(labels, [float(v) for v in hist['Close']],
+                                           width, height, f'{ticker} {period} close price')
+            return svg, None
+
+        plt = _pyplot()
+
+        if is_candle:
+            # ローソク足（新しいmplfinance API使用）
+            try:
+                import mplfinance as mpf
+                buf = BytesIO()
+                mpf.plot(hist, type='candle', style='charles',
+                        figsize=(width/100, height/100),
+                        title=f'{ticker} {period} candlestick',
+                        savefig=dict(fname=buf, format='png', dpi=100))
+                buf.seek(0)
+                img_base64 = base64.b64encode(buf.read()).decode('utf-8')
+                return img_base64, None
+            except Exception:
+                # フォールバック: 折れ線グラフ
+                pass
+
+        # 折れ線グラフ（デフォルトまたはフォールバック）
+        plt.figure(figsize=(width/100, height/100))
+        plt.plot(hist.index, hist['Close'], label='Close')
+        plt.title(f'{ticker} {period} close price')
+        plt.xlabel('Date')
+        plt.ylabel('Price')
+        plt.legend()
+        plt.tight_layout()
+
+        buf = BytesIO()
+        plt.savefig(buf, format='png')
+        plt.close()
+        buf.seek(0)
+        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
+        return img_base64, None
+    except Exception as e:
+        return None, str(e)
+
+def _pyplot():
+    """matplotlib.pyplot を初回のPNG描画時に読み込む（非GUIバックエンド）"""
+    import matplotlib
+    matplotlib.use('Agg')  # バックエンドを非GUIに
+    import matplotlib.pyplot as plt
+    return plt
+
+def _ranking_chart_series(rankings, ranking_type):
+    """ランキングチャートの描画データ（ラベル・値・色・タイトル）を作成（png/svg/json共通）"""
+    symbols = [item['symbol'] for item in rankings]
+    if ranking_type in ['gainers', 'losers']:
+        values = [float(item['change_percent']) for item in rankings]
+        xlabel = 'Price Change (%)'
+        title = f'Top {len(rankings)} {ranking_type.title()}'
+    elif ranking_type == 'volume':
+        values = [item['volume'] / 1000000 for item in rankings]  # 百万単位
+        xlabel = 'Volume (Millions)'
+        title = f'Top {len(rankings)} Volume Leaders'
+    elif ranking_type == 'market-cap':
+        values = [item['market_cap'] / 1000000000 for item in rankings]  # 十億単位
+        xlabel = 'Market Cap (Billions)'
+        title = f'Top {len(rankings)} Market Cap Leaders'
+    else:
+        return None
+
+    colors = ['green' if x >= 0 else 'red' for x in values] if ranking_type in ['gainers', 'losers'] else ['blue'] * len(values)
+    return {'title': title, 'xlabel': xlabel, 'labels': symbols, 'values': values, 'colors': colors}
+
+def _render_bar_chart(series, chart_format):
+    """棒グラフ描画データを指定形式（png: base64 / svg: 文字列 / json: dict）で返す"""
+    if chart_format == 'json':
+        return series
+    if chart_format == 'svg':
+        return build_bar_chart_svg(series['labels'], series['values'], 800, max(60 + 32 * len(series['values']), 200),
+                                   series['title'], series['xlabel'], series['colors'])
+
+    plt = _pyplot()
+    plt.figure(figsize=(12, 8))
+    values = series['values']
+    bars = plt.barh(series['labels'], values, color=series['colors'])
+    plt.xlabel(series['xlabel'])
+    plt.title(series['title'])
+    plt.gca().invert_yaxis()
+
+    # 値ラベルを追加
+    for bar, value in zip(bars, values):
+        plt.text(bar.get_width() + (max(values) * 0.01), bar.get_y() + bar.get_height()/2,
+                f'{value:.1f}', va='center')
+
+    plt.tight_layout()
+
+    # 画像をBase64エンコード
+    buf = BytesIO()
+    plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+    plt.close()
+    buf.seek(0)
+    return base64.b64encode(buf.read()).decode('utf-8')
+
+def generate_ranking_chart(rankings, ranking_type, chart_format='png'):
+    """ランキングチャート生成（png: Base64画像 / svg: SVG文字列 / json: 描画用データ）"""
+    try:
+        if not rankings:
+            return None
+
+        series = _ranking_chart_series(rankings, ranking_type)
+        if series is None:
+            return None
+        return _render_bar_chart(series, chart_format)
+
+    except Exception as e:
+        return None
+
+def generate_sector_chart(sector_data, ranking_type, chart_format='png'):
+    """セクターランキングチャート生成（png: Base64画像 / svg: SVG文字列 / json: 描画用データ）"""
+    try:
+        if not sector_data:
+            return None
+
+        values = [float(item['change_percent']) for item in sector_data]
+        series = {
+            'title': 'Sector ETF Performance',
+            'xlabel': 'ETF Price Change (%)',
+            'labels': [item['sector'] for item in sector_data],
+            'values': values,
+            'colors': ['green' if x >= 0 else 'red' for x in values],
+        }
+        return _render_bar_chart(series, chart_format)
+
+    except Exception as e:
+        return None
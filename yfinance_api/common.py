@@ -0,0 +1,244 @@
+"""共通関数（JSON変換・通貨フォーマット・パラメータバリデーション）"""
+
+import importlib
+import json
+from datetime import datetime, date
+from typing import Union, Dict
+
+from .deadline import deadline_info
+from .upstream import upstream_status
+
+
+class _LazyModule:
+    """初回の属性アクセス時に実モジュールをimportする代理オブジェクト
+
+    yfinance / pandas / numpy は import だけで数百msかかるため、
+    /auth/* や Swagger UI など使わないルートのコールドスタートでは読み込まない。
+    matplotlib / mplfinance / feedparser / boto3 は利用箇所で関数内importしている。
+    """
+
+    def __init__(self, name: str, on_load=None):
+        self._name = name
+        self._module = None
+        self._on_load = on_load
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            if self._on_load is not None:
+                self._on_load()
+            self._module = module
+        return getattr(module, attr)
+
+
+def _install_yfinance_hooks():
+    from .upstream import install_yfinance_guard
+    install_yfinance_guard()
+
+
+# yfinance の HTTP リクエストには読み込み時に上流のレート制限・ブレーカーを組み込む
+yf = _LazyModule('yfinance', on_load=_install_yfinance_hooks)
+pd = _LazyModule('pandas')
+np = _LazyModule('numpy')
+
+BULLISH_THRESHOLD = 0.5
+BEARISH_THRESHOLD = -0.5
+
+def get_price_change_direction(price_change):
+    if price_change is None:
+        return "unchanged"
+    if price_change > 0:
+        return "up"
+    elif price_change < 0:
+        return "down"
+    else:
+        return "unchanged"
+
+def get_market_sentiment(avg_change):
+    if avg_change > BULLISH_THRESHOLD:
+        return "bullish"
+    elif avg_change < BEARISH_THRESHOLD:
+        return "bearish"
+    else:
+        return "neutral"
+
+def serialize_for_json(obj):
+    """オブジェクトをJSON serializable に変換"""
+    if obj is None:
+        return None
+
+    # pd.isna()はスカラー値に対してのみ使用
+    try:
+        if pd.isna(obj):
+            return None
+    except (ValueError, TypeError):
+        # リストやnumpy配列などでpd.isna()が使えない場合は無視
+        pass
+
+    if isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.strftime('%Y-%m-%d') if hasattr(obj, 'strftime') else str(obj)
+    elif isinstance(obj, date):
+        return obj.strftime('%Y-%m-%d')
+    elif isinstance(obj, (np.integer, np.int64)):
+        return int(obj)
+    elif isinstance(obj, (np.floating, np.float64)):
+        return float(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, dict):
+        return {str(k): serialize_for_json(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [serialize_for_json(item) for item in obj]
+    elif hasattr(obj, 'to_dict'):
+        return serialize_for_json(obj.to_dict())
+    else:
+        return obj
+
+def safe_dataframe_to_dict(df):
+    """DataFrameを安全にdictに変換（JSON serializable）"""
+    try:
+        # Noneや文字列エラーの場合
+        if df is None or isinstance(df, str):
+            return {} if df is None else df
+
+        # 既に辞書の場合
+        if isinstance(df, dict):
+            return serialize_for_json(df)
+
+        # リストの場合
+        if isinstance(df, list):
+            return serialize_for_json(df)
+
+        # numpy arrayの場合
+        if hasattr(df, 'ndim') and hasattr(df, 'tolist'):
+            try:
+                return serialize_for_json(df.tolist())
+            except:
+                return {}
+
+        # DataFrameの場合
+        if hasattr(df, 'to_dict') and hasattr(df, 'index'):
+            try:
+                # DataFrameをdictに変換
+                result = df.to_dict(orient='index')
+                return serialize_for_json(result)
+            except Exception as inner_e:
+                # DataFrame処理に失敗した場合はrecords形式で試行
+                try:
+                    result = df.to_dict('records')
+                    return serialize_for_json(result)
+                except:
+                    return f"DataFrame変換エラー: {str(inner_e)}"
+
+        # その他の場合は空の辞書
+        return {}
+
+    except Exception as e:
+        return f"DataFrame変換エラー: {str(e)}"
+
+def safe_dataframe_to_records(df):
+    """DataFrameを安全にrecordsに変換（JSON serializable）"""
+    try:
+        # Noneや文字列エラーをそのまま返す
+        if df is None or isinstance(df, str):
+            return [] if df is None else df
+
+        # 既にリストや辞書の場合
+        if isinstance(df, (list, dict)):
+            return serialize_for_json(df)
+
+        # numpy arrayの場合
+        if hasattr(df, 'ndim') and hasattr(df, 'tolist'):
+            try:
+                return serialize_for_json(df.tolist())
+            except:
+                return []
+
+        # DataFrameの場合
+        if hasattr(df, 'to_dict') and hasattr(df, 'index'):
+            try:
+                # DataFrameをrecordsに変換
+                records = df.to_dict('records')
+                return serialize_for_json(records)
+            except Exception as inner_e:
+                # records変換に失敗した場合はlist形式で試行
+                try:
+                    if hasattr(df, 'values'):
+                        result = df.values.tolist()
+                        return serialize_for_json(result)
+                    else:
+                        return []
+                except:
+                    return f"DataFrame変換エラー: {str(inner_e)}"
+
+        # その他の場合
+        return []
+
+    except Exception as e:
+        return f"Records変換エラー: {str(e)}"
+
+def format_currency(value: Union[int, float, str], currency: str = "USD") -> str:
+    """
+    通貨を適切にフォーマット（共通関数）
+
+    Args:
+        value: 数値
+        currency: 通貨コード
+
+    Returns:
+        str: フォーマットされた通貨文字列
+    """
+    if value is None or value == "N/A":
+        return "N/A"
+
+    try:
+        value = float(value)
+        if currency == "JPY":
+            return f"¥{value:,.0f}"
+        elif currency == "USD":
+            return f"${value:,.2f}"
+        else:
+            return f"{value:,.2f} {currency}"
+    except (ValueError, TypeError):
+        return str(value)
+
+def get_execution_info(mode: str = "LAMBDA") -> Dict[str, str]:
+    """実行環境の情報を取得（共通関数）
+
+    リクエストのデッドライン内なら残り時間を、上流のブレーカーが閉じていない・スロットリングが
+    発生しているホストがあればその状態（upstream）も載せる。
+    """
+    info = {
+        'mode': mode,
+        'timestamp': datetime.now().isoformat(),
+        'server': 'lambda',
+        **deadline_info()
+    }
+    upstream = upstream_status()
+    if upstream:
+        info['upstream'] = upstream
+    return info
+
+def validate_ticker_parameter(query_parameters, headers):
+    """ティッカーパラメータのバリデーション（共通化）"""
+    ticker = query_parameters.get('ticker', '').upper()
+    if not ticker:
+        return None, {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': 'ティッカーシンボルが必要です'})
+        }
+    return ticker, None
+
+MAX_SERIES_POINTS = 10000
+
+def parse_points_parameter(query_parameters):
+    """points（間引き後の最大点数）パラメータを解析（未指定・不正値は None）"""
+    try:
+        points = int(str(query_parameters.get('points', '') or '0'))
+    except (ValueError, TypeError):
+        return None
+    if points <= 0:
+        return None
+    return max(3, min(points, MAX_SERIES_POINTS))
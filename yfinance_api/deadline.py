@@ -0,0 +1,135 @@
+"""リクエスト単位のデッドライン（応答までに使える残り時間）
+
+lambda_handler がリクエストの開始時に期限を決め、contextvars で下位の取得処理に渡す。
+各取得は残り時間を上限にタイムアウトを設定し、期限を過ぎたセクションは打ち切って
+partial_errors に記録する（1つの遅い上流呼び出しで Lambda のタイムアウトまで待たない）。
+
+スレッドには contextvars が引き継がれないため、ワーカーへの投入は submit() を使う
+（通常はこれを使うコンテナ共有のプール workers.submit() から投入する）。
+
+環境変数:
+- REQUEST_TIMEOUT_SEC       : 1リクエストの上限秒（既定: 28。API Gateway の統合タイムアウト29秒より手前）
+- REQUEST_DEADLINE_MARGIN_MS: Lambda の残り時間から差し引く応答組み立て分のミリ秒（既定: 500）
+"""
+
+import concurrent.futures
+import contextlib
+import contextvars
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+REQUEST_TIMEOUT_SEC = float(os.environ.get('REQUEST_TIMEOUT_SEC', '28'))
+REQUEST_DEADLINE_MARGIN_MS = int(os.environ.get('REQUEST_DEADLINE_MARGIN_MS', '500'))
+# 期限直前でも上流に渡すタイムアウトの下限（0 を渡すと無制限になるライブラリがあるため）
+MIN_FETCH_TIMEOUT = 0.1
+
+# time.monotonic() 基準の期限（None はデッドラインなし。CLI やローカル実行）
+_deadline: contextvars.ContextVar = contextvars.ContextVar('request_deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """リクエストのデッドラインを過ぎた"""
+
+
+def start_request_deadline(context: Any = None) -> contextvars.Token:
+    """リクエストのデッドラインを設定する（戻り値は reset_request_deadline に渡すトークン）
+
+    REQUEST_TIMEOUT_SEC と Lambda の残り時間（マージンを引いたもの）の短い方を使う。
+    """
+    budget = REQUEST_TIMEOUT_SEC
+    get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    if callable(get_remaining):
+        try:
+            budget = min(budget, (get_remaining() - REQUEST_DEADLINE_MARGIN_MS) / 1000)
+        except Exception:
+            pass
+    return _deadline.set(time.monotonic() + max(budget, 0.0))
+
+
+def reset_request_deadline(token: contextvars.Token) -> None:
+    _deadline.reset(token)
+
+
+@contextlib.contextmanager
+def deadline_scope(seconds: float, detach: bool = False):
+    """このブロック内の期限を seconds 秒後までに縮める（既定では外側の期限より延ばさない）
+
+    detach=True では外側の期限と無関係に seconds 秒後を期限にする
+    （呼び出し元が待つのをやめても最後まで取得してキャッシュに入れるバックグラウンド処理用）。
+    """
+    current = None if detach else _deadline.get()
+    limit = time.monotonic() + seconds
+    token = _deadline.set(limit if current is None else min(current, limit))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """残り秒（デッドラインがなければ None）"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check(section: str = '') -> None:
+    """期限を過ぎていれば DeadlineExceeded"""
+    if expired():
+        raise DeadlineExceeded(f'{section}: デッドライン超過' if section else 'デッドライン超過')
+
+
+def fetch_timeout(default: float) -> float:
+    """上流呼び出しに渡すタイムアウト秒（default と残り時間の短い方。期限切れなら DeadlineExceeded）"""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded('デッドライン超過')
+    return max(min(default, left), MIN_FETCH_TIMEOUT)
+
+
+def submit(executor, fn: Callable, *args, **kwargs):
+    """現在のデッドラインを引き継いでワーカーに投入する"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def call_with_deadline(fn: Callable, *args, **kwargs):
+    """タイムアウト引数のない呼び出し（ticker.info など）を残り時間だけ待つ
+
+    デッドラインがなければそのまま呼ぶ。あればコンテナ共有のワーカープールで実行し、
+    期限までに終わらなければ手放して DeadlineExceeded（呼び出し自体は止められないため
+    プールのスレッドで完了させる。結果をキャッシュしたい場合は fn の中で保存する）。
+    プールが混雑していれば workers.WorkerPoolFull。
+    """
+    left = remaining()
+    if left is None:
+        return fn(*args, **kwargs)
+    if left <= 0:
+        raise DeadlineExceeded('デッドライン超過')
+
+    from .workers import abandon, submit as submit_to_pool  # workers は本モジュールを import するため遅延
+
+    future = submit_to_pool(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=left)
+    except concurrent.futures.TimeoutError:
+        if future.done():
+            raise
+        abandon(future)
+        raise DeadlineExceeded('デッドライン超過')
+
+
+def deadline_info() -> Dict[str, int]:
+    """execution_info に載せる残り時間（デッドラインがなければ空）"""
+    left = remaining()
+    if left is None:
+        return {}
+    return {'deadline_remaining_ms': int(left * 1000)}
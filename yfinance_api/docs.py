@@ -0,0 +1,1269 @@
+"""APIドキュメント（Swagger UI）"""
+
+import hashlib
+import json
+import os
+
+from .api_url import get_api_gateway_url
+from .routes import ROUTES
+
+
+def build_openapi_spec(api_url):
+    """OpenAPI仕様書（dict）を組み立てる（呼び出し側でベースURLごとにキャッシュする）"""
+    # Swagger仕様書のJSON（簡略版）
+    swagger_spec = {
+        "openapi": "3.0.0",
+        "info": {
+            "title": "YFinance API",
+            "description": "YFinanceを使用した株式データ取得API",
+            "version": "1.0.0",
+            "contact": {
+                "name": "YFinance API Support"
+            }
+        },
+        "servers": [
+            {
+                "url": api_url.rstrip('/'),
+                "description": "Production server"
+            }
+        ],
+        "paths": {
+            "/search": {
+                "get": {
+                    "summary": "銘柄検索",
+                    "description": "キーワードによる銘柄検索を実行します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "query": {
+                                                "type": "string",
+                                                "example": "apple",
+                                                "description": "検索キーワード"
+                                            },
+                                            "region": {
+                                                "type": "string",
+                                                "example": "US",
+                                                "description": "検索リージョン"
+                                            },
+                                            "count": {
+                                                "type": "integer",
+                                                "example": 7,
+                                                "description": "検索結果件数"
+                                            },
+                                            "results": {
+                                                "type": "array",
+                                                "description": "検索結果の配列",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "symbol": {
+                                                            "type": "string",
+                                                            "example": "AAPL",
+                                                            "description": "ティッカーシンボル"
+                                                        },
+                                                        "name": {
+                                                            "type": "string",
+                                                            "example": "Apple Inc.",
+                                                            "description": "企業名"
+                                                        },
+                                                        "current_price": {
+                                                            "type": "number",
+                                                            "example": 208.62,
+                                                            "description": "現在の株価"
+                                                        },
+                                                        "price_change_direction": {
+                                                            "type": "string",
+                                                            "example": "up",
+                                                            "description": "価格変化の方向"
+                                                        },
+                                                        "market_cap": {
+                                                            "type": "integer",
+                                                            "description": "時価総額（検索結果か銘柄プロファイルのキャッシュにある場合のみ）"
+                                                        }
+                                                    }
+                                                }
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/tickerDetail": {
+                "get": {
+                    "summary": "詳細情報取得（統合版）",
+                    "description": "指定されたティッカーシンボルの全ての情報を統合して取得します（価格、履歴、ニュース、配当、オプション、財務、ESG、株主情報など）",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "ticker": {
+                                                "type": "string",
+                                                "example": "AAPL",
+                                                "description": "ティッカーシンボル"
+                                            },
+                                            "info": {
+                                                "type": "object",
+                                                "description": "企業基本情報"
+                                            },
+                                            "fast_info": {
+                                                "type": "object",
+                                                "description": "高速取得情報"
+                                            },
+                                            "price": {
+                                                "type": "object",
+                                                "description": "株価情報"
+                                            },
+                                            "history": {
+                                                "type": "array",
+                                                "description": "株価履歴"
+                                            },
+                                            "news": {
+                                                "type": "array",
+                                                "description": "関連ニュース"
+                                            },
+                                            "dividends": {
+                                                "type": "array",
+                                                "description": "配当履歴"
+                                            },
+                                            "options": {
+                                                "type": "object",
+                                                "description": "オプション情報"
+                                            },
+                                            "financials": {
+                                                "type": "object",
+                                                "description": "財務諸表（損益計算書、貸借対照表、キャッシュフロー）"
+                                            },
+                                            "analysts": {
+                                                "type": "object",
+                                                "description": "アナリスト予想"
+                                            },
+                                            "isin": {
+                                                "type": "string",
+                                                "description": "国際証券識別番号"
+                                            },
+                                            "recommendations": {
+                                                "type": "array",
+                                                "description": "アナリスト推奨履歴"
+                                            },
+                                            "calendar": {
+                                                "type": "array",
+                                                "description": "イベントカレンダー（決算日など）"
+                                            },
+                                            "earnings_dates": {
+                                                "type": "array",
+                                                "description": "過去/未来の決算日"
+                                            },
+                                            "sustainability": {
+                                                "type": "object",
+                                                "description": "ESG情報"
+                                            },
+                                            "holders": {
+                                                "type": "object",
+                                                "description": "株主情報（大株主、機関投資家、投資信託）"
+                                            },
+                                            "shares": {
+                                                "type": "object",
+                                                "description": "株式数詳細"
+                                            },
+                                            "analysis": {
+                                                "type": "object",
+                                                "description": "アナリスト分析"
+                                            },
+                                            "splits": {
+                                                "type": "array",
+                                                "description": "株式分割履歴"
+                                            },
+                                            "earnings": {
+                                                "type": "object",
+                                                "description": "決算情報（EPS、P/E比など）"
+                                            },
+                                            "upgrades_downgrades": {
+                                                "type": "array",
+                                                "description": "格付け変更履歴"
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得時刻"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/chart": {
+                "get": {
+                    "summary": "チャート画像生成",
+                    "description": "指定されたティッカーシンボルの株価チャートを画像で生成します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "image/png": {
+                                    "schema": {
+                                        "type": "string",
+                                        "format": "binary"
+                                    }
+                                },
+                                "image/svg+xml": {
+                                    "schema": {
+                                        "type": "string"
+                                    }
+                                },
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "ticker": {"type": "string"},
+                                            "period": {"type": "string"},
+                                            "type": {"type": "string"},
+                                            "format": {"type": "string", "example": "json"},
+                                            "points": {"type": "integer", "description": "返却点数"},
+                                            "original_points": {"type": "integer", "description": "間引き前の点数"},
+                                            "series": {"type": "object", "description": "date/close（candle時はopen/high/lowも）の配列"}
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/ticker/basic": {
+                "get": {
+                    "summary": "基本情報取得",
+                    "description": "指定されたティッカーシンボルの基本情報を取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "info": {"type": "object"}, "fast_info": {"type": "object"}, "logo_url": {"type": "string"}, "isin": {"type": "string"}, "upstream_calls": {"type": "integer", "description": "この呼び出しで yfinance が送った HTTP リクエスト数"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/price": {
+                "get": {
+                    "summary": "株価情報取得",
+                    "description": "指定されたティッカーシンボルの現在の株価情報を取得します。tickers 指定時は複数銘柄を一括取得し、prices / errors（銘柄ごとのエラー）を返します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "price": {"type": "object"}, "fast_info": {"type": "object", "description": "fields 指定時のみ"}, "tickers": {"type": "array", "items": {"type": "string"}, "description": "一括取得時のみ"}, "prices": {"type": "array", "description": "一括取得時のみ"}, "errors": {"type": "array", "description": "一括取得時のみ（取得できなかった銘柄）"}, "upstream_calls": {"type": "integer", "description": "上流への問い合わせ回数（単一: HTTP リクエスト数 / 一括: キャッシュに無く一括取得した回数）"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/history": {
+                "get": {
+                    "summary": "株価履歴取得",
+                    "description": "指定されたティッカーシンボルの株価履歴を取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "period": {"type": "string"}, "history": {"type": "array"}, "downsampling": {"type": "object", "description": "間引き時のみ（method, points, original_points）"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/financials": {
+                "get": {
+                    "summary": "財務情報取得",
+                    "description": "指定されたティッカーシンボルの財務諸表・決算情報を取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "financials": {"type": "object"}, "earnings": {"type": "object"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/analysts": {
+                "get": {
+                    "summary": "アナリスト情報取得",
+                    "description": "指定されたティッカーシンボルのアナリスト予想・分析情報を取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "analysts": {"type": "object"}, "recommendations": {"type": "array"}, "analysis": {"type": "object"}, "upgrades_downgrades": {"type": "array"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/holders": {
+                "get": {
+                    "summary": "株主情報取得",
+                    "description": "指定されたティッカーシンボルの株主情報を取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "holders": {"type": "object"}, "shares": {"type": "object"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/events": {
+                "get": {
+                    "summary": "イベント情報取得",
+                    "description": "指定されたティッカーシンボルのイベント情報（決算日、配当、分割など）を取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "calendar": {"type": "array"}, "earnings_dates": {"type": "array"}, "dividends": {"type": "array"}, "splits": {"type": "array"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/news": {
+                "get": {
+                    "summary": "ニュース情報取得",
+                    "description": "指定されたティッカーシンボルの関連ニュースを取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "news": {"type": "array"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/options": {
+                "get": {
+                    "summary": "オプション情報取得",
+                    "description": "指定されたティッカーシンボルのオプション情報を取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "options": {"type": "array"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/ticker/sustainability": {
+                "get": {
+                    "summary": "ESG情報取得",
+                    "description": "指定されたティッカーシンボルのESG（環境・社会・ガバナンス）情報を取得します",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"ticker": {"type": "string"}, "sustainability": {"type": "object"}, "execution_info": {"type": "object"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/home": {
+                "get": {
+                    "summary": "ホーム画面情報取得",
+                    "description": "ニュース、株価ランキング、セクター、指数、為替、商品、市場状況の統合情報を並列で取得します。fast/timeout指定により3秒以内返却を優先できます。",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {
+                        "news_rss": {"type": "object"},
+                        "rankings_stocks": {"type": "object"},
+                        "rankings_sectors": {"type": "object"},
+                        "markets_indices": {"type": "object"},
+                        "markets_currencies": {"type": "object"},
+                        "markets_commodities": {"type": "object"},
+                        "markets_status": {"type": "object"},
+                        "endpoints_integrated": {"type": "array", "items": {"type": "string"}},
+                        "execution_info": {"type": "object", "properties": {"parallel_execution_time": {"type": "string"}, "fast_mode": {"type": "boolean"}}},
+                        "timestamp": {"type": "string", "format": "date-time"}
+                    }}}}}}
+                }
+            },
+            "/news/rss": {
+                "get": {
+                    "summary": "金融ニュースRSS取得",
+                    "description": "Yahoo Finance / MarketWatch などのRSSから最新ニュースを取得します（重複除去・並べ替え対応）",
+                    "responses": {"200": {"description": "成功", "content": {"application/json": {"schema": {"type": "object", "properties": {"status": {"type": "string"}, "data": {"type": "array"}, "count": {"type": "integer"}, "timestamp": {"type": "string", "format": "date-time"}}}}}}}
+                }
+            },
+            "/rankings/stocks": {
+                "get": {
+                    "summary": "株価関連ランキング取得",
+                    "description": "指定された市場の株価関連ランキングを取得します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "status": {
+                                                "type": "string",
+                                                "description": "ステータス"
+                                            },
+                                            "type": {
+                                                "type": "string",
+                                                "description": "ランキング種別"
+                                            },
+                                            "market": {
+                                                "type": "string",
+                                                "description": "市場"
+                                            },
+                                            "data": {
+                                                "type": "array",
+                                                "description": "ランキングデータ",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "symbol": {
+                                                            "type": "string",
+                                                            "description": "銘柄シンボル"
+                                                        },
+                                                        "name": {
+                                                            "type": "string",
+                                                            "description": "銘柄名"
+                                                        },
+                                                        "current_price": {
+                                                            "type": "number",
+                                                            "description": "現在の株価"
+                                                        },
+                                                        "previous_close": {
+                                                            "type": "number",
+                                                            "description": "前日の終値"
+                                                        },
+                                                        "price_change": {
+                                                            "type": "number",
+                                                            "description": "価格変化"
+                                                        },
+                                                        "price_change_percent": {
+                                                            "type": "number",
+                                                            "description": "価格変化率"
+                                                        },
+                                                        "volume": {
+                                                            "type": "integer",
+                                                            "description": "出来高"
+                                                        },
+                                                        "market_cap": {
+                                                            "type": "integer",
+                                                            "description": "時価総額"
+                                                        },
+                                                        "currency": {
+                                                            "type": "string",
+                                                            "description": "通貨コード"
+                                                        }
+                                                    }
+                                                }
+                                            },
+                                            "chart_image": {
+                                                "type": "string",
+                                                "description": "ランキングチャート画像（png: Base64 / svg: SVG文字列）"
+                                            },
+                                            "chart_format": {
+                                                "type": "string",
+                                                "description": "チャート形式（png | svg | json）"
+                                            },
+                                            "chart_data": {
+                                                "type": "object",
+                                                "description": "format=json 時の描画用データ（labels, values, colors, title, xlabel）"
+                                            },
+                                            "metadata": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "total_stocks": {
+                                                        "type": "integer",
+                                                        "description": "ランキング銘柄数"
+                                                    },
+                                                    "limit": {
+                                                        "type": "integer",
+                                                        "description": "取得件数"
+                                                    },
+                                                    "last_updated": {
+                                                        "type": "string",
+                                                        "format": "date-time",
+                                                        "description": "最終更新日時"
+                                                    }
+                                                }
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得日時"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/rankings/sectors": {
+                "get": {
+                    "summary": "セクター・業界ランキング取得",
+                    "description": "指定されたセクターの業界ランキングを取得します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "status": {
+                                                "type": "string",
+                                                "description": "ステータス"
+                                            },
+                                            "type": {
+                                                "type": "string",
+                                                "description": "ランキング種別"
+                                            },
+                                            "sector": {
+                                                "type": "string",
+                                                "description": "セクター"
+                                            },
+                                            "data": {
+                                                "type": "array",
+                                                "description": "ランキングデータ",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "symbol": {
+                                                            "type": "string",
+                                                            "description": "銘柄シンボル"
+                                                        },
+                                                        "name": {
+                                                            "type": "string",
+                                                            "description": "銘柄名"
+                                                        },
+                                                        "current_price": {
+                                                            "type": "number",
+                                                            "description": "現在の株価"
+                                                        },
+                                                        "previous_close": {
+                                                            "type": "number",
+                                                            "description": "前日の終値"
+                                                        },
+                                                        "price_change": {
+                                                            "type": "number",
+                                                            "description": "価格変化"
+                                                        },
+                                                        "price_change_percent": {
+                                                            "type": "number",
+                                                            "description": "価格変化率"
+                                                        },
+                                                        "constituent_change_avg": {
+                                                            "type": "number",
+                                                            "description": "構成銘柄平均変化率"
+                                                        },
+                                                        "constituent_count": {
+                                                            "type": "integer",
+                                                            "description": "構成銘柄数"
+                                                        },
+                                                        "currency": {
+                                                            "type": "string",
+                                                            "description": "通貨コード"
+                                                        }
+                                                    }
+                                                }
+                                            },
+                                            "chart_image": {
+                                                "type": "string",
+                                                "description": "ランキングチャート画像（png: Base64 / svg: SVG文字列）"
+                                            },
+                                            "chart_format": {
+                                                "type": "string",
+                                                "description": "チャート形式（png | svg | json）"
+                                            },
+                                            "chart_data": {
+                                                "type": "object",
+                                                "description": "format=json 時の描画用データ（labels, values, colors, title, xlabel）"
+                                            },
+                                            "metadata": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "total_sectors": {
+                                                        "type": "integer",
+                                                        "description": "ランキングセクター数"
+                                                    },
+                                                    "limit": {
+                                                        "type": "integer",
+                                                        "description": "取得件数"
+                                                    },
+                                                    "last_updated": {
+                                                        "type": "string",
+                                                        "format": "date-time",
+                                                        "description": "最終更新日時"
+                                                    }
+                                                }
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得日時"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/rankings/crypto": {
+                "get": {
+                    "summary": "暗号通貨ランキング取得",
+                    "description": "指定された暗号通貨のランキングを取得します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "status": {
+                                                "type": "string",
+                                                "description": "ステータス"
+                                            },
+                                            "type": {
+                                                "type": "string",
+                                                "description": "ランキング種別"
+                                            },
+                                            "data": {
+                                                "type": "array",
+                                                "description": "ランキングデータ",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "symbol": {
+                                                            "type": "string",
+                                                            "description": "銘柄シンボル"
+                                                        },
+                                                        "name": {
+                                                            "type": "string",
+                                                            "description": "銘柄名"
+                                                        },
+                                                        "price": {
+                                                            "type": "number",
+                                                            "description": "現在の価格"
+                                                        },
+                                                        "change": {
+                                                            "type": "number",
+                                                            "description": "価格変化"
+                                                        },
+                                                        "change_percent": {
+                                                            "type": "number",
+                                                            "description": "価格変化率"
+                                                        },
+                                                        "volume": {
+                                                            "type": "integer",
+                                                            "description": "出来高"
+                                                        },
+                                                        "market_cap": {
+                                                            "type": "integer",
+                                                            "description": "時価総額"
+                                                        },
+                                                        "rank": {
+                                                            "type": "integer",
+                                                            "description": "ランク"
+                                                        }
+                                                    }
+                                                }
+                                            },
+                                            "metadata": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "total_cryptos": {
+                                                        "type": "integer",
+                                                        "description": "ランキング銘柄数"
+                                                    },
+                                                    "limit": {
+                                                        "type": "integer",
+                                                        "description": "取得件数"
+                                                    },
+                                                    "sort_by": {
+                                                        "type": "string",
+                                                        "description": "ソート基準"
+                                                    },
+                                                    "last_updated": {
+                                                        "type": "string",
+                                                        "format": "date-time",
+                                                        "description": "最終更新日時"
+                                                    }
+                                                }
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得日時"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/markets/overview": {
+                "get": {
+                    "summary": "マーケット概況取得",
+                    "description": "主要指数・為替レート・商品価格を1回の一括取得でまとめて返します（各個別エンドポイントと同じスナップショット）",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "status": {
+                                                "type": "string",
+                                                "description": "ステータス"
+                                            },
+                                            "data": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "indices": {
+                                                        "type": "array",
+                                                        "description": "主要指数（/markets/indices の data と同じ形式）",
+                                                        "items": {"type": "object"}
+                                                    },
+                                                    "currencies": {
+                                                        "type": "array",
+                                                        "description": "為替レート（/markets/currencies の data と同じ形式）",
+                                                        "items": {"type": "object"}
+                                                    },
+                                                    "commodities": {
+                                                        "type": "array",
+                                                        "description": "商品価格（/markets/commodities の data と同じ形式）",
+                                                        "items": {"type": "object"}
+                                                    }
+                                                }
+                                            },
+                                            "metadata": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "total_indices": {
+                                                        "type": "integer",
+                                                        "description": "指数の件数"
+                                                    },
+                                                    "total_pairs": {
+                                                        "type": "integer",
+                                                        "description": "通貨ペアの件数"
+                                                    },
+                                                    "total_commodities": {
+                                                        "type": "integer",
+                                                        "description": "商品の件数"
+                                                    },
+                                                    "total_symbols": {
+                                                        "type": "integer",
+                                                        "description": "一括取得した銘柄数"
+                                                    },
+                                                    "limit": {
+                                                        "type": "integer",
+                                                        "description": "各セクションの取得件数"
+                                                    },
+                                                    "last_updated": {
+                                                        "type": "string",
+                                                        "format": "date-time",
+                                                        "description": "最終更新日時"
+                                                    }
+                                                }
+                                            },
+                                            "cache": {
+                                                "type": "string",
+                                                "description": "スナップショットのキャッシュ状態（hit / miss）"
+                                            },
+                                            "partial_errors": {
+                                                "type": "array",
+                                                "description": "取得できなかった銘柄（前回の値を返した場合はその旨）",
+                                                "items": {"type": "string"}
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得日時"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/markets/indices": {
+                "get": {
+                    "summary": "主要指数一覧取得",
+                    "description": "指定された主要指数の一覧を取得します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "status": {
+                                                "type": "string",
+                                                "description": "ステータス"
+                                            },
+                                            "type": {
+                                                "type": "string",
+                                                "description": "ランキング種別"
+                                            },
+                                            "data": {
+                                                "type": "array",
+                                                "description": "ランキングデータ",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "name": {
+                                                            "type": "string",
+                                                            "description": "指数名"
+                                                        },
+                                                        "symbol": {
+                                                            "type": "string",
+                                                            "description": "指数シンボル"
+                                                        },
+                                                        "value": {
+                                                            "type": "number",
+                                                            "description": "現在の値"
+                                                        },
+                                                        "change": {
+                                                            "type": "number",
+                                                            "description": "価格変化"
+                                                        },
+                                                        "change_percent": {
+                                                            "type": "number",
+                                                            "description": "価格変化率"
+                                                        },
+                                                        "volume": {
+                                                            "type": "integer",
+                                                            "description": "出来高"
+                                                        },
+                                                        "rank": {
+                                                            "type": "integer",
+                                                            "description": "ランク"
+                                                        }
+                                                    }
+                                                }
+                                            },
+                                            "metadata": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "total_indices": {
+                                                        "type": "integer",
+                                                        "description": "ランキング銘柄数"
+                                                    },
+                                                    "limit": {
+                                                        "type": "integer",
+                                                        "description": "取得件数"
+                                                    },
+                                                    "last_updated": {
+                                                        "type": "string",
+                                                        "format": "date-time",
+                                                        "description": "最終更新日時"
+                                                    }
+                                                }
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得日時"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/markets/currencies": {
+                "get": {
+                    "summary": "為替レート取得",
+                    "description": "指定された通貨ペアの為替レートを取得します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "status": {
+                                                "type": "string",
+                                                "description": "ステータス"
+                                            },
+                                            "type": {
+                                                "type": "string",
+                                                "description": "ランキング種別"
+                                            },
+                                            "data": {
+                                                "type": "array",
+                                                "description": "ランキングデータ",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "pair": {
+                                                            "type": "string",
+                                                            "description": "通貨ペア"
+                                                        },
+                                                        "symbol": {
+                                                            "type": "string",
+                                                            "description": "通貨シンボル"
+                                                        },
+                                                        "rate": {
+                                                            "type": "number",
+                                                            "description": "レート"
+                                                        },
+                                                        "change": {
+                                                            "type": "number",
+                                                            "description": "変化"
+                                                        },
+                                                        "change_percent": {
+                                                            "type": "number",
+                                                            "description": "変化率"
+                                                        },
+                                                        "rank": {
+                                                            "type": "integer",
+                                                            "description": "ランク"
+                                                        }
+                                                    }
+                                                }
+                                            },
+                                            "metadata": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "total_pairs": {
+                                                        "type": "integer",
+                                                        "description": "ランキング銘柄数"
+                                                    },
+                                                    "limit": {
+                                                        "type": "integer",
+                                                        "description": "取得件数"
+                                                    },
+                                                    "last_updated": {
+                                                        "type": "string",
+                                                        "format": "date-time",
+                                                        "description": "最終更新日時"
+                                                    }
+                                                }
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得日時"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/markets/commodities": {
+                "get": {
+                    "summary": "商品価格取得",
+                    "description": "指定された商品の価格を取得します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "status": {
+                                                "type": "string",
+                                                "description": "ステータス"
+                                            },
+                                            "type": {
+                                                "type": "string",
+                                                "description": "ランキング種別"
+                                            },
+                                            "data": {
+                                                "type": "array",
+                                                "description": "ランキングデータ",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "name": {
+                                                            "type": "string",
+                                                            "description": "商品名"
+                                                        },
+                                                        "symbol": {
+                                                            "type": "string",
+                                                            "description": "商品シンボル"
+                                                        },
+                                                        "price": {
+                                                            "type": "number",
+                                                            "description": "現在の価格"
+                                                        },
+                                                        "change": {
+                                                            "type": "number",
+                                                            "description": "価格変化"
+                                                        },
+                                                        "change_percent": {
+                                                            "type": "number",
+                                                            "description": "価格変化率"
+                                                        },
+                                                        "volume": {
+                                                            "type": "integer",
+                                                            "description": "出来高"
+                                                        },
+                                                        "rank": {
+                                                            "type": "integer",
+                                                            "description": "ランク"
+                                                        }
+                                                    }
+                                                }
+                                            },
+                                            "metadata": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "total_commodities": {
+                                                        "type": "integer",
+                                                        "description": "ランキング銘柄数"
+                                                    },
+                                                    "limit": {
+                                                        "type": "integer",
+                                                        "description": "取得件数"
+                                                    },
+                                                    "last_updated": {
+                                                        "type": "string",
+                                                        "format": "date-time",
+                                                        "description": "最終更新日時"
+                                                    }
+                                                }
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得日時"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/markets/status": {
+                "get": {
+                    "summary": "市場開閉状況取得",
+                    "description": "指定された市場の開閉状況を取得します",
+                    "responses": {
+                        "200": {
+                            "description": "成功",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "status": {
+                                                "type": "string",
+                                                "description": "ステータス"
+                                            },
+                                            "data": {
+                                                "type": "array",
+                                                "description": "市場開閉状況データ",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "market": {
+                                                            "type": "string",
+                                                            "description": "市場名"
+                                                        },
+                                                        "timezone": {
+                                                            "type": "string",
+                                                            "description": "タイムゾーン"
+                                                        },
+                                                        "local_time": {
+                                                            "type": "string",
+                                                            "format": "date-time",
+                                                            "description": "現地時間"
+                                                        },
+                                                        "is_open": {
+                                                            "type": "boolean",
+                                                            "description": "市場が開いているか"
+                                                        },
+                                                        "is_business_day": {
+                                                            "type": "boolean",
+                                                            "description": "営業日か"
+                                                        },
+                                                        "open_time": {
+                                                            "type": "string",
+                                                            "format": "time",
+                                                            "description": "市場開始時間"
+                                                        },
+                                                        "close_time": {
+                                                            "type": "string",
+                                                            "format": "time",
+                                                            "description": "市場終了時間"
+                                                        },
+                                                        "rank": {
+                                                            "type": "integer",
+                                                            "description": "ランク"
+                                                        }
+                                                    }
+                                                }
+                                            },
+                                            "metadata": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "total_markets": {
+                                                        "type": "integer",
+                                                        "description": "ランキング銘柄数"
+                                                    },
+                                                    "limit": {
+                                                        "type": "integer",
+                                                        "description": "取得件数"
+                                                    },
+                                                    "last_updated": {
+                                                        "type": "string",
+                                                        "format": "date-time",
+                                                        "description": "最終更新日時"
+                                                    }
+                                                }
+                                            },
+                                            "execution_info": {
+                                                "type": "object",
+                                                "description": "実行環境情報"
+                                            },
+                                            "timestamp": {
+                                                "type": "string",
+                                                "format": "date-time",
+                                                "description": "データ取得日時"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    # クエリパラメータはルート表（routes.ROUTES）の宣言から生成する
+    for path, operations in swagger_spec["paths"].items():
+        for http_method, operation in operations.items():
+            route = ROUTES.get((path, http_method.upper()))
+            if route is not None and route.params:
+                operation["parameters"] = route.openapi_parameters()
+
+    return swagger_spec
+
+
+def render_swagger_ui_html(spec_json):
+    """仕様書JSON文字列を埋め込んだSwagger UIのHTMLを組み立てる"""
+    # Swagger UIのHTML
+    html = f"""
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>YFinance API - Swagger UI</title>
+    <link rel="stylesheet" type="text/css" href="https://unpkg.com/swagger-ui-dist@5.9.0/swagger-ui.css" />
+    <style>
+        html {{
+            box-sizing: border-box;
+            overflow: -moz-scrollbars-vertical;
+            overflow-y: scroll;
+        }}
+        *, *:before, *:after {{
+            box-sizing: inherit;
+        }}
+        body {{
+            margin:0;
+            background: #fafafa;
+        }}
+    </style>
+</head>
+<body>
+    <div id="swagger-ui"></div>
+    <script src="https://unpkg.com/swagger-ui-dist@5.9.0/swagger-ui-bundle.js"></script>
+    <script src="https://unpkg.com/swagger-ui-dist@5.9.0/swagger-ui-standalone-preset.js"></script>
+    <script>
+        window.onload = function() {{
+            const ui = SwaggerUIBundle({{
+                spec: {spec_json},
+                dom_id: '#swagger-ui',
+                deepLinking: true,
+                presets: [
+                    SwaggerUIBundle.presets.apis,
+                    SwaggerUIStandalonePreset
+                ],
+                plugins: [
+                    SwaggerUIBundle.plugins.DownloadUrl
+                ],
+                layout: "StandaloneLayout"
+            }});
+        }};
+    </script>
+</body>
+</html>
+"""
+    return html
+
+
+# ベースURLごとに組み立て済みのドキュメント（仕様書JSON・HTML・ETag）
+# Hostヘッダー由来のURLも入るため、件数を制限して古いものから捨てる
+_DOCS_CACHE = {}
+_DOCS_CACHE_MAX_ENTRIES = 8
+DOCS_CACHE_CONTROL = f"public, max-age={int(os.environ.get('DOCS_CACHE_MAX_AGE', '300'))}"
+
+
+def _etag(body):
+    return '"' + hashlib.sha256(body.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+def get_api_documents(api_url):
+    """ベースURLに対応する仕様書とSwagger UIを返す（コンテナ内で1回だけ組み立てる）"""
+    key = api_url.rstrip('/')
+    docs = _DOCS_CACHE.get(key)
+    if docs is None:
+        spec_json = json.dumps(build_openapi_spec(key))
+        html = render_swagger_ui_html(spec_json)
+        docs = {
+            'spec_json': spec_json,
+            'spec_etag': _etag(spec_json),
+            'html': html,
+            'html_etag': _etag(html),
+        }
+        while len(_DOCS_CACHE) >= _DOCS_CACHE_MAX_ENTRIES:
+            _DOCS_CACHE.pop(next(iter(_DOCS_CACHE)))
+        _DOCS_CACHE[key] = docs
+    return docs
+
+
+def generate_swagger_ui_html(event=None, context=None):
+    """Swagger UIのHTMLを生成（ベースURLごとにキャッシュ）"""
+    return get_api_documents(get_api_gateway_url(event, context))['html']
+
+
+def _if_none_match(event):
+    headers = (event or {}).get('headers') or {}
+    for name, value in headers.items():
+        if name.lower() == 'if-none-match' and value:
+            return value
+    return ''
+
+
+def _document_response(event, body, etag, content_type):
+    """ETag / Cache-Control 付きのレスポンス（If-None-Match が一致すれば 304）"""
+    headers = {
+        'Content-Type': content_type,
+        'Access-Control-Allow-Origin': '*',
+        'ETag': etag,
+        'Cache-Control': DOCS_CACHE_CONTROL,
+    }
+    candidates = [tag.strip() for tag in _if_none_match(event).split(',')]
+    if '*' in candidates or etag in candidates:
+        return {'statusCode': 304, 'headers': headers, 'body': ''}
+    return {'statusCode': 200, 'headers': headers, 'body': body}
+
+
+def swagger_ui_response(event=None, context=None):
+    """GET / - Swagger UI"""
+    docs = get_api_documents(get_api_gateway_url(event, context))
+    return _document_response(event, docs['html'], docs['html_etag'], 'text/html; charset=utf-8')
+
+
+def openapi_json_response(event=None, context=None):
+    """GET /openapi.json - OpenAPI仕様書"""
+    docs = get_api_documents(get_api_gateway_url(event, context))
+    return _document_response(event, docs['spec_json'], docs['spec_etag'], 'application/json')
@@ -0,0 +1,70 @@
+"""系列の間引き（LTTB / OHLCバケット集約）"""
+
+from .common import np, pd
+
+
+def lttb_indices(y, n_out, x=None):
+    """Largest-Triangle-Three-Buckets で残す点のインデックスを返す
+
+    先頭・末尾の点は必ず残し、中間をn_out-2個のバケットに分割して、
+    「前回選んだ点」と「次バケットの平均点」とで作る三角形の面積が最大となる点を各バケットから1点選ぶ。
+    バケット平均は累積和で一括計算し、各バケット内の面積計算もNumPyでベクトル化している。
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out is None or n_out >= n or n_out < 1:
+        return np.arange(n)
+    if n_out < 3:
+        # 中間バケットを作れないので先頭・末尾のみ（n_out=1 なら先頭のみ）
+        return np.array([0, n - 1][:n_out], dtype=np.int64)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # 中間バケットの境界（バケットiは [edges[i], edges[i+1])）
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # 各バケットの平均点（累積和で一括計算）。最終バケットの「次」は末尾の点
+    csx = np.concatenate(([0.0], np.cumsum(x)))
+    csy = np.concatenate(([0.0], np.cumsum(y)))
+    counts = edges[1:] - edges[:-1]
+    avg_x = (csx[edges[1:]] - csx[edges[:-1]]) / counts
+    avg_y = (csy[edges[1:]] - csy[edges[:-1]]) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+def ohlc_bucket_downsample(hist, n_out):
+    """ローソク足用のOHLCバケット集約（始値=先頭, 高値=最大, 安値=最小, 終値=末尾, 出来高=合計）"""
+    n = len(hist)
+    if n_out is None or n <= n_out or n_out < 1:
+        return hist
+    bucket = np.arange(n) * n_out // n
+    starts = np.searchsorted(bucket, np.arange(n_out))
+    ends = np.append(starts[1:], n)
+    data = {}
+    if 'Open' in hist.columns:
+        data['Open'] = hist['Open'].to_numpy()[starts]
+    if 'High' in hist.columns:
+        data['High'] = np.maximum.reduceat(hist['High'].to_numpy(), starts)
+    if 'Low' in hist.columns:
+        data['Low'] = np.minimum.reduceat(hist['Low'].to_numpy(), starts)
+    data['Close'] = hist['Close'].to_numpy()[ends - 1]
+    if 'Volume' in hist.columns:
+        data['Volume'] = np.add.reduceat(hist['Volume'].to_numpy(), starts)
+    return pd.DataFrame(data, index=hist.index[starts])
+
+def downsample_history(hist, max_points, method='lttb'):
+    """履歴DataFrameを max_points 行以下に間引く（lttb: 終値形状を保つ実在バー / ohlc: バケット集約）"""
+    if max_points is None or len(hist) <= max_points:
+        return hist
+    if method == 'ohlc':
+        return ohlc_bucket_downsample(hist, max_points)
+    return hist.iloc[lttb_indices(hist['Close'].to_numpy(), max_points)]
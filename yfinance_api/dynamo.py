@@ -0,0 +1,72 @@
+"""DynamoDB テーブルハンドルのキャッシュ
+
+boto3 の resource 生成（エンドポイント解決・コネクションプール作成）はリクエストごとではなく
+初回利用時に1回だけ行い、テーブル名ごとの Table オブジェクトを使い回す。
+boto3 の resource はスレッド間で共有しないのが推奨されているため、キャッシュはスレッドごとに持つ
+（Lambda の通常のリクエスト処理は単一スレッドなので、実質コンテナごとに1つ）。
+
+環境変数:
+- DYNAMODB_ENDPOINT_URL        : ローカルの DynamoDB 互換サーバー（DynamoDB Local / moto 等）
+- DYNAMODB_MAX_POOL_CONNECTIONS: コネクションプールの上限（既定: 10）
+- DYNAMODB_RETRY_MODE          : リトライモード（standard / adaptive / legacy、既定: standard）
+- DYNAMODB_MAX_ATTEMPTS        : 初回を含む最大試行回数（既定: 3）
+"""
+
+import os
+import threading
+
+_local = threading.local()
+_lock = threading.Lock()
+# reset_dynamodb_cache() のたびに進め、各スレッドの古いキャッシュを無効にする
+_generation = 0
+
+
+def dynamodb_config():
+    """環境変数から DynamoDB クライアント設定を組み立てる"""
+    return {
+        'endpoint_url': os.environ.get('DYNAMODB_ENDPOINT_URL') or None,
+        'max_pool_connections': int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', '10')),
+        'retry_mode': os.environ.get('DYNAMODB_RETRY_MODE', 'standard'),
+        'max_attempts': int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '3')),
+    }
+
+
+def _create_resource():
+    import boto3
+    from botocore.config import Config
+
+    config = dynamodb_config()
+    return boto3.resource(
+        'dynamodb',
+        endpoint_url=config['endpoint_url'],
+        config=Config(
+            max_pool_connections=config['max_pool_connections'],
+            retries={'mode': config['retry_mode'], 'total_max_attempts': config['max_attempts']},
+        ),
+    )
+
+
+def get_dynamodb_resource():
+    """このスレッド用の DynamoDB resource（初回のみ生成）"""
+    if getattr(_local, 'generation', None) != _generation:
+        with _lock:
+            _local.resource = _create_resource()
+            _local.tables = {}
+            _local.generation = _generation
+    return _local.resource
+
+
+def get_table(table_name):
+    """テーブル名に対応する Table ハンドル（スレッド内でキャッシュ）"""
+    resource = get_dynamodb_resource()
+    table = _local.tables.get(table_name)
+    if table is None:
+        table = _local.tables[table_name] = resource.Table(table_name)
+    return table
+
+
+def reset_dynamodb_cache():
+    """キャッシュ済みのハンドルを破棄する（環境変数を変えた後やテスト用）"""
+    global _generation
+    with _lock:
+        _generation += 1
@@ -0,0 +1,102 @@
+"""fast_info の明示的なフィールド取得と上流リクエスト数の計測
+
+yfinance の FastInfo は各プロパティが初回アクセス時に個別のデータ（1年分の日足・1週間の時間足・
+メタデータ等）を取得する。dir() で全属性をなめると要求していない取得まで走るため、
+指定されたフィールドだけを読む。
+
+上流リクエスト数は yfinance が実際に HTTP リクエストを送った回数（キャッシュ済みの応答は含まない）を
+スレッドごとに数える。
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# yfinance の FastInfo が公開しているプロパティ（FastInfo.keys() と同じ並び）
+FAST_INFO_FIELDS = (
+    'currency', 'quote_type', 'exchange', 'timezone',
+    'shares', 'market_cap',
+    'last_price', 'previous_close', 'open', 'day_high', 'day_low',
+    'regular_market_previous_close',
+    'last_volume',
+    'fifty_day_average', 'two_hundred_day_average', 'ten_day_average_volume', 'three_month_average_volume',
+    'year_high', 'year_low', 'year_change',
+)
+# /ticker/price の既定（価格と前日比に必要な分だけ）
+PRICE_FIELDS = ('last_price', 'previous_close', 'currency')
+
+_counter = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+def parse_fields(raw) -> List[str]:
+    """fields=last_price,previous_close,... を検証して重複のないリストにする（不正な名前は ValueError）"""
+    fields = []
+    for name in str(raw).split(','):
+        name = name.strip().lower()
+        if name and name not in fields:
+            fields.append(name)
+    unknown = [name for name in fields if name not in FAST_INFO_FIELDS]
+    if unknown:
+        raise ValueError(f"無効なfields: {', '.join(unknown)}（{', '.join(FAST_INFO_FIELDS)} から指定）")
+    if not fields:
+        raise ValueError('fields が空です')
+    return fields
+
+
+def _install_request_counter() -> None:
+    """yfinance の HTTP リクエスト（YfData._make_request）を数えるラッパーを1回だけ組み込む"""
+    global _installed
+    if _installed:
+        return
+    with _install_lock:
+        if _installed:
+            return
+        try:
+            from yfinance.data import YfData
+        except Exception:
+            _installed = True
+            return
+        original = YfData._make_request
+
+        def _counting_make_request(self, *args, **kwargs):
+            _counter.calls = getattr(_counter, 'calls', 0) + 1
+            return original(self, *args, **kwargs)
+
+        YfData._make_request = _counting_make_request
+        _installed = True
+
+
+class UpstreamCalls:
+    """生成時点からこのスレッドが yfinance に送った HTTP リクエスト数を数える"""
+
+    def __init__(self):
+        _install_request_counter()
+        self._start = getattr(_counter, 'calls', 0)
+
+    @property
+    def count(self) -> int:
+        return getattr(_counter, 'calls', 0) - self._start
+
+
+def read_fast_info(stock, fields: Optional[Iterable[str]] = None) -> Tuple[Dict, Dict[str, str]]:
+    """指定フィールドだけ fast_info から読む（戻り値: (値, フィールド → エラー)）
+
+    数値は float、それ以外は文字列に変換し、値のないフィールドは含めない。
+    """
+    fields = list(fields) if fields else list(FAST_INFO_FIELDS)
+    values: Dict = {}
+    errors: Dict[str, str] = {}
+    try:
+        fast_info = stock.fast_info
+    except Exception as e:
+        return values, {'fast_info': str(e)}
+    for name in fields:
+        try:
+            value = getattr(fast_info, name)
+        except Exception as e:
+            errors[name] = str(e)
+            continue
+        if value is not None:
+            values[name] = float(value) if isinstance(value, (int, float)) else str(value)
+    return values, errors
@@ -0,0 +1,276 @@
+"""保有銘柄（HOLDINGS_TABLE: pk=email, sk=symbol）の差分更新
+
+取引の登録時に、取引アイテムの追加と該当銘柄1件の保有アイテム更新を
+1つの DynamoDB トランザクションで書き込む（履歴全体からの再計算はしない）。
+
+- quantity    : 保有数量
+- cost_basis  : 保有分の取得原価合計（移動平均法）。平均取得単価 = cost_basis / quantity
+- realized_pnl: 実現損益の累計
+- version     : 楽観ロック用（SELL は読み取り時の version を条件に更新する）
+
+検証・復旧用に取引履歴から作り直すジョブ:
+  python -m yfinance_api.holdings rebuild [--email EMAIL] [--verify]
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from .dynamo import get_table
+from .transactions import _get_transactions_table, _to_item, iter_transactions
+
+# SELL の楽観ロックが競合したときの再試行回数
+MAX_SELL_RETRIES = 3
+_QUANT = Decimal('0.0000000001')
+_ZERO = Decimal(0)
+
+
+class OversellError(ValueError):
+    """保有数量を超える売却"""
+
+
+def _get_holdings_table():
+    table_name = os.environ.get('HOLDINGS_TABLE', '')
+    if not table_name:
+        raise RuntimeError('HOLDINGS_TABLE is not configured')
+    return get_table(table_name)
+
+
+def _dec(value: Any) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def apply_transaction(state: Dict[str, Any], txn: Dict[str, Any]) -> Dict[str, Any]:
+    """1件の取引を保有状態に適用した新しい状態を返す（移動平均法）
+
+    価格のない BUY は数量のみ加算し、価格のない SELL は実現損益を計上しない。
+    """
+    quantity = _dec(state.get('quantity', 0))
+    cost_basis = _dec(state.get('cost_basis', 0))
+    realized = _dec(state.get('realized_pnl', 0))
+    qty = _dec(txn['quantity'])
+    price = txn.get('price')
+    side = str(txn.get('type', '')).upper()
+
+    if side == 'BUY':
+        quantity += qty
+        if price is not None:
+            cost_basis += _dec(price) * qty
+    elif side == 'SELL':
+        if qty > quantity:
+            raise OversellError(f"{txn.get('symbol')}: 保有数量（{quantity}）を超える売却はできません")
+        if qty == quantity:
+            released = cost_basis
+        else:
+            released = (cost_basis * qty / quantity).quantize(_QUANT)
+        if price is not None:
+            realized += (_dec(price) * qty - released).quantize(_QUANT)
+        quantity -= qty
+        cost_basis -= released
+    return {'quantity': quantity, 'cost_basis': cost_basis, 'realized_pnl': realized}
+
+
+def _is_condition_failure(error: Any, index: int) -> bool:
+    reasons = error.response.get('CancellationReasons') or []
+    return len(reasons) > index and reasons[index].get('Code') == 'ConditionalCheckFailed'
+
+
+def record_transaction(email: str, txn: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """取引を登録し、同じトランザクションで該当銘柄の保有を更新する
+
+    BUY は ADD による加算（読み取りなし）、SELL は読み取った version を条件に置き換える。
+    戻り値は更新後の保有（BUY / SELL 以外の取引は None）。保有数量を超える SELL は OversellError。
+    """
+    from botocore.exceptions import ClientError
+
+    txn_table = _get_transactions_table()
+    holdings_table = _get_holdings_table()
+    # resource の client は Python の値を DynamoDB 形式へ自動変換する
+    client = holdings_table.meta.client
+    side = str(txn.get('type', '')).upper()
+    now = datetime.utcnow().isoformat()
+    put_txn = {
+        'Put': {
+            'TableName': txn_table.name,
+            'Item': _to_item(email, txn),
+            'ConditionExpression': 'attribute_not_exists(sk)',
+        }
+    }
+
+    if side not in ('BUY', 'SELL'):
+        client.transact_write_items(TransactItems=[put_txn])
+        return None
+
+    key = {'email': email, 'symbol': txn['symbol']}
+    for _ in range(MAX_SELL_RETRIES):
+        if side == 'BUY':
+            delta = apply_transaction({}, txn)
+            update = {
+                'UpdateExpression': ('ADD quantity :q, cost_basis :c, version :one '
+                                     'SET realized_pnl = if_not_exists(realized_pnl, :zero), updated_at = :u'),
+                'ExpressionAttributeValues': {
+                    ':q': delta['quantity'], ':c': delta['cost_basis'], ':one': 1, ':zero': _ZERO, ':u': now,
+                },
+            }
+        else:
+            current = holdings_table.get_item(Key=key, ConsistentRead=True).get('Item') or {}
+            new_state = apply_transaction(current, txn)
+            version = current.get('version')
+            update = {
+                'UpdateExpression': ('SET quantity = :q, cost_basis = :c, realized_pnl = :r, '
+                                     'version = :next, updated_at = :u'),
+                'ConditionExpression': 'version = :v',
+                'ExpressionAttributeValues': {
+                    ':q': new_state['quantity'], ':c': new_state['cost_basis'], ':r': new_state['realized_pnl'],
+                    ':next': _dec(version or 0) + 1, ':v': version, ':u': now,
+                },
+            }
+        update_item = {'TableName': holdings_table.name, 'Key': key, **update}
+        try:
+            client.transact_write_items(TransactItems=[put_txn, {'Update': update_item}])
+        except ClientError as e:
+            if (e.response.get('Error', {}).get('Code') == 'TransactionCanceledException'
+                    and side == 'SELL' and _is_condition_failure(e, 1)):
+                continue  # 同時更新と競合したので読み直す
+            raise
+        holding = holdings_table.get_item(Key=key, ConsistentRead=True).get('Item') or {}
+        return format_holding(holding)
+    raise RuntimeError('保有の更新が競合しました。時間をおいて再試行してください')
+
+
+def format_holding(item: Dict[str, Any]) -> Dict[str, Any]:
+    quantity = _dec(item.get('quantity', 0))
+    cost_basis = _dec(item.get('cost_basis', 0))
+    return {
+        'symbol': item.get('symbol'),
+        'quantity': quantity,
+        'average_cost': (cost_basis / quantity).quantize(_QUANT) if quantity else _ZERO,
+        'cost_basis': cost_basis,
+        'realized_pnl': _dec(item.get('realized_pnl', 0)),
+        'updated_at': item.get('updated_at'),
+    }
+
+
+def _iter_holding_items(email: str):
+    table = _get_holdings_table()
+    params: Dict[str, Any] = {
+        'KeyConditionExpression': 'email = :e',
+        'ExpressionAttributeValues': {':e': email},
+    }
+    while True:
+        res = table.query(**params)
+        for item in res.get('Items', []):
+            yield item
+        if not res.get('LastEvaluatedKey'):
+            return
+        params['ExclusiveStartKey'] = res['LastEvaluatedKey']
+
+
+def list_holdings(email: str, include_closed: bool = False) -> List[Dict[str, Any]]:
+    """ユーザーの保有一覧（既定では数量0の銘柄を除く）"""
+    return [
+        format_holding(item) for item in _iter_holding_items(email)
+        if include_closed or _dec(item.get('quantity', 0)) > 0
+    ]
+
+
+def delete_all_holdings(email: str) -> None:
+    table = _get_holdings_table()
+    with table.batch_writer() as batch:
+        for item in _iter_holding_items(email):
+            batch.delete_item(Key={'email': email, 'symbol': item['symbol']})
+
+
+def compute_holdings(transactions: List[Dict[str, Any]]):
+    """取引履歴（時系列順）から銘柄ごとの保有を計算する
+
+    戻り値は (銘柄 → 保有, 適用できなかった取引)。保有を超える SELL は飛ばして報告する。
+    """
+    states: Dict[str, Dict[str, Any]] = {}
+    rejected: List[Dict[str, Any]] = []
+    for txn in transactions:
+        if str(txn.get('type', '')).upper() not in ('BUY', 'SELL'):
+            continue
+        symbol = txn['symbol']
+        try:
+            states[symbol] = apply_transaction(states.get(symbol, {}), txn)
+        except OversellError as e:
+            rejected.append({'id': txn.get('id'), 'symbol': symbol, 'error': str(e)})
+    return states, rejected
+
+
+def rebuild_holdings(email: str, verify: bool = False) -> Dict[str, Any]:
+    """取引履歴から保有を作り直す（verify=True は差分の報告のみで書き込まない）"""
+    transactions = list(iter_transactions(email))
+    expected, rejected = compute_holdings(transactions)
+    current = {item['symbol']: item for item in _iter_holding_items(email)}
+
+    diffs = []
+    for symbol in sorted(set(expected) | set(current)):
+        exp = expected.get(symbol, {'quantity': _ZERO, 'cost_basis': _ZERO, 'realized_pnl': _ZERO})
+        cur = current.get(symbol, {})
+        if any(_dec(cur.get(f, 0)) != _dec(exp[f]) for f in ('quantity', 'cost_basis', 'realized_pnl')):
+            diffs.append({'symbol': symbol, 'expected': exp,
+                          'stored': {f: cur.get(f) for f in ('quantity', 'cost_basis', 'realized_pnl')}})
+
+    if not verify and diffs:
+        table = _get_holdings_table()
+        now = datetime.utcnow().isoformat()
+        with table.batch_writer() as batch:
+            for diff in diffs:
+                symbol = diff['symbol']
+                if symbol not in expected:
+                    batch.delete_item(Key={'email': email, 'symbol': symbol})
+                    continue
+                state = expected[symbol]
+                batch.put_item(Item={
+                    'email': email, 'symbol': symbol, **state,
+                    'version': _dec(current.get(symbol, {}).get('version') or 0) + 1,
+                    'updated_at': now,
+                })
+    return {
+        'email': email,
+        'transactions': len(transactions),
+        'symbols': len(expected),
+        'diffs': diffs,
+        'rejected': rejected,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='保有テーブルの管理')
+    subparsers = parser.add_subparsers(dest='command')
+    rebuild = subparsers.add_parser('rebuild', help='取引履歴から保有を作り直す')
+    rebuild.add_argument('--email', help='対象ユーザー（省略時は取引のある全ユーザー）')
+    rebuild.add_argument('--verify', action='store_true', help='差分の報告のみ（書き込まない）')
+    args = parser.parse_args(argv)
+
+    if args.command != 'rebuild':
+        parser.print_help()
+        return 1
+    if args.email:
+        emails = [args.email]
+    else:
+        emails, params = set(), {'ProjectionExpression': 'email'}
+        txn_table = _get_transactions_table()
+        while True:
+            res = txn_table.scan(**params)
+            emails.update(item['email'] for item in res.get('Items', []))
+            if not res.get('LastEvaluatedKey'):
+                break
+            params['ExclusiveStartKey'] = res['LastEvaluatedKey']
+        emails = sorted(emails)
+    has_diff = False
+    for email in emails:
+        report = rebuild_holdings(email, verify=args.verify)
+        has_diff = has_diff or bool(report['diffs'])
+        print(json.dumps(report, ensure_ascii=False, default=str))
+    return 1 if args.verify and has_diff else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
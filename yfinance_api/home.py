@@ -0,0 +1,296 @@
+"""ホーム画面API（/home）- ニュース・ランキング・マーケット情報を統合"""
+
+import functools
+import os
+import threading
+import time
+from datetime import datetime
+
+from .common import get_execution_info
+from .deadline import deadline_scope, remaining
+from .markets import (
+    get_markets_indices_api,
+    get_markets_currencies_api,
+    get_markets_commodities_api,
+    get_markets_status_api,
+)
+from .news import lamuda_get_rss_news_api
+from .rankings import get_stock_rankings_api, get_sector_rankings_api
+from .upstream import upstream_open
+from .workers import WorkerPoolFull, abandon, submit, worker_stats
+
+# 1セクションの取得に使える秒数。呼び出し元のデッドラインとは独立しており、
+# タイムアウトで手放したセクションもこの時間内に完了すれば次のリクエストで使われる
+HOME_SECTION_BUDGET_SEC = float(os.environ.get('HOME_SECTION_BUDGET_SEC', '20'))
+
+# セクション単位の結果 {(タスク名, limit, market, fast): (取得時刻, (キー, データ))}
+_SECTION_CACHE = {}
+# 実行中のセクション取得（同じセクションを重ねて投入しない）
+_SECTION_IN_FLIGHT = {}
+_section_lock = threading.Lock()
+
+
+def _run_section(fn):
+    with deadline_scope(HOME_SECTION_BUDGET_SEC, detach=True):
+        return fn()
+
+
+def _start_section(section_key, fn):
+    """セクション取得を共有プールに投入する（同じセクションが実行中ならその Future を使う）"""
+    with _section_lock:
+        future = _SECTION_IN_FLIGHT.get(section_key)
+        if future is not None and not future.done():
+            return future
+        future = submit(_run_section, fn)
+        _SECTION_IN_FLIGHT[section_key] = future
+    future.add_done_callback(functools.partial(_finish_section, section_key))
+    return future
+
+
+def _finish_section(section_key, future):
+    """完了したセクションをキャッシュに入れる（呼び出し元が待つのをやめた取得も含む）"""
+    with _section_lock:
+        if _SECTION_IN_FLIGHT.get(section_key) is future:
+            del _SECTION_IN_FLIGHT[section_key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        key, data = future.result()
+        if isinstance(data, dict) and data and not data.get('error') and not data.get('partial_errors'):
+            _SECTION_CACHE[section_key] = (time.time(), (key, data))
+
+
+def get_stock_home_api(query_parameters=None):
+    """ホーム画面用情報取得API（軽量化対応）
+    - 並行実行
+    - セクション選択（?sections=news,stocks,sectors,...）
+    - 件数/市場/タイムアウト調整（?limit=5&market=sp500&timeout=10）
+    - 簡易TTLキャッシュ（?cache_ttl=60）。セクション単位でもキャッシュし、タイムアウトで手放した取得の結果も使う
+    """
+    import concurrent.futures
+
+    try:
+        # パラメータ
+        params = dict(query_parameters or {})
+        sections_param = str(params.get('sections', '') or '').strip()
+        selected_sections = [s.strip().lower() for s in sections_param.split(',') if s.strip()] if sections_param else []
+        # ランキング等の件数は最大10件に制限
+        limit = max(1, min(int(str(params.get('limit', '5')) or '5'), 10))
+        market = str(params.get('market', 'sp500') or 'sp500').lower()
+        # HomeAPIは1リクエスト5秒までを強制（既定5、上限5）
+        timeout_sec = max(1, min(int(str(params.get('timeout', '5')) or '5'), 5))
+        cache_ttl = max(0, min(int(str(params.get('cache_ttl', '60')) or '60'), 600))
+        parallel_param = str(params.get('parallel', '1') or '1').lower()
+        is_parallel = not (parallel_param in ('0', 'false', 'no'))
+        fast_param = str(params.get('fast', '') or '').lower()
+        force_fast = fast_param in ('1', 'true', 'yes')
+
+        # キャッシュ
+        global _HOME_CACHE  # type: ignore
+        if '_HOME_CACHE' not in globals():
+            _HOME_CACHE = {}
+        cache_key_sections = tuple(sorted(selected_sections)) if selected_sections else ('all',)
+        # fastモードやtimeoutもキャッシュキーに含める
+        cache_key = ('v3', cache_key_sections, limit, market, timeout_sec, force_fast)
+        now = time.time()
+        cached = _HOME_CACHE.get(cache_key) if cache_ttl > 0 else None
+        # 上流のブレーカーが開いている間は期限切れのキャッシュも返す（execution_info.upstream に状態が入る）
+        breaker_open = upstream_open()
+        if cached and (breaker_open or now - cached.get('ts', 0) < cache_ttl):
+            result = dict(cached.get('data', {}))
+            result['execution_info'] = get_execution_info('LAMBDA')
+            cache_state = 'hit' if now - cached['ts'] < cache_ttl else 'stale'
+            result['execution_info']['cache'] = f"{cache_state}({int(now - cached['ts'])}s)"
+            result['timestamp'] = datetime.now().isoformat()
+            return result
+
+        result = {}
+        start_time = time.time()
+
+        # fastモード条件: 明示指定 or timeout<=3秒
+        is_fast_mode = force_fast or (timeout_sec <= 3)
+
+        # タスク
+        def fetch_news():
+            try:
+                news_params = {'limit': str(limit), 'sort': 'published_desc'}
+                return ('news_rss', lamuda_get_rss_news_api(news_params))
+            except Exception as e:
+                return ('news_rss', {'error': f'ニュース取得エラー: {str(e)}'})
+
+        def fetch_gainers():
+            try:
+                rankings_params = {'type': 'gainers', 'limit': str(limit), 'market': market, 'fast': '1' if is_fast_mode else '0', 'nochart': '1'}
+                return ('gainers', get_stock_rankings_api(rankings_params))
+            except Exception as e:
+                return ('gainers', {'error': f'上昇株取得エラー: {str(e)}'})
+
+        def fetch_losers():
+            try:
+                rankings_params = {'type': 'losers', 'limit': str(limit), 'market': market, 'fast': '1' if is_fast_mode else '0', 'nochart': '1'}
+                return ('losers', get_stock_rankings_api(rankings_params))
+            except Exception as e:
+                return ('losers', {'error': f'下落株取得エラー: {str(e)}'})
+
+        def fetch_sectors():
+            try:
+                sector_rankings_params = {'limit': str(limit)}
+                return ('rankings_sectors', get_sector_rankings_api(sector_rankings_params))
+            except Exception as e:
+                return ('rankings_sectors', {'error': f'セクターランキング取得エラー: {str(e)}'})
+
+        def fetch_indices():
+            try:
+                return ('markets_indices', get_markets_indices_api({}))
+            except Exception as e:
+                return ('markets_indices', {'error': f'主要指数取得エラー: {str(e)}'})
+
+        def fetch_currencies():
+            try:
+                return ('markets_currencies', get_markets_currencies_api({}))
+            except Exception as e:
+                return ('markets_currencies', {'error': f'為替レート取得エラー: {str(e)}'})
+
+        def fetch_commodities():
+            try:
+                return ('markets_commodities', get_markets_commodities_api({}))
+            except Exception as e:
+                return ('markets_commodities', {'error': f'商品価格取得エラー: {str(e)}'})
+
+        def fetch_status():
+            try:
+                return ('markets_status', get_markets_status_api({}))
+            except Exception as e:
+                return ('markets_status', {'error': f'市場状況取得エラー: {str(e)}'})
+
+        # セクション選択
+        all_sections = ['news', 'stocks', 'indices', 'currencies', 'status']
+        sections = selected_sections or all_sections
+
+        task_funcs = []
+        endpoints = []
+        if 'news' in sections:
+            task_funcs.append(fetch_news)
+            endpoints.append('news/rss')
+        if 'stocks' in sections or 'rankings_stocks' in sections:
+            task_funcs.append(fetch_gainers)
+            task_funcs.append(fetch_losers)
+            endpoints.append('rankings/stocks')
+        if 'sectors' in sections:
+            task_funcs.append(fetch_sectors)
+            endpoints.append('rankings/sectors')
+        if 'indices' in sections:
+            task_funcs.append(fetch_indices)
+            endpoints.append('markets/indices')
+        if 'currencies' in sections:
+            task_funcs.append(fetch_currencies)
+            endpoints.append('markets/currencies')
+        if 'commodities' in sections:
+            task_funcs.append(fetch_commodities)
+            endpoints.append('markets/commodities')
+        if 'status' in sections:
+            task_funcs.append(fetch_status)
+            endpoints.append('markets/status')
+
+        gainers_result = None
+        losers_result = None
+        partial_errors = []
+        collected = []
+        skipped = []
+        sections_from_cache = []
+
+        task_to_label = {
+            fetch_news: 'news_rss',
+            fetch_gainers: 'gainers',
+            fetch_losers: 'losers',
+            fetch_sectors: 'rankings_sectors',
+            fetch_indices: 'markets_indices',
+            fetch_currencies: 'markets_currencies',
+            fetch_commodities: 'markets_commodities',
+            fetch_status: 'markets_status',
+        }
+
+        # セクションごとに、セクションキャッシュ → 実行中の同じ取得 → 共有プールへの投入 の順に使う
+        # （並列実行は共有プールの WORKER_MAX_THREADS ワーカー。parallel=0 は1件ずつ待つ）
+        future_to_func = {}
+        with deadline_scope(timeout_sec):
+            for fn in task_funcs:
+                section_key = (fn.__name__, limit, market, is_fast_mode)
+                cached_section = _SECTION_CACHE.get(section_key) if cache_ttl > 0 else None
+                if cached_section and (breaker_open or now - cached_section[0] < cache_ttl):
+                    collected.append(cached_section[1])
+                    sections_from_cache.append(task_to_label.get(fn, fn.__name__))
+                    continue
+                try:
+                    future = _start_section(section_key, fn)
+                except WorkerPoolFull as e:
+                    skipped.append((fn, str(e)))
+                    continue
+                future_to_func[future] = fn
+                if not is_parallel:
+                    concurrent.futures.wait([future], timeout=remaining())
+            # timeout とリクエストのデッドラインの短い方まで待つ
+            done, not_done = concurrent.futures.wait(set(future_to_func.keys()), timeout=remaining(), return_when=concurrent.futures.ALL_COMPLETED)
+
+        # 完了分を収集
+        for future in done:
+            try:
+                collected.append(future.result())
+            except Exception as e:
+                fn = future_to_func[future]
+                fn_name = fn.__name__
+                result[f'{fn_name}_error'] = f'{fn_name}取得エラー: {str(e)}'
+        for key, data in collected:
+            if key == 'gainers':
+                gainers_result = data
+            elif key == 'losers':
+                losers_result = data
+            elif key in ['news_rss', 'rankings_sectors', 'markets_indices', 'markets_currencies', 'markets_commodities', 'markets_status']:
+                result[key] = data
+
+        # 未完了のタスクは手放す（実行中なら止めずに完了させ、結果は次のリクエスト用にセクションキャッシュへ入る）
+        for future in not_done:
+            abandon(future)
+            skipped.append((future_to_func[future], 'デッドライン超過'))
+
+        # 間に合わなかった・投入できなかったセクションには空構造を付与（ブランク）
+        for fn, reason in skipped:
+            label = task_to_label.get(fn, fn.__name__)
+            partial_errors.append(f'{label}: {reason}')
+            if label == 'gainers':
+                gainers_result = gainers_result or {}
+            elif label == 'losers':
+                losers_result = losers_result or {}
+            else:
+                result[label] = {}
+
+        if ('stocks' in sections or 'rankings_stocks' in sections):
+            if gainers_result is not None or losers_result is not None:
+                result['rankings_stocks'] = {
+                    'gainers': gainers_result or {},
+                    'losers': losers_result or {}
+                }
+
+        end_time = time.time()
+        result['execution_info'] = get_execution_info('LAMBDA')
+        # 端数の四捨五入で3.00秒狙いの時に3.01になるのを避ける
+        exec_ms = int((end_time - start_time) * 1000)
+        result['execution_info']['parallel_execution_time'] = f"{exec_ms/1000:.2f}秒"
+        result['execution_info']['fast_mode'] = is_fast_mode
+        result['execution_info']['workers'] = worker_stats()
+        if sections_from_cache:
+            result['execution_info']['sections_from_cache'] = sections_from_cache
+        result['timestamp'] = datetime.now().isoformat()
+        result['endpoints_integrated'] = endpoints
+        if partial_errors:
+            result['partial_errors'] = partial_errors
+
+        # 間に合わなかったセクションのある部分結果はキャッシュしない
+        if cache_ttl > 0 and not partial_errors:
+            _HOME_CACHE[cache_key] = {'ts': now, 'data': result}
+
+        return result
+
+    except concurrent.futures.TimeoutError:
+        return {'error': f'ホーム情報取得がタイムアウトしました（{timeout_sec}秒）'}
+    except Exception as e:
+        return {'error': f'ホーム情報取得エラー: {str(e)}'}
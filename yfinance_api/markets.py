@@ -0,0 +1,310 @@
+"""マーケット情報API（/markets/*）
+
+指数・為替・商品の全銘柄は yf.download の1回の呼び出しでまとめて取得し（株価スナップショットの
+共有キャッシュを使う）、/markets/overview と各個別エンドポイントはその同じスナップショットから組み立てる。
+
+環境変数:
+- MARKET_CACHE_TTL: 指数・為替・商品のスナップショットのキャッシュ秒（既定: 30）
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+from .deadline import remaining
+from .quotes import get_quote_snapshots
+from .upstream import upstream_status
+
+MARKET_CACHE_TTL = float(os.environ.get('MARKET_CACHE_TTL', '30'))
+
+# 銘柄ごとに直近で取得できた行（上流の障害時に stale として返す）
+_LAST_GOOD = {}
+
+# 全銘柄のスナップショット（{'ts', 'snapshots'}。取れなかった銘柄がある場合は保存しない）
+_SNAPSHOT = None
+_snapshot_lock = threading.Lock()
+
+# 主要指数
+MAJOR_INDICES = {
+    'S&P 500': '^GSPC',
+    'Dow Jones': '^DJI',
+    'NASDAQ': '^IXIC',
+    'Russell 2000': '^RUT',
+    'VIX': '^VIX',
+    'Nikkei 225': '^N225',
+    'FTSE 100': '^FTSE',
+    'DAX': '^GDAXI'
+}
+
+# 為替ペア
+CURRENCY_PAIRS = {
+    'USD/JPY': 'USDJPY=X',
+    'EUR/USD': 'EURUSD=X',
+    'GBP/USD': 'GBPUSD=X',
+    'USD/CHF': 'USDCHF=X',
+    'AUD/USD': 'AUDUSD=X',
+    'USD/CAD': 'USDCAD=X',
+    'USD/CNY': 'USDCNY=X'
+}
+
+# 商品
+COMMODITIES = {
+    'Gold': 'GC=F',
+    'Silver': 'SI=F',
+    'Crude Oil': 'CL=F',
+    'Natural Gas': 'NG=F',
+    'Copper': 'HG=F',
+    'Wheat': 'ZW=F',
+    'Corn': 'ZC=F'
+}
+
+# 一括取得する全銘柄
+MARKET_SYMBOLS = [*MAJOR_INDICES.values(), *CURRENCY_PAIRS.values(), *COMMODITIES.values()]
+
+def _fallback(rows, partial_errors, symbol, reason):
+    """取得できなかった銘柄は黙って落とさず partial_errors に入れる（前回の行があれば stale として返す）"""
+    last = _LAST_GOOD.get(symbol)
+    if last is not None:
+        rows.append(dict(last, stale=True))
+        partial_errors.append(f'{symbol}: {reason}（前回取得した値を返却）')
+    else:
+        partial_errors.append(f'{symbol}: {reason}')
+
+def _market_snapshot():
+    """指数・為替・商品の全銘柄のスナップショット（戻り値: (銘柄 → スナップショット, 銘柄 → エラー, キャッシュ状態)）
+
+    全銘柄を yf.download の1回の呼び出しで取得し、MARKET_CACHE_TTL の間は使い回す。
+    /home のように複数のセクションから同時に呼ばれても、取得は最初の1件だけが行い残りは結果を待つ
+    （デッドラインまでに待ちきれなければ全銘柄をエラーとして返す）。
+    取れなかった銘柄・前回の値（stale）を返した銘柄がある部分結果はキャッシュしない。
+    """
+    global _SNAPSHOT
+    left = remaining()
+    if not _snapshot_lock.acquire(timeout=-1 if left is None else left):
+        # 取得中の結果を待ちきれなかった（各セクションは前回の行と partial_errors で返す）
+        return {}, {symbol: 'デッドライン超過（マーケットデータの取得待ち）' for symbol in MARKET_SYMBOLS}, 'miss'
+    try:
+        if _SNAPSHOT is not None and time.time() - _SNAPSHOT['ts'] < MARKET_CACHE_TTL:
+            return _SNAPSHOT['snapshots'], {}, 'hit'
+        snapshots, errors = get_quote_snapshots(MARKET_SYMBOLS, ttl=MARKET_CACHE_TTL)
+        if not errors and not any(snapshot.get('stale') for snapshot in snapshots.values()):
+            _SNAPSHOT = {'ts': time.time(), 'snapshots': snapshots}
+        return snapshots, errors, 'miss'
+    finally:
+        _snapshot_lock.release()
+
+def _section_rows(symbols, snapshots, errors, make_row):
+    """1セクション分の行を組み立てる（戻り値: (行のリスト, partial_errors)）"""
+    rows = []
+    partial_errors = []
+    for name, symbol in symbols.items():
+        snapshot = snapshots.get(symbol)
+        if snapshot is None or snapshot['previous_close'] is None or snapshot['change'] is None:
+            _fallback(rows, partial_errors, symbol, errors.get(symbol) or '直近2営業日のデータがありません')
+            continue
+        row = make_row(name, snapshot)
+        if snapshot.get('stale'):
+            row['stale'] = True
+            partial_errors.append(f"{symbol}: {snapshot.get('stale_reason') or '取得エラー'}（前回取得した値を返却）")
+        else:
+            _LAST_GOOD[symbol] = row
+        rows.append(row)
+    return rows, partial_errors
+
+def _index_row(name, snapshot):
+    return {
+        'name': name,
+        'symbol': snapshot['symbol'],
+        'value': round(snapshot['price'], 2),
+        'change': round(snapshot['change'], 2),
+        'change_percent': snapshot['change_percent'],
+        'volume': snapshot['volume'] or 0
+    }
+
+def _currency_row(name, snapshot):
+    return {
+        'pair': name,
+        'symbol': snapshot['symbol'],
+        'rate': round(snapshot['price'], 4),
+        'change': round(snapshot['change'], 4),
+        'change_percent': snapshot['change_percent']
+    }
+
+def _commodity_row(name, snapshot):
+    return {
+        'name': name,
+        'symbol': snapshot['symbol'],
+        'price': round(snapshot['price'], 2),
+        'change': round(snapshot['change'], 2),
+        'change_percent': snapshot['change_percent'],
+        'volume': snapshot['volume'] or 0
+    }
+
+# セクション名 → (銘柄, 行の組み立て, 件数のキー)
+_SECTIONS = {
+    'indices': (MAJOR_INDICES, _index_row, 'total_indices'),
+    'currencies': (CURRENCY_PAIRS, _currency_row, 'total_pairs'),
+    'commodities': (COMMODITIES, _commodity_row, 'total_commodities'),
+}
+
+def _finish(result, partial_errors, cache):
+    result['cache'] = cache
+    if partial_errors:
+        result['partial_errors'] = partial_errors
+    upstream = upstream_status()
+    if upstream:
+        result['upstream'] = upstream
+    return result
+
+def _limit(query_parameters):
+    """limit（各セクションの最大件数。既定: 10、最大: 20）"""
+    try:
+        return max(1, min(int((query_parameters or {}).get('limit') or 10), 20))
+    except (TypeError, ValueError):
+        return 10
+
+def _section_api(section, query_parameters):
+    """個別エンドポイント（/markets/indices 等）：共有スナップショットから1セクションを返す"""
+    symbols, make_row, total_key = _SECTIONS[section]
+    snapshots, errors, cache = _market_snapshot()
+    rows, partial_errors = _section_rows(symbols, snapshots, errors, make_row)
+    rows = rows[:_limit(query_parameters)]
+    result = {
+        'status': 'success',
+        'data': rows,
+        'metadata': {
+            total_key: len(rows),
+            'last_updated': datetime.now().isoformat()
+        },
+        'timestamp': datetime.now().isoformat()
+    }
+    return _finish(result, partial_errors, cache)
+
+def get_markets_overview_api(query_parameters):
+    """マーケット概況API（主要指数・為替・商品を1回の一括取得でまとめて返す）"""
+    try:
+        limit = _limit(query_parameters)
+        snapshots, errors, cache = _market_snapshot()
+        data = {}
+        metadata = {}
+        partial_errors = []
+        for section, (symbols, make_row, total_key) in _SECTIONS.items():
+            rows, section_errors = _section_rows(symbols, snapshots, errors, make_row)
+            data[section] = rows[:limit]
+            metadata[total_key] = len(data[section])
+            partial_errors.extend(section_errors)
+        metadata['total_symbols'] = len(MARKET_SYMBOLS)
+        metadata['limit'] = limit
+        metadata['last_updated'] = datetime.now().isoformat()
+        result = {
+            'status': 'success',
+            'data': data,
+            'metadata': metadata,
+            'timestamp': datetime.now().isoformat()
+        }
+        return _finish(result, partial_errors, cache)
+
+    except Exception as e:
+        return {'error': f'マーケット概況取得エラー: {str(e)}'}
+
+def get_markets_indices_api(query_parameters):
+    """主要指数一覧取得API"""
+    try:
+        return _section_api('indices', query_parameters)
+    except Exception as e:
+        return {'error': f'指数データ取得エラー: {str(e)}'}
+
+def get_markets_currencies_api(query_parameters):
+    """為替レート取得API"""
+    try:
+        return _section_api('currencies', query_parameters)
+    except Exception as e:
+        return {'error': f'為替データ取得エラー: {str(e)}'}
+
+def get_markets_commodities_api(query_parameters):
+    """商品価格取得API"""
+    try:
+        return _section_api('commodities', query_parameters)
+    except Exception as e:
+        return {'error': f'商品データ取得エラー: {str(e)}'}
+
+def get_markets_status_api(query_parameters):
+    """市場開閉状況取得API"""
+    try:
+        # 主要市場の営業時間
+        markets = [
+            {
+                'name': 'NYSE/NASDAQ',
+                'timezone': 'US/Eastern',
+                'open_time': '09:30',
+                'close_time': '16:00',
+                'days': [0, 1, 2, 3, 4]  # Monday-Friday
+            },
+            {
+                'name': 'Tokyo Stock Exchange',
+                'timezone': 'Asia/Tokyo',
+                'open_time': '09:00',
+                'close_time': '15:00',
+                'days': [0, 1, 2, 3, 4]
+            },
+            {
+                'name': 'London Stock Exchange',
+                'timezone': 'Europe/London',
+                'open_time': '08:00',
+                'close_time': '16:30',
+                'days': [0, 1, 2, 3, 4]
+            }
+        ]
+
+        market_status = []
+
+        for market in markets:
+            try:
+                # 簡易的な時間計算（pytzなし）
+                from datetime import datetime, timedelta
+
+                # UTC時間を取得
+                utc_now = datetime.utcnow()
+
+                # タイムゾーンオフセット（簡易版）
+                tz_offsets = {
+                    'US/Eastern': -5,
+                    'Asia/Tokyo': 9,
+                    'Europe/London': 0
+                }
+
+                offset = tz_offsets.get(market['timezone'], 0)
+                local_time = utc_now + timedelta(hours=offset)
+
+                # 現在の曜日が営業日かチェック
+                is_business_day = local_time.weekday() in market['days']
+
+                # 営業時間内かチェック
+                open_time = datetime.strptime(market['open_time'], '%H:%M').time()
+                close_time = datetime.strptime(market['close_time'], '%H:%M').time()
+
+                is_open = (is_business_day and
+                          open_time <= local_time.time() <= close_time)
+
+                market_status.append({
+                    'market': market['name'],
+                    'timezone': market['timezone'],
+                    'local_time': local_time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'is_open': is_open,
+                    'is_business_day': is_business_day,
+                    'open_time': market['open_time'],
+                    'close_time': market['close_time']
+                })
+
+            except Exception as e:
+                continue
+
+        return {
+            'status': 'success',
+            'data': market_status,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        return {'error': f'市場状況取得エラー: {str(e)}'}
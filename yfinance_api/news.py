@@ -0,0 +1,196 @@
+"""金融ニュースRSS（/news/rss）"""
+
+import hashlib
+import re
+from datetime import datetime
+
+from .aiofetch import fetch_many
+from .deadline import DeadlineExceeded
+
+
+# RSSフィードソース設定
+RSS_SOURCES = [
+    {
+        'name': 'Yahoo Finance',
+        'url': 'https://finance.yahoo.com/rss/2.0',
+        'category': 'general'
+    },
+    {
+        'name': 'MarketWatch Top Stories',
+        'url': 'https://www.marketwatch.com/rss/topstories',
+        'category': 'market'
+    }
+]
+
+def clean_html(text):
+    if not text:
+        return ""
+    clean = re.compile('<.*?>')
+    text = re.sub(clean, '', text)
+    text = ' '.join(text.split())
+    return text
+
+def generate_news_id(title, url):
+    content = f"{title}_{url}".encode('utf-8')
+    return hashlib.md5(content).hexdigest()[:12]
+
+def parse_published_date(entry):
+    published_date = None
+    if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        try:
+            published_date = datetime(*entry.published_parsed[:6])
+        except:
+            pass
+    if not published_date and hasattr(entry, 'published'):
+        try:
+            published_date = entry.published
+        except:
+            pass
+    if not published_date and hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        try:
+            published_date = datetime(*entry.updated_parsed[:6])
+        except:
+            pass
+    return published_date
+
+def fetch_rss_feed(source, timeout_sec=None):
+    """1つのフィードを取得して記事に変換する（取得・解析に失敗したら空）"""
+    try:
+        response = fetch_many([{'url': source['url']}], timeout=timeout_sec)[0]
+    except Exception:
+        return []
+    return parse_rss_feed(source, response['body']) if not response['error'] else []
+
+def parse_rss_feed(source, content):
+    """取得済みのフィード本文を記事のリストに変換する"""
+    try:
+        import feedparser  # lazy import
+        feed = feedparser.parse(content)
+        articles = []
+        for entry in feed.entries:
+            title = clean_html(entry.get('title', ''))
+            if not title:
+                continue
+            url = entry.get('link', '')
+            summary = clean_html(entry.get('summary', entry.get('description', '')))
+            published_date = parse_published_date(entry)
+            author = entry.get('author', '')
+            image_url = None
+            if hasattr(entry, 'media_content'):
+                for media in entry.media_content:
+                    if media.get('type', '').startswith('image'):
+                        image_url = media.get('url')
+                        break
+            if not image_url and hasattr(entry, 'enclosures'):
+                for enclosure in entry.enclosures:
+                    if enclosure.type.startswith('image'):
+                        image_url = enclosure.href
+                        break
+            tags = []
+            if hasattr(entry, 'tags'):
+                tags = [tag.term for tag in entry.tags if hasattr(tag, 'term')]
+            article = {
+                'id': generate_news_id(title, url),
+                'title': title,
+                'summary': summary[:500] + '...' if len(summary) > 500 else summary,
+                'url': url,
+                'source': source['name'],
+                'category': source['category'],
+                'published_at': published_date.isoformat() if isinstance(published_date, datetime) else published_date,
+                'author': author,
+                'image_url': image_url,
+                'tags': tags
+            }
+            articles.append(article)
+        return articles
+    except Exception as e:
+        return []
+
+def lamuda_get_rss_news_api(query_parameters):
+    category = query_parameters.get('category', 'all')
+    source_filter = query_parameters.get('source', '')
+    limit = min(int(query_parameters.get('limit', 50)), 200)
+    sort = query_parameters.get('sort', 'published_desc')
+    timeout_sec = max(1, min(int(str(query_parameters.get('timeout', '5')) or '5'), 20))
+    cache_ttl = max(0, min(int(str(query_parameters.get('cache_ttl', '30')) or '30'), 600))
+    target_sources = RSS_SOURCES
+    if category != 'all':
+        target_sources = [s for s in target_sources if s['category'] == category]
+    if source_filter:
+        target_sources = [s for s in target_sources if source_filter.lower() in s['name'].lower()]
+    # ニュースキャッシュ
+    global _NEWS_CACHE  # type: ignore
+    if '_NEWS_CACHE' not in globals():
+        _NEWS_CACHE = {}
+    cache_key = ('news_v1', category, source_filter, limit, sort)
+    now_ts = datetime.now().timestamp()
+    cached = _NEWS_CACHE.get(cache_key) if cache_ttl > 0 else None
+    if cached and (now_ts - cached.get('ts', 0) < cache_ttl):
+        data = dict(cached['data'])
+        data['metadata'] = dict(data.get('metadata', {}))
+        data['metadata']['cache'] = 'hit'
+        return data
+
+    all_articles = []
+    partial_errors = []
+    # 全フィードを並行に取得する（タイムアウトはリクエストの残り時間まで。失敗したフィードは静かにスキップ）
+    try:
+        responses = fetch_many([{'url': source['url']} for source in target_sources], timeout=timeout_sec)
+    except DeadlineExceeded as e:
+        responses = []
+        partial_errors.extend(f"{source['name']}: {str(e)}" for source in target_sources)
+    for source, response in zip(target_sources, responses):
+        if not response['error']:
+            all_articles.extend(parse_rss_feed(source, response['body']))
+    unique_articles = {}
+    for article in all_articles:
+        title_key = article['title'].lower().strip()
+        if title_key not in unique_articles:
+            unique_articles[title_key] = article
+        else:
+            existing = unique_articles[title_key]
+            if article['published_at'] and existing['published_at']:
+                try:
+                    if isinstance(article['published_at'], str):
+                        article_date = datetime.fromisoformat(article['published_at'].replace('Z', '+00:00'))
+                    else:
+                        article_date = article['published_at']
+                    if isinstance(existing['published_at'], str):
+                        existing_date = datetime.fromisoformat(existing['published_at'].replace('Z', '+00:00'))
+                    else:
+                        existing_date = existing['published_at']
+                    if article_date > existing_date:
+                        unique_articles[title_key] = article
+                except:
+                    pass
+    final_articles = list(unique_articles.values())
+    try:
+        if sort == 'published_desc':
+            final_articles.sort(key=lambda x: x['published_at'] or '', reverse=True)
+        elif sort == 'published_asc':
+            final_articles.sort(key=lambda x: x['published_at'] or '')
+        elif sort == 'title_asc':
+            final_articles.sort(key=lambda x: x['title'].lower())
+    except Exception:
+        pass
+    final_articles = final_articles[:limit]
+    result = {
+        'status': 'success',
+        'data': final_articles,
+        'metadata': {
+            'total_sources': len(target_sources),
+            'total_articles': len(final_articles),
+            'sources_used': [s['name'] for s in target_sources],
+            'category_filter': category,
+            'source_filter': source_filter,
+            'sort': sort,
+            'last_updated': datetime.now().isoformat()
+        },
+        'timestamp': datetime.now().isoformat()
+    }
+    if partial_errors:
+        result['partial_errors'] = partial_errors
+
+    if cache_ttl > 0 and not partial_errors:
+        _NEWS_CACHE[cache_key] = {'ts': now_ts, 'data': result}
+    return result
@@ -0,0 +1,85 @@
+"""ポートフォリオ評価（保有 × 株価スナップショット）
+
+保有は HOLDINGS_TABLE から1回だけ読み、全銘柄の価格は quotes の一括取得（共有キャッシュ）で揃える。
+評価額・前日比・含み損益は銘柄数ぶんの配列でまとめて計算する。
+"""
+
+from typing import Any, Dict, List
+
+from .common import np
+from .holdings import list_holdings
+from .quotes import get_quote_snapshots
+
+
+def _round(values, digits: int = 4) -> List:
+    return [None if np.isnan(v) else round(float(v), digits) for v in values]
+
+
+def value_holdings(holdings: List[Dict[str, Any]], snapshots: Dict[str, Dict]) -> Dict[str, Any]:
+    """保有一覧とスナップショットから銘柄別・合計の評価を計算する
+
+    価格のない銘柄は評価額などを null とし、合計からは除く（取得原価の合計には含める）。
+    """
+    symbols = [h['symbol'] for h in holdings]
+    quantity = np.array([float(h['quantity']) for h in holdings], dtype=float)
+    cost_basis = np.array([float(h['cost_basis']) for h in holdings], dtype=float)
+    price = np.array([(snapshots.get(s) or {}).get('price') for s in symbols], dtype=float)
+    change = np.array([(snapshots.get(s) or {}).get('change') for s in symbols], dtype=float)
+    previous_close = np.array([(snapshots.get(s) or {}).get('previous_close') for s in symbols], dtype=float)
+
+    market_value = quantity * price
+    day_change = quantity * change
+    unrealized = market_value - cost_basis
+    with np.errstate(divide='ignore', invalid='ignore'):
+        unrealized_pct = np.where(cost_basis > 0, unrealized / cost_basis * 100, np.nan)
+
+    priced = ~np.isnan(market_value)
+    total_value = float(np.nansum(market_value))
+    total_cost_priced = float(cost_basis[priced].sum())
+    total_day_change = float(np.nansum(day_change))
+    total_previous = float(np.nansum(quantity * previous_close))
+    total_unrealized = float(np.nansum(unrealized))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = market_value / total_value * 100 if total_value else np.full(len(symbols), np.nan)
+
+    columns = {
+        'price': _round(price),
+        'market_value': _round(market_value, 2),
+        'day_change': _round(day_change, 2),
+        'unrealized_pnl': _round(unrealized, 2),
+        'unrealized_pnl_percent': _round(unrealized_pct, 2),
+        'weight_percent': _round(weight, 2),
+    }
+    positions = []
+    for i, holding in enumerate(holdings):
+        snapshot = snapshots.get(symbols[i]) or {}
+        positions.append({
+            **holding,
+            **{name: values[i] for name, values in columns.items()},
+            'change_percent': snapshot.get('change_percent'),
+            'as_of': snapshot.get('as_of'),
+        })
+
+    return {
+        'positions': positions,
+        'totals': {
+            'market_value': round(total_value, 2),
+            'cost_basis': round(float(cost_basis.sum()), 2),
+            'day_change': round(total_day_change, 2),
+            'day_change_percent': round(total_day_change / total_previous * 100, 2) if total_previous else None,
+            'unrealized_pnl': round(total_unrealized, 2),
+            'unrealized_pnl_percent': round(total_unrealized / total_cost_priced * 100, 2) if total_cost_priced else None,
+            'realized_pnl': round(float(sum(float(h['realized_pnl']) for h in holdings)), 2),
+            'positions': len(holdings),
+            'priced_positions': int(priced.sum()),
+        },
+    }
+
+
+def get_portfolio_valuation(email: str) -> Dict[str, Any]:
+    """ユーザーの保有を現在値で評価する（価格の取れなかった銘柄は errors に入る）"""
+    holdings = list_holdings(email)
+    snapshots, errors = get_quote_snapshots([h['symbol'] for h in holdings])
+    result = value_holdings(holdings, snapshots)
+    result['errors'] = [{'symbol': s, 'error': e} for s, e in errors.items()]
+    return result
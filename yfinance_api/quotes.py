@@ -0,0 +1,316 @@
+"""株価スナップショット（直近終値・前日比・出来高）の一括取得と共有キャッシュ
+
+複数銘柄の価格は yf.download の1回の呼び出しでまとめて取得し、銘柄ごとに TTL 付きでキャッシュする。
+ポートフォリオ評価・ウォッチリスト・ランキング・一括価格APIが同じキャッシュを使うため、
+同じ銘柄を続けて参照しても上流への問い合わせは1回で済む。
+
+環境変数:
+- QUOTE_CACHE_TTL    : スナップショットのキャッシュ秒（既定: 30）
+- QUOTE_BATCH_SIZE   : yf.download 1回あたりの最大銘柄数（既定: 200）
+- QUOTE_FETCH_TIMEOUT: yf.download のタイムアウト秒（既定: 10）
+- QUOTE_PROFILE_TTL  : 銘柄名・時価総額・セクター（ticker.info）のキャッシュ秒（既定: 3600）
+- QUOTE_STALE_TTL    : 上流の障害時（ブレーカー open・取得エラー）に期限切れのスナップショットを
+                       stale として返す最大経過秒（既定: 3600）
+- QUOTE_CACHE_SIZE   : スナップショット・プロファイルそれぞれのキャッシュに残す最大銘柄数。
+                       超えた分は最も長く参照されていない銘柄から捨てる（既定: 2000）
+"""
+
+import concurrent.futures
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .common import yf, pd, np
+from . import workers
+from .deadline import fetch_timeout, remaining
+from .upstream import upstream_open
+
+QUOTE_CACHE_TTL = float(os.environ.get('QUOTE_CACHE_TTL', '30'))
+QUOTE_BATCH_SIZE = int(os.environ.get('QUOTE_BATCH_SIZE', '200'))
+QUOTE_FETCH_TIMEOUT = float(os.environ.get('QUOTE_FETCH_TIMEOUT', '10'))
+# /ticker/price?tickers= で1リクエストに指定できる最大銘柄数
+MAX_BATCH_SYMBOLS = 300
+QUOTE_PROFILE_TTL = float(os.environ.get('QUOTE_PROFILE_TTL', '3600'))
+QUOTE_STALE_TTL = float(os.environ.get('QUOTE_STALE_TTL', '3600'))
+# 銘柄はクライアントが指定するため上限を設ける（1リクエストの最大銘柄数より十分大きくする）
+QUOTE_CACHE_SIZE = max(int(os.environ.get('QUOTE_CACHE_SIZE', '2000')), MAX_BATCH_SYMBOLS)
+PROFILE_FETCH_WORKERS = 8
+# 休場日や市場ごとの祝日のずれがあっても直近2営業日が揃う期間
+QUOTE_PERIOD = '5d'
+
+# どちらも LRU（参照・更新のたびに末尾へ移し、上限を超えたら先頭から捨てる）。_lock の中で操作する
+_cache: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+_lock = threading.Lock()
+_profiles: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+_stats = {'hits': 0, 'misses': 0, 'upstream_calls': 0, 'profile_calls': 0, 'stale_served': 0}
+
+
+def normalize_symbols(symbols: Iterable[str]) -> List[str]:
+    """大文字化・空白除去・重複除去（順序は維持）"""
+    seen = []
+    for symbol in symbols:
+        symbol = str(symbol or '').strip().upper()
+        if symbol and symbol not in seen:
+            seen.append(symbol)
+    return seen
+
+
+def _column_frame(data, field: str, symbols: List[str]):
+    """yf.download の結果から field（Close / Volume）の 日付×銘柄 の表を取り出す"""
+    if data is None or data.empty:
+        return pd.DataFrame(columns=symbols)
+    if isinstance(data.columns, pd.MultiIndex):
+        if field not in data.columns.get_level_values(0):
+            return pd.DataFrame(index=data.index, columns=symbols)
+        frame = data[field]
+    else:
+        # 単一銘柄で列が平坦な場合
+        frame = data[[field]].rename(columns={field: symbols[0]}) if field in data.columns else pd.DataFrame(index=data.index)
+    return frame.reindex(columns=symbols)
+
+
+def snapshots_from_download(data, symbols: List[str]) -> Dict[str, Dict]:
+    """yf.download の結果をベクトル演算で銘柄ごとのスナップショットに変換する
+
+    銘柄ごとに欠損を除いた最後の2営業日の終値を使う（取引所ごとに休場日が違っても揃う）。
+    """
+    closes_frame = _column_frame(data, 'Close', symbols)
+    if closes_frame.empty:
+        return {}
+    closes = closes_frame.to_numpy(dtype=float)
+    volumes = _column_frame(data, 'Volume', symbols).reindex(index=closes_frame.index).to_numpy(dtype=float)
+    dates = closes_frame.index
+    n_rows = closes.shape[0]
+
+    valid = ~np.isnan(closes)
+    has_last = valid.any(axis=0)
+    last_idx = n_rows - 1 - np.argmax(valid[::-1], axis=0)
+    valid_prev = valid.copy()
+    valid_prev[last_idx, np.arange(len(symbols))] = False
+    has_prev = valid_prev.any(axis=0)
+    prev_idx = n_rows - 1 - np.argmax(valid_prev[::-1], axis=0)
+
+    cols = np.arange(len(symbols))
+    last = closes[last_idx, cols]
+    prev = np.where(has_prev, closes[prev_idx, cols], np.nan)
+    change = last - prev
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = np.where(prev != 0, change / prev * 100, np.nan)
+    volume = volumes[last_idx, cols] if volumes.size else np.full(len(symbols), np.nan)
+
+    def _num(value, digits):
+        return None if np.isnan(value) else round(float(value), digits)
+
+    snapshots = {}
+    for i, symbol in enumerate(symbols):
+        if not has_last[i]:
+            continue
+        as_of = dates[last_idx[i]]
+        snapshots[symbol] = {
+            'symbol': symbol,
+            'price': _num(last[i], 4),
+            'previous_close': _num(prev[i], 4),
+            'change': _num(change[i], 4),
+            'change_percent': _num(change_pct[i], 2),
+            'volume': None if np.isnan(volume[i]) else int(volume[i]),
+            'as_of': as_of.isoformat() if hasattr(as_of, 'isoformat') else str(as_of),
+        }
+    return snapshots
+
+
+def _store(cache: 'OrderedDict[str, Tuple[float, Dict]]', symbol: str, entry: Tuple[float, Dict]) -> None:
+    """LRU キャッシュに入れる（_lock の中で呼ぶ）"""
+    cache[symbol] = entry
+    cache.move_to_end(symbol)
+    while len(cache) > QUOTE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _count(name: str) -> None:
+    with _lock:
+        _stats[name] += 1
+
+
+def _download(symbols: List[str]):
+    """1バッチ分の日足を取得する
+
+    銘柄ごとの失敗は返ってきた表の列（欠けている・終値がすべて NaN）で判定する
+    （yfinance が失敗理由を入れる shared._ERRORS はプロセス共有で、同時に動く他の取得の分が混ざるため使わない）。
+    """
+    _count('upstream_calls')
+    return yf.download(
+        tickers=symbols,
+        period=QUOTE_PERIOD,
+        interval='1d',
+        group_by='column',
+        auto_adjust=False,
+        threads=True,
+        progress=False,
+        timeout=fetch_timeout(QUOTE_FETCH_TIMEOUT),
+    )
+
+
+def get_quote_snapshots(symbols: Iterable[str], ttl: Optional[float] = None) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """銘柄リストのスナップショットを返す（戻り値: (銘柄 → スナップショット, 銘柄 → エラー)）
+
+    キャッシュにない銘柄だけを QUOTE_BATCH_SIZE ごとにまとめて取得する。
+    1銘柄の失敗は errors に入るだけで、他の銘柄の結果には影響しない。
+    リクエストのデッドラインを過ぎたバッチは取得せずに errors に入る。
+    上流のブレーカーが開いている間は取得せず、取得に失敗した銘柄と合わせて
+    QUOTE_STALE_TTL 以内のキャッシュがあれば 'stale': True と失敗の理由 'stale_reason' を付けて返す。
+    """
+    symbols = normalize_symbols(symbols)
+    ttl = QUOTE_CACHE_TTL if ttl is None else ttl
+    now = time.time()
+    found: Dict[str, Dict] = {}
+    missing = []
+    with _lock:
+        for symbol in symbols:
+            cached = _cache.get(symbol)
+            if cached and now - cached[0] < ttl:
+                found[symbol] = cached[1]
+                _cache.move_to_end(symbol)
+                _stats['hits'] += 1
+            else:
+                missing.append(symbol)
+                _stats['misses'] += 1
+
+    errors: Dict[str, str] = {}
+    if missing and upstream_open():
+        for symbol in missing:
+            errors[symbol] = '価格取得エラー: 上流停止中（サーキットブレーカー open）'
+        missing = []
+    for start in range(0, len(missing), QUOTE_BATCH_SIZE):
+        batch = missing[start:start + QUOTE_BATCH_SIZE]
+        try:
+            data = _download(batch)
+            fetched = snapshots_from_download(data, batch)
+        except Exception as e:
+            for symbol in batch:
+                errors[symbol] = f'価格取得エラー: {str(e)}'
+            continue
+        fetched_at = time.time()
+        with _lock:
+            for symbol, snapshot in fetched.items():
+                _store(_cache, symbol, (fetched_at, snapshot))
+        found.update(fetched)
+        for symbol in batch:
+            if symbol not in fetched:
+                # 列がない・終値がすべて NaN（上流の失敗か、データのない銘柄）
+                errors[symbol] = '価格データが見つかりません'
+
+    _serve_stale(found, errors, now)
+    return {s: found[s] for s in symbols if s in found}, errors
+
+
+def _serve_stale(found: Dict[str, Dict], errors: Dict[str, str], now: float) -> None:
+    """取得に失敗した銘柄のうち QUOTE_STALE_TTL 以内のキャッシュがあるものを stale として found に移す
+
+    errors からは外し、失敗の理由はスナップショットの stale_reason に残す。
+    """
+    with _lock:
+        for symbol in list(errors):
+            cached = _cache.get(symbol)
+            if not cached or now - cached[0] >= QUOTE_STALE_TTL:
+                continue
+            found[symbol] = dict(cached[1], stale=True, stale_reason=errors.pop(symbol))
+            _stats['stale_served'] += 1
+
+
+def _fetch_profile(symbol: str) -> Dict:
+    """1銘柄の ticker.info を取得してキャッシュに入れる（失敗した銘柄はキャッシュしない）"""
+    _count('profile_calls')
+    try:
+        info = yf.Ticker(symbol).info or {}
+    except Exception:
+        info = {}
+    profile = _profile_from_info(symbol, info)
+    if profile['market_cap'] is not None or profile['name'] != symbol:
+        with _lock:
+            _store(_profiles, symbol, (time.time(), profile))
+    return profile
+
+
+def _fetch_profiles(symbols: List[str]) -> None:
+    for symbol in symbols:
+        _fetch_profile(symbol)
+
+
+def _profile_from_info(symbol: str, info: Dict) -> Dict:
+    return {
+        'name': info.get('longName', info.get('shortName', symbol)),
+        'market_cap': info.get('marketCap'),
+        'sector': info.get('sector', 'Unknown'),
+    }
+
+
+def get_profiles(symbols: Iterable[str], ttl: Optional[float] = None) -> Dict[str, Dict]:
+    """銘柄名・時価総額・セクターを返す（価格より変化が遅いので長めにキャッシュ）
+
+    取得はコンテナ共有のワーカープールで PROFILE_FETCH_WORKERS 本に分けて行う。
+    取得に失敗した銘柄・デッドラインまでに取れなかった銘柄は銘柄コードを名前にした既定値になる
+    （キャッシュはしない）。間に合わなかった取得は手放して最後まで実行させ、取れた分は
+    キャッシュに入るため次のリクエストで使える。
+    上流のブレーカーが開いている間は期限切れのキャッシュも使い、取得しない。
+    """
+    symbols = normalize_symbols(symbols)
+    ttl = QUOTE_PROFILE_TTL if ttl is None else ttl
+    breaker_open = upstream_open()
+    now = time.time()
+    with _lock:
+        found = {s: _profiles[s][1] for s in symbols
+                 if s in _profiles and (breaker_open or now - _profiles[s][0] < ttl)}
+        for symbol in found:
+            _profiles.move_to_end(symbol)
+    missing = [s for s in symbols if s not in found]
+    if missing and breaker_open:
+        found.update({s: _profile_from_info(s, {}) for s in missing})
+    elif missing:
+        futures = []
+        for i in range(min(PROFILE_FETCH_WORKERS, len(missing))):
+            try:
+                futures.append(workers.submit(_fetch_profiles, missing[i::PROFILE_FETCH_WORKERS]))
+            except workers.WorkerPoolFull:
+                # 投入できなかった分は既定値になる
+                break
+        concurrent.futures.wait(futures, timeout=remaining())
+        for future in futures:
+            if not future.done():
+                workers.abandon(future)
+        with _lock:
+            for symbol in missing:
+                cached = _profiles.get(symbol)
+                found[symbol] = cached[1] if cached else _profile_from_info(symbol, {})
+    return {s: found[s] for s in symbols}
+
+
+def cached_profiles(symbols: Iterable[str], ttl: Optional[float] = None) -> Dict[str, Dict]:
+    """キャッシュ済みのプロファイルだけを返す（上流には問い合わせない）"""
+    ttl = QUOTE_PROFILE_TTL if ttl is None else ttl
+    now = time.time()
+    with _lock:
+        return {s: _profiles[s][1] for s in normalize_symbols(symbols)
+                if s in _profiles and now - _profiles[s][0] < ttl}
+
+
+def put_quote_snapshots(snapshots: Dict[str, Dict]) -> None:
+    """他の経路で取得したスナップショットをキャッシュに入れる"""
+    now = time.time()
+    with _lock:
+        for symbol, snapshot in snapshots.items():
+            _store(_cache, symbol, (now, snapshot))
+
+
+def quote_cache_stats() -> Dict[str, int]:
+    with _lock:
+        return dict(_stats, cached_symbols=len(_cache))
+
+
+def clear_quote_cache() -> None:
+    with _lock:
+        _cache.clear()
+        _profiles.clear()
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,356 @@
+"""ランキングAPI（/rankings/stocks, /rankings/sectors, /rankings/crypto）"""
+
+from datetime import datetime
+
+from .charts import CHART_FORMATS, generate_ranking_chart, generate_sector_chart
+from .quotes import get_profiles, get_quote_snapshots
+from .upstream import upstream_open, upstream_status
+
+
+# ランキング用銘柄リスト
+STOCK_LISTS = {
+    'sp500': [
+        'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'BRK-B', 'UNH', 'JNJ',
+        'JPM', 'V', 'PG', 'HD', 'MA', 'DIS', 'PYPL', 'BAC', 'ADBE', 'CRM',
+        'NFLX', 'KO', 'PEP', 'ABT', 'TMO', 'AVGO', 'COST', 'DHR', 'MRK', 'ACN',
+        'WMT', 'VZ', 'TXN', 'QCOM', 'HON', 'LLY', 'UNP', 'LOW', 'IBM', 'RTX',
+        'CAT', 'SPGI', 'AXP', 'PLD', 'GS', 'AMAT', 'DE', 'ADI', 'GILD', 'ISRG'
+    ],
+    'nasdaq100': [
+        'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'NFLX', 'ADBE', 'CRM',
+        'PYPL', 'INTC', 'AMD', 'CSCO', 'QCOM', 'AVGO', 'TXN', 'ADI', 'MU', 'KLAC',
+        'LRCX', 'AMAT', 'ASML', 'ORLY', 'PAYX', 'ADP', 'INTU', 'SNPS', 'CDNS', 'MELI',
+        'JD', 'BIDU', 'PDD', 'NTES', 'BABA', 'TCOM', 'VRTX', 'REGN', 'GILD', 'AMGN',
+        'MRNA', 'BIIB', 'ILMN', 'IDXX', 'ALGN', 'DXCM', 'WDAY', 'ZS', 'CRWD', 'OKTA'
+    ]
+}
+
+# セクター・業界定義
+SECTORS = {
+    'XLK': {'name': 'Technology', 'symbols': ['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'META', 'ADBE', 'CRM', 'PYPL', 'NFLX', 'TSLA']},
+    'XLF': {'name': 'Financial', 'symbols': ['JPM', 'BAC', 'WFC', 'GS', 'MS', 'C', 'AXP', 'BLK', 'SCHW', 'USB']},
+    'XLE': {'name': 'Energy', 'symbols': ['XOM', 'CVX', 'COP', 'EOG', 'SLB', 'PSX', 'VLO', 'MPC', 'HAL', 'BKR']},
+    'XLV': {'name': 'Healthcare', 'symbols': ['JNJ', 'UNH', 'PFE', 'ABT', 'TMO', 'DHR', 'MRK', 'LLY', 'GILD', 'AMGN']},
+    'XLI': {'name': 'Industrial', 'symbols': ['UNP', 'HON', 'CAT', 'DE', 'RTX', 'LMT', 'BA', 'GE', 'MMM', 'UPS']},
+    'XLP': {'name': 'Consumer Staples', 'symbols': ['PG', 'KO', 'PEP', 'WMT', 'COST', 'PM', 'MO', 'EL', 'CL', 'GIS']},
+    'XLY': {'name': 'Consumer Discretionary', 'symbols': ['AMZN', 'TSLA', 'HD', 'DIS', 'MCD', 'NKE', 'SBUX', 'TJX', 'MAR', 'BKNG']},
+    'XLU': {'name': 'Utilities', 'symbols': ['NEE', 'DUK', 'SO', 'D', 'AEP', 'EXC', 'XEL', 'SRE', 'DTE', 'WEC']},
+    'XLRE': {'name': 'Real Estate', 'symbols': ['PLD', 'AMT', 'CCI', 'EQIX', 'PSA', 'O', 'SPG', 'WELL', 'EQR', 'AVB']}
+}
+
+# 主要銘柄リスト（より効率的な取得用）
+MAJOR_STOCKS = [
+    'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'JPM', 'JNJ', 'V',
+    'PG', 'UNH', 'HD', 'MA', 'BAC', 'ABBV', 'PFE', 'KO', 'AVGO', 'PEP',
+    'WMT', 'DIS', 'NFLX', 'ADBE', 'CRM', 'TMO', 'ACN', 'LLY', 'COST', 'NKE'
+]
+
+# 低レイテンシ用の軽量銘柄リスト（fastモード時に使用）
+MAJOR_STOCKS_LITE = [
+    'AAPL', 'MSFT', 'NVDA', 'AMZN', 'META', 'GOOGL',
+    'TSLA', 'AVGO', 'JPM', 'UNH', 'V', 'HD', 'PG', 'BAC', 'PEP'
+]
+
+# セクターETF（改善版）
+SECTOR_ETFS = {
+    'Technology': 'XLK',
+    'Healthcare': 'XLV',
+    'Financial': 'XLF',
+    'Consumer Discretionary': 'XLY',
+    'Communication Services': 'XLC',
+    'Industrial': 'XLI',
+    'Consumer Staples': 'XLP',
+    'Energy': 'XLE',
+    'Utilities': 'XLU',
+    'Real Estate': 'XLRE',
+    'Materials': 'XLB'
+}
+
+# 暗号通貨
+CRYPTO_SYMBOLS = [
+    'BTC-USD', 'ETH-USD', 'BNB-USD', 'XRP-USD', 'ADA-USD',
+    'SOL-USD', 'DOGE-USD', 'MATIC-USD', 'DOT-USD', 'AVAX-USD'
+]
+
+def get_stock_rankings_api(query_parameters):
+    """株価関連ランキング取得API（改善版）"""
+    try:
+        ranking_type = query_parameters.get('type', 'gainers')
+        limit = min(int(query_parameters.get('limit', 10)), 10)
+        market = query_parameters.get('market', 'us')
+        is_fast = str(query_parameters.get('fast', '0')).lower() in ('1', 'true', 'yes')
+        no_chart = str(query_parameters.get('nochart', '0')).lower() in ('1', 'true', 'yes')
+        chart_format = str(query_parameters.get('format', 'png') or 'png').lower()
+        cache_ttl = int(str(query_parameters.get('cache_ttl', '30')) or '30')
+        if chart_format not in CHART_FORMATS:
+            return {'error': f'無効なチャート形式: {chart_format}（png, svg, json のいずれか）'}
+
+        # キャッシュ（ランクのみ）
+        global _RANKINGS_CACHE  # type: ignore
+        if '_RANKINGS_CACHE' not in globals():
+            _RANKINGS_CACHE = {}
+
+        cache_key = ('r_v2', ranking_type, market, limit, is_fast, chart_format)
+        cache_now = datetime.now().timestamp()
+        cached = _RANKINGS_CACHE.get(cache_key)
+        # 上流のブレーカーが開いている間は期限切れのキャッシュも返す
+        breaker_open = upstream_open()
+        if cached and (breaker_open or cache_now - cached.get('ts', 0) < cache_ttl):
+            cached_data = dict(cached['data'])
+            if no_chart:
+                cached_data.pop('chart_image', None)
+                cached_data.pop('chart_data', None)
+            cached_data['cache'] = 'hit'
+            if breaker_open and cache_now - cached.get('ts', 0) >= cache_ttl:
+                cached_data['cache'] = f"stale({int(cache_now - cached['ts'])}s)"
+                cached_data['upstream'] = upstream_status()
+            return cached_data
+
+        # 主要銘柄から取得（fastモードは軽量セット）
+        stocks, partial_errors = _stock_rows(MAJOR_STOCKS_LITE if is_fast else MAJOR_STOCKS)
+
+        if ranking_type == 'gainers':
+            # 上昇銘柄のみフィルタ
+            rankings = [stock for stock in stocks if stock['change_percent'] > 0]
+            rankings.sort(key=lambda x: x['change_percent'], reverse=True)
+        elif ranking_type == 'losers':
+            # 下落銘柄のみフィルタ
+            rankings = [stock for stock in stocks if stock['change_percent'] < 0]
+            rankings.sort(key=lambda x: x['change_percent'])
+        elif ranking_type == 'volume':
+            # 出来高でソート
+            rankings = stocks
+            rankings.sort(key=lambda x: x['volume'], reverse=True)
+        elif ranking_type == 'market-cap':
+            # 時価総額データがある銘柄のみ
+            rankings = [stock for stock in stocks if stock.get('market_cap')]
+            rankings.sort(key=lambda x: x['market_cap'], reverse=True)
+        else:
+            return {'error': f'無効なランキング種別: {ranking_type}'}
+
+        # 制限数で切り取り
+        rankings = rankings[:limit]
+
+        # ランク付け
+        for i, stock in enumerate(rankings):
+            stock['rank'] = i + 1
+
+        # 画像生成（no_chart指定時はスキップ）
+        chart = None if no_chart else generate_ranking_chart(rankings, ranking_type, chart_format)
+
+        result = {
+            'status': 'success',
+            'type': ranking_type,
+            'market': market,
+            'data': rankings,
+            'chart_format': chart_format,
+            'metadata': {
+                'total_stocks': len(rankings),
+                'limit': limit,
+                'last_updated': datetime.now().isoformat()
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+        # json形式は描画用データを chart_data に、png/svg は chart_image に格納
+        result['chart_data' if chart_format == 'json' else 'chart_image'] = chart
+
+        # キャッシュ保存（取れなかった銘柄がある部分結果は保存しない）
+        if partial_errors:
+            result['partial_errors'] = partial_errors
+        else:
+            _RANKINGS_CACHE[cache_key] = {'ts': cache_now, 'data': result}
+        _add_upstream_status(result)
+        if no_chart:
+            # 呼び出し元に合わせて画像なしで返す
+            result_no_img = dict(result)
+            result_no_img.pop('chart_image', None)
+            result_no_img.pop('chart_data', None)
+            return result_no_img
+        return result
+
+    except Exception as e:
+        return {'error': f'ランキング取得エラー: {str(e)}'}
+
+def get_sector_rankings_api(query_parameters):
+    """セクター・業界ランキング取得API（改善版）"""
+    try:
+        limit = min(int(query_parameters.get('limit', 10)), 10)
+        chart_format = str(query_parameters.get('format', 'png') or 'png').lower()
+        if chart_format not in CHART_FORMATS:
+            return {'error': f'無効なチャート形式: {chart_format}（png, svg, json のいずれか）'}
+
+        sector_data = []
+        rows, partial_errors = _price_rows(SECTOR_ETFS.values())
+        profiles = get_profiles(list(rows))
+
+        for sector_name, etf_symbol in SECTOR_ETFS.items():
+            row = rows.get(etf_symbol)
+            if row is None:
+                continue
+            name = profiles.get(etf_symbol, {}).get('name')
+            sector_data.append({
+                'sector': sector_name,
+                'symbol': etf_symbol,
+                'name': name if name and name != etf_symbol else f'{sector_name} Sector ETF',
+                'price': row['price'],
+                'change': row['change'],
+                'change_percent': row['change_percent'],
+                'volume': row['volume']
+            })
+
+        # パフォーマンス順でソート
+        sector_data.sort(key=lambda x: x['change_percent'], reverse=True)
+
+        # ランク付け
+        for i, sector in enumerate(sector_data[:limit]):
+            sector['rank'] = i + 1
+
+        # 画像生成
+        chart = generate_sector_chart(sector_data[:limit], 'performance', chart_format)
+
+        result = {
+            'status': 'success',
+            'type': 'performance',
+            'data': sector_data[:limit],
+            'chart_format': chart_format,
+            'metadata': {
+                'total_sectors': len(sector_data),
+                'limit': limit,
+                'last_updated': datetime.now().isoformat()
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+        result['chart_data' if chart_format == 'json' else 'chart_image'] = chart
+        if partial_errors:
+            result['partial_errors'] = partial_errors
+        _add_upstream_status(result)
+        return result
+
+    except Exception as e:
+        return {'error': f'セクターランキング取得エラー: {str(e)}'}
+
+def get_crypto_rankings_api(query_parameters):
+    """暗号通貨ランキング取得API"""
+    try:
+        limit = min(int(query_parameters.get('limit', 10)), 10)
+        sort_by = query_parameters.get('sort', 'change')  # change, price, volume, market_cap
+
+        crypto_data = []
+        rows, partial_errors = _price_rows(CRYPTO_SYMBOLS)
+        profiles = get_profiles(list(rows))
+
+        for symbol in CRYPTO_SYMBOLS:
+            row = rows.get(symbol)
+            if row is None:
+                continue
+            crypto_data.append({
+                'symbol': symbol,
+                'name': symbol.replace('-USD', ''),
+                'price': row['price'],
+                'change': row['change'],
+                'change_percent': row['change_percent'],
+                'volume': row['volume'],
+                'market_cap': profiles.get(symbol, {}).get('market_cap')
+            })
+
+        # ソート
+        if sort_by == 'change':
+            crypto_data.sort(key=lambda x: x['change_percent'], reverse=True)
+        elif sort_by == 'price':
+            crypto_data.sort(key=lambda x: x['price'], reverse=True)
+        elif sort_by == 'volume':
+            crypto_data.sort(key=lambda x: x['volume'], reverse=True)
+        elif sort_by == 'market_cap':
+            crypto_data = [c for c in crypto_data if c.get('market_cap')]
+            crypto_data.sort(key=lambda x: x['market_cap'], reverse=True)
+
+        # ランク付け
+        for i, crypto in enumerate(crypto_data[:limit]):
+            crypto['rank'] = i + 1
+
+        result = {
+            'status': 'success',
+            'type': 'crypto',
+            'data': crypto_data[:limit],
+            'metadata': {
+                'sort_by': sort_by,
+                'total_cryptos': len(crypto_data),
+                'last_updated': datetime.now().isoformat()
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+        if partial_errors:
+            result['partial_errors'] = partial_errors
+        _add_upstream_status(result)
+        return result
+
+    except Exception as e:
+        return {'error': f'暗号通貨ランキング取得エラー: {str(e)}'}
+
+def _add_upstream_status(result):
+    """上流のブレーカー・スロットリングの状態を応答に載せる（平常時は何もしない）"""
+    status = upstream_status()
+    if status:
+        result['upstream'] = status
+
+
+def _price_rows(symbols):
+    """共有キャッシュのスナップショットからランキング用の価格行を作る（前日値のない銘柄は除く）
+
+    戻り値: (銘柄 → 価格行, 取得できなかった・前回の値を返した銘柄の partial_errors)
+    """
+    snapshots, errors = get_quote_snapshots(symbols)
+    rows = {}
+    for symbol, snap in snapshots.items():
+        if snap.get('change_percent') is None:
+            continue
+        if snap.get('stale'):
+            errors[symbol] = f"上流から取得できないため前回取得した値（{snap.get('as_of')}）"
+        rows[symbol] = {
+            'symbol': symbol,
+            'price': round(snap['price'], 2),
+            'change': round(snap['change'], 2),
+            'change_percent': snap['change_percent'],
+            'volume': snap.get('volume') or 0,
+        }
+    return rows, [f'{symbol}: {error}' for symbol, error in errors.items()]
+
+
+def safe_get_stock_data(symbol):
+    """安全に株価データを取得"""
+    try:
+        data = get_multiple_stock_data([symbol])
+        return data[0] if data else None
+    except Exception as e:
+        return None
+
+def get_multiple_stock_data(symbols):
+    """複数銘柄のデータを効率的に取得
+
+    価格は1回の一括取得（ポートフォリオ評価・ウォッチリストと共有のキャッシュ）、
+    銘柄名・時価総額・セクターは長めにキャッシュしたプロファイルから埋める。
+    """
+    return _stock_rows(symbols)[0]
+
+
+def _stock_rows(symbols):
+    """get_multiple_stock_data の本体（戻り値: (行リスト, partial_errors)）"""
+    rows, errors = _price_rows(symbols)
+    profiles = get_profiles(list(rows))
+    results = []
+    for symbol in symbols:
+        row = rows.get(symbol.upper())
+        if row is None:
+            continue
+        profile = profiles.get(row['symbol'], {})
+        results.append({
+            'symbol': symbol,
+            'name': profile.get('name', symbol),
+            'price': row['price'],
+            'change': row['change'],
+            'change_percent': row['change_percent'],
+            'volume': row['volume'],
+            'market_cap': profile.get('market_cap'),
+            'sector': profile.get('sector', 'Unknown')
+        })
+    return results, errors
@@ -0,0 +1,147 @@
+"""Lambdaハンドラー（薄いルーター）
+
+ルートは routes.ROUTES の (resource, method) 完全一致で引き、
+実装モジュールはそのルートが初めて呼ばれたときにimportする。
+認証系だけを呼ぶコンテナでは yfinance / pandas / matplotlib 等を一切読み込まない。
+"""
+
+import json
+import traceback
+
+from .common import serialize_for_json
+from .deadline import reset_request_deadline, start_request_deadline
+from .routes import RESOURCES, find_route
+from .upstream import log_upstream_metrics
+
+
+def lambda_handler(event, context):
+    """
+    AWS Lambda メインハンドラー
+    API Gateway からのリクエストを処理（リクエストのデッドラインを設定して下位の取得に渡す）
+    """
+    token = start_request_deadline(context)
+    try:
+        return _handle(event, context)
+    finally:
+        reset_request_deadline(token)
+        log_upstream_metrics(event.get('resource', ''))
+
+
+def _handle(event, context):
+    try:
+        # CORS ヘッダーを設定
+        headers = {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET, POST, PUT, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, Authorization'
+        }
+
+        # OPTIONSリクエスト（CORS プリフライト）への対応
+        if event.get('httpMethod') == 'OPTIONS':
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': json.dumps({'message': 'OK'})
+            }
+
+        # パスとメソッドを取得
+        resource = event.get('resource', '')
+        method = event.get('httpMethod', '') or 'GET'
+        query_parameters = event.get('queryStringParameters', {}) or {}
+
+        # リソースごとの処理（(resource, method) の完全一致で引く。/ は Swagger UI）
+        route = find_route(resource, method)
+        if route is None and event.get('path') and event.get('path') != resource:
+            route = find_route(event['path'], method)
+        if route is None:
+            if resource in RESOURCES:
+                return {
+                    'statusCode': 405,
+                    'headers': headers,
+                    'body': json.dumps({'error': 'メソッドが許可されていません'})
+                }
+            return {
+                'statusCode': 404,
+                'headers': headers,
+                'body': json.dumps({'error': 'リソースが見つかりません'})
+            }
+
+        args, error = route.bind(event, context, query_parameters)
+        if error:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': error})
+            }
+        result = route.resolve()(*args)
+
+        # ドキュメント等はレスポンスをそのまま返す
+        if route.raw:
+            return result
+        if route.binary:
+            chart, err = result
+            return _chart_response(chart, err, args[route.args.index('format')], headers)
+
+        if result.get('error'):
+            return {
+                'statusCode': 500,
+                'headers': headers,
+                'body': json.dumps(result)
+            }
+
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': json.dumps(result, default=serialize_for_json)
+        }
+
+    except Exception as e:
+        print(f"Lambda Error: {str(e)}")
+        print(traceback.format_exc())
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'error': '内部サーバーエラーが発生しました',
+                'details': str(e)
+            })
+        }
+
+
+def _chart_response(chart, err, chart_format, headers):
+    """/chart のレスポンス（png はBase64バイナリ、svg はそのまま、json は系列データ）"""
+    if err:
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': err})
+        }
+    if chart_format == 'json':
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': json.dumps(chart, default=serialize_for_json)
+        }
+    if chart_format == 'svg':
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'image/svg+xml',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': chart
+        }
+    # 画像はBase64バイナリで返却
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'image/png',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': chart,
+        'isBase64Encoded': True
+    }
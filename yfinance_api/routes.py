@@ -0,0 +1,304 @@
+"""ルート定義（(resource, method) → 実装関数とクエリパラメータ仕様）
+
+lambda_handler のディスパッチと Swagger 仕様書の parameters は、どちらもこの表から作る。
+実装モジュールは Route.resolve() の初回呼び出しまで import しない。
+"""
+
+import importlib
+
+from .common import MAX_SERIES_POINTS, parse_points_parameter
+from .fastinfo import FAST_INFO_FIELDS, parse_fields
+
+PERIODS = ['1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max']
+FLAGS = ['0', '1', 'true', 'false']
+CHART_FORMAT_ENUM = ['png', 'svg', 'json']
+
+
+class Param:
+    """クエリパラメータの宣言（ルーターでの検証・変換と OpenAPI の parameter 定義を兼ねる）
+
+    strict=True の enum と required だけをルーターで検証し、それ以外は実装関数側の解釈に任せる。
+    required_unless に別のパラメータ名を指定すると、そのパラメータがある場合は省略できる。
+    parse が ValueError を送出した場合はそのメッセージを 400 のエラーにする。
+    """
+
+    def __init__(self, name, type='string', description='', required=False, default=None,
+                 enum=None, minimum=None, maximum=None, strict=False, upper=False, lower=False,
+                 parse=None, error=None, required_unless=None):
+        self.name = name
+        self.type = type
+        self.description = description
+        self.required = required
+        self.default = default
+        self.enum = enum
+        self.minimum = minimum
+        self.maximum = maximum
+        self.strict = strict
+        self.upper = upper
+        self.lower = lower
+        self.parse = parse
+        self.error = error
+        self.required_unless = required_unless
+
+    def extract(self, query_parameters):
+        """クエリから値を取り出して変換する（戻り値: (値, エラーメッセージ)）"""
+        raw = query_parameters.get(self.name)
+        if raw is None or raw == '':
+            if self.required and not (self.required_unless and query_parameters.get(self.required_unless)):
+                return None, self.error or f'{self.name} パラメータが必要です'
+            return self.default, None
+        if self.parse is not None:
+            try:
+                return self.parse(raw), None
+            except ValueError as e:
+                return None, str(e)
+        value = str(raw)
+        if self.upper:
+            value = value.upper()
+        if self.lower:
+            value = value.lower()
+        if self.strict and self.enum and value not in self.enum:
+            if self.error:
+                return None, self.error.format(value=value)
+            return None, f"無効な{self.name}: {value}（{', '.join(self.enum)} のいずれか）"
+        return value, None
+
+    def to_openapi(self):
+        """OpenAPI 3.0 の parameter オブジェクト"""
+        schema = {'type': self.type}
+        if self.enum:
+            schema['enum'] = list(self.enum)
+        if self.default is not None:
+            schema['default'] = self.default
+        if self.minimum is not None:
+            schema['minimum'] = self.minimum
+        if self.maximum is not None:
+            schema['maximum'] = self.maximum
+        return {
+            'name': self.name,
+            'in': 'query',
+            'required': self.required and not self.required_unless,
+            'description': self.description,
+            'schema': schema,
+        }
+
+
+class Route:
+    """1つの (resource, method) に対応する実装関数と引数の組み立て方
+
+    args の各要素はパラメータ名、または 'event'（イベント全体）/ 'context' / 'query'（クエリ辞書）。
+    binary=True のルートは実装関数が (payload, error) を返し、ルーターが形式別のレスポンスを組み立てる。
+    raw=True のルートは実装関数が API Gateway のレスポンスをそのまま返す（ヘッダーも実装側で決める）。
+    """
+
+    def __init__(self, module, handler, params=(), args=('query',), binary=False, raw=False):
+        self.module = module
+        self.handler = handler
+        self.params = tuple(params)
+        self.args = tuple(args)
+        self.binary = binary
+        self.raw = raw
+        self._func = None
+
+    def resolve(self):
+        """実装関数を返す（モジュールは初回のみ import）"""
+        if self._func is None:
+            module = importlib.import_module(f'{__package__}.{self.module}')
+            self._func = getattr(module, self.handler)
+        return self._func
+
+    def bind(self, event, context, query_parameters):
+        """宣言に従ってクエリを検証し、実装関数の引数リストを作る（戻り値: (引数, エラーメッセージ)）"""
+        values = {}
+        for param in self.params:
+            value, error = param.extract(query_parameters)
+            if error:
+                return None, error
+            values[param.name] = value
+        args = []
+        for name in self.args:
+            if name == 'event':
+                args.append(event)
+            elif name == 'context':
+                args.append(context)
+            elif name == 'query':
+                args.append(query_parameters)
+            else:
+                args.append(values[name])
+        return args, None
+
+    def openapi_parameters(self):
+        return [param.to_openapi() for param in self.params]
+
+
+def _ticker(description='ティッカーシンボル（例: AAPL, MSFT, 7203.T）'):
+    return Param('ticker', description=description, required=True, upper=True,
+                 error='ティッカーシンボルが必要です')
+
+
+def _period(description='履歴期間（デフォルト: 1mo）'):
+    return Param('period', description=description, default='1mo', enum=PERIODS)
+
+
+def _points(description):
+    return Param('points', 'integer', description, minimum=3, maximum=MAX_SERIES_POINTS,
+                 parse=lambda raw: parse_points_parameter({'points': raw}))
+
+
+def _limit(description='取得件数（デフォルト: 10、最大: 20）', default=10, maximum=20):
+    return Param('limit', 'integer', description, default=default, maximum=maximum)
+
+
+def _chart_format(description):
+    return Param('format', description=description, default='png', enum=CHART_FORMAT_ENUM)
+
+
+def _parse_tickers(raw):
+    from .quotes import MAX_BATCH_SYMBOLS, normalize_symbols
+    tickers = normalize_symbols(str(raw).split(','))
+    if not tickers:
+        raise ValueError('ティッカーシンボルが必要です')
+    if len(tickers) > MAX_BATCH_SYMBOLS:
+        raise ValueError(f'tickers は最大 {MAX_BATCH_SYMBOLS} 銘柄までです（指定: {len(tickers)}）')
+    return tickers
+
+
+def _fields():
+    return Param('fields', description=('取得する fast_info の項目（カンマ区切り、例: last_price,previous_close）。'
+                                        f"指定した項目のデータだけを取得する。{', '.join(FAST_INFO_FIELDS)}"),
+                 parse=parse_fields)
+
+
+def _ticker_route(handler):
+    return Route('ticker', handler, params=(_ticker('ティッカーシンボル'),), args=('ticker',))
+
+
+_RANKING_CHART_FORMAT = 'チャート形式（png: Base64画像 / svg: SVG文字列 / json: chart_data に描画用データ）'
+
+ROUTES = {
+    # APIドキュメント
+    ('/', 'GET'): Route('docs', 'swagger_ui_response', args=('event', 'context'), raw=True),
+    ('/openapi.json', 'GET'): Route('docs', 'openapi_json_response', args=('event', 'context'), raw=True),
+
+    # 認証/ユーザー管理
+    ('/auth/register', 'POST'): Route('auth', 'handle_auth_register', args=('event',)),
+    ('/auth/login', 'POST'): Route('auth', 'handle_auth_login', args=('event',)),
+    ('/user/me', 'GET'): Route('auth', 'handle_user_me_get', args=('event',)),
+    ('/user/me', 'PUT'): Route('auth', 'handle_user_me_put', args=('event',)),
+
+    # 個別銘柄
+    ('/search', 'GET'): Route('ticker', 'search_stocks_api', params=(
+        Param('q', description='検索キーワード（例: apple, microsoft）', required=True,
+              error='検索クエリが必要です'),
+        _limit('検索結果件数（デフォルト: 10、最大: 10）', maximum=10),
+        Param('region', description='検索リージョン（デフォルト: US）', default='US', enum=['US', 'JP']),
+    ), args=('q', 'query')),
+    ('/tickerDetail', 'GET'): Route('ticker', 'get_stock_info_api', params=(
+        _ticker(),
+        _period(),
+    ), args=('ticker', 'period')),
+    ('/ticker/basic', 'GET'): Route('ticker', 'get_stock_basic_info_api', params=(
+        _ticker(),
+        _fields(),
+    ), args=('ticker', 'fields')),
+    ('/ticker/price', 'GET'): Route('ticker', 'get_stock_price_api', params=(
+        Param('ticker', description='ティッカーシンボル（tickers 指定時は省略可）', required=True, upper=True,
+              error='ティッカーシンボルが必要です', required_unless='tickers'),
+        Param('tickers', description='カンマ区切りの複数ティッカー（例: AAPL,MSFT,7203.T、最大300）。指定時は一括取得',
+              parse=_parse_tickers),
+        _fields(),
+    ), args=('ticker', 'tickers', 'fields')),
+    ('/ticker/history', 'GET'): Route('ticker', 'get_stock_history_api', params=(
+        _ticker('ティッカーシンボル'),
+        _period(),
+        _points('最大返却件数。超える場合はサーバー側で間引く（未指定: 全件）'),
+        Param('method', description='間引き方式（lttb: 終値の形状を保つ実在バー / ohlc: 期間ごとのOHLC集約）',
+              default='lttb', enum=['lttb', 'ohlc']),
+    ), args=('ticker', 'period', 'points', 'method')),
+    ('/ticker/financials', 'GET'): _ticker_route('get_stock_financials_api'),
+    ('/ticker/analysts', 'GET'): _ticker_route('get_stock_analysts_api'),
+    ('/ticker/holders', 'GET'): _ticker_route('get_stock_holders_api'),
+    ('/ticker/events', 'GET'): _ticker_route('get_stock_events_api'),
+    ('/ticker/news', 'GET'): _ticker_route('get_stock_news_api'),
+    ('/ticker/options', 'GET'): _ticker_route('get_stock_options_api'),
+    ('/ticker/sustainability', 'GET'): _ticker_route('get_stock_sustainability_api'),
+
+    # チャート
+    ('/chart', 'GET'): Route('charts', 'get_stock_chart_api', params=(
+        _ticker(),
+        _period('期間（デフォルト: 1mo）'),
+        Param('type', description='チャートタイプ（デフォルト: line）', default='line', enum=['line', 'candle']),
+        Param('size', description='画像サイズ（デフォルト: 800x400）', default='800x400'),
+        Param('format', description='出力形式（png: 画像 / svg: 軽量ベクター / json: クライアント描画用の間引き済み系列）',
+              default='png', enum=CHART_FORMAT_ENUM, strict=True, lower=True,
+              error='無効なチャート形式: {value}（png, svg, json のいずれか）'),
+        _points('描画点数の上限（デフォルト: 画像幅。折れ線はLTTB、ローソク足はOHLC集約で間引き）'),
+    ), args=('ticker', 'period', 'size', 'type', 'format', 'points'), binary=True),
+
+    # ホーム・ニュース
+    ('/home', 'GET'): Route('home', 'get_stock_home_api', params=(
+        Param('sections', description='取得対象セクション（カンマ区切り）。例: news,stocks,sectors,indices,currencies,commodities,status'),
+        _limit('ランキングやニュースの件数（デフォルト: 5, 最大: 10）', default=5, maximum=10),
+        Param('market', description='ランキング市場（sp500 | nasdaq100）', default='sp500', enum=['sp500', 'nasdaq100']),
+        Param('timeout', 'integer', '全体タイムアウト秒（デフォルト: 5、上限: 5）', default=5, minimum=1, maximum=5),
+        Param('cache_ttl', 'integer', 'ホーム応答のTTLキャッシュ秒（デフォルト: 60）', default=60, minimum=0, maximum=600),
+        Param('parallel', description='並列実行フラグ（0/1, true/false）', default='1'),
+        Param('fast', description='高速モード（1で軽量ランキング+画像スキップ）。timeout<=3でも自動有効', enum=FLAGS),
+    )),
+    ('/news/rss', 'GET'): Route('news', 'lamuda_get_rss_news_api', params=(
+        _limit('取得件数（デフォルト10、最大200）', maximum=200),
+        Param('sort', description='並び順（published_desc | published_asc | title_asc）', default='published_desc',
+              enum=['published_desc', 'published_asc', 'title_asc']),
+        Param('category', description='カテゴリー（all | general | market）', default='all',
+              enum=['all', 'general', 'market']),
+        Param('source', description='ソース名フィルタ（部分一致）'),
+        Param('timeout', 'integer', '各RSS取得のタイムアウト秒（デフォルト5）', default=5, minimum=1, maximum=20),
+        Param('cache_ttl', 'integer', 'ニュース結果のTTLキャッシュ秒（デフォルト30）', default=30, minimum=0, maximum=600),
+    )),
+
+    # ランキング
+    ('/rankings/stocks', 'GET'): Route('rankings', 'get_stock_rankings_api', params=(
+        Param('type', description='ランキング種別（例: gainers, losers, volume, market-cap）', default='gainers',
+              enum=['gainers', 'losers', 'volume', 'market-cap']),
+        Param('market', description='市場（例: sp500, nasdaq100）', enum=['sp500', 'nasdaq100']),
+        _limit('取得件数（デフォルト: 10、最大: 50）', maximum=50),
+        Param('fast', description='高速モード（軽量銘柄セットで取得）', enum=FLAGS),
+        Param('nochart', description='チャート画像を含めない（1で除外）', enum=FLAGS),
+        _chart_format(_RANKING_CHART_FORMAT),
+        Param('cache_ttl', 'integer', 'ランキング結果のTTLキャッシュ秒（デフォルト30）', default=30, minimum=0, maximum=600),
+    )),
+    ('/rankings/sectors', 'GET'): Route('rankings', 'get_sector_rankings_api', params=(
+        Param('type', description='ランキング種別（例: performance, constituent）', enum=['performance', 'constituent']),
+        Param('sector', description='セクター（例: XLK, XLF）',
+              enum=['XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLP', 'XLY', 'XLU', 'XLRE']),
+        _limit(),
+        _chart_format(_RANKING_CHART_FORMAT),
+    )),
+    ('/rankings/crypto', 'GET'): Route('rankings', 'get_crypto_rankings_api', params=(
+        _limit(),
+        Param('sort', description='ソート基準（デフォルト: change、選択可能: change, price, volume, market_cap）',
+              default='change', enum=['change', 'price', 'volume', 'market_cap']),
+    )),
+
+    # マーケット
+    ('/markets/overview', 'GET'): Route('markets', 'get_markets_overview_api', params=(
+        _limit('各セクションの取得件数（デフォルト: 10、最大: 20）'),
+    )),
+    ('/markets/indices', 'GET'): Route('markets', 'get_markets_indices_api', params=(_limit(),)),
+    ('/markets/currencies', 'GET'): Route('markets', 'get_markets_currencies_api', params=(_limit(),)),
+    ('/markets/commodities', 'GET'): Route('markets', 'get_markets_commodities_api', params=(_limit(),)),
+    ('/markets/status', 'GET'): Route('markets', 'get_markets_status_api', params=(_limit(),)),
+}
+
+# メソッド違い（405）の判定用
+RESOURCES = frozenset(resource for resource, _ in ROUTES)
+
+
+def find_route(resource, method):
+    """(resource, method) の完全一致でルートを引く（末尾スラッシュは無視、空は / 扱い）"""
+    if not resource:
+        resource = '/'
+    route = ROUTES.get((resource, method))
+    if route is None and len(resource) > 1 and resource.endswith('/'):
+        route = ROUTES.get((resource.rstrip('/'), method))
+    return route
@@ -0,0 +1,856 @@
+"""個別銘柄API（/search, /tickerDetail, /ticker/*）"""
+
+import concurrent.futures
+import json
+from datetime import datetime
+from urllib.parse import quote as quote_url
+
+from .aiofetch import fetch_json, fetch_many
+from .common import (
+    yf,
+    pd,
+    get_price_change_direction,
+    safe_dataframe_to_dict,
+    safe_dataframe_to_records,
+    get_execution_info,
+)
+from .deadline import DeadlineExceeded, fetch_timeout, remaining
+from .downsample import downsample_history
+from .fastinfo import PRICE_FIELDS, UpstreamCalls, read_fast_info
+from .quotes import cached_profiles
+from .workers import WorkerPoolFull, abandon, submit, worker_stats
+
+# 検索・履歴取得1回あたりのタイムアウト秒（リクエストの残り時間が短ければそちらに合わせる）
+UPSTREAM_TIMEOUT = 10
+# 検索結果の価格取得に使う chart API（認証用 crumb が不要）
+SEARCH_CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}'
+
+
+def _search_prices(symbols):
+    """検索結果の銘柄の価格を chart API から並行に取得する（戻り値: (銘柄 → 価格情報, 銘柄 → エラー)）
+
+    前日終値は日足の直近2本、平均出来高は3か月分の日足から求める（銘柄ごとの ticker.info は呼ばない）。
+    """
+    prices, errors = {}, {}
+    try:
+        responses = fetch_many([
+            {'url': SEARCH_CHART_URL.format(symbol=quote_url(symbol, safe='')), 'params': {'range': '3mo', 'interval': '1d'}}
+            for symbol in symbols
+        ], timeout=UPSTREAM_TIMEOUT)
+    except DeadlineExceeded as e:
+        return prices, {symbol: str(e) for symbol in symbols}
+    for symbol, response in zip(symbols, responses):
+        if response['error']:
+            errors[symbol] = response['error']
+            continue
+        try:
+            chart = json.loads(response['body'])['chart']['result'][0]
+            meta = chart.get('meta', {})
+            series = (chart.get('indicators', {}).get('quote') or [{}])[0]
+            closes = [c for c in series.get('close') or [] if c is not None]
+            volumes = [v for v in series.get('volume') or [] if v is not None]
+            prices[symbol] = {
+                'current_price': meta.get('regularMarketPrice'),
+                'previous_close': closes[-2] if len(closes) >= 2 else meta.get('chartPreviousClose'),
+                'currency': meta.get('currency'),
+                'volume': meta.get('regularMarketVolume'),
+                'avg_volume': int(sum(volumes) / len(volumes)) if volumes else None,
+            }
+        except Exception as e:
+            errors[symbol] = f'価格データの解析エラー: {str(e)}'
+    return prices, errors
+
+def search_stocks_api(query, query_parameters):
+    """銘柄検索（API用）- 株価情報付き
+
+    検索と検索結果の銘柄の価格取得は非同期の取得層でまとめて並行に行う。
+    market_cap は検索結果かプロファイルのキャッシュにある場合だけ付ける（ticker.info は呼ばない）。
+    """
+    try:
+        # 検索結果を10件に制限
+        limit = min(int(query_parameters.get('limit', 10)), 10)
+        region = query_parameters.get('region', 'US')
+
+        base_url = "https://query1.finance.yahoo.com/v1/finance/search"
+
+        if region.upper() == 'JP':
+            params = {
+                'q': query,
+                'quotesCount': limit,
+                'newsCount': 0,
+                'enableFuzzyQuery': 'true',
+                'region': 'JP',
+                'lang': 'ja-JP'
+            }
+        else:
+            params = {
+                'q': query,
+                'quotesCount': limit,
+                'newsCount': 0,
+                'enableFuzzyQuery': 'true'
+            }
+
+        data = fetch_json(base_url, params=params, timeout=UPSTREAM_TIMEOUT)
+
+        if 'quotes' in data and data['quotes']:
+            results = []
+            partial_errors = []
+            quotes = data['quotes'][:10]  # 最大10件に制限
+            symbols = [q.get('symbol', '') for q in quotes if q.get('symbol')]
+            prices, price_errors = _search_prices(symbols)
+            profiles = cached_profiles(symbols)
+            for quote in quotes:
+                symbol = quote.get('symbol', '')
+
+                # 基本情報
+                result = {
+                    'symbol': symbol,
+                    'name': quote.get('longname', quote.get('shortname', '')),
+                    'exchange': quote.get('exchange', ''),
+                    'type': quote.get('quoteType', ''),
+                    'score': quote.get('score', 0),
+                    'timestamp': datetime.now().isoformat()
+                }
+
+                # 株価情報
+                price = prices.get(symbol) or {}
+                current_price = price.get('current_price')
+                previous_close = price.get('previous_close')
+
+                if current_price is not None:
+                    result['current_price'] = round(float(current_price), 2)
+                    result['currency'] = price.get('currency') or 'USD'
+
+                    # 前日との差分を計算
+                    if previous_close is not None:
+                        previous_close = float(previous_close)
+                        price_change = current_price - previous_close
+                        price_change_percent = (price_change / previous_close) * 100
+
+                        result['previous_close'] = round(previous_close, 2)
+                        result['price_change'] = round(price_change, 2)
+                        result['price_change_percent'] = round(price_change_percent, 2)
+                        result['price_change_direction'] = get_price_change_direction(price_change)
+
+                    # 追加情報（時価総額は分かる場合のみ）
+                    market_cap = quote.get('marketCap')
+                    if market_cap is None:
+                        market_cap = (profiles.get(symbol.upper()) or {}).get('market_cap')
+                    if market_cap is not None:
+                        result['market_cap'] = market_cap
+                    result['volume'] = price.get('volume')
+                    result['avg_volume'] = price.get('avg_volume')
+                elif symbol in price_errors:
+                    # 株価取得に失敗した場合でも基本情報は返す
+                    result['price_error'] = f'株価取得エラー: {price_errors[symbol]}'
+                    if 'デッドライン超過' in price_errors[symbol]:
+                        partial_errors.append(f'{symbol}: {price_errors[symbol]}')
+
+                results.append(result)
+
+            search_result = {
+                'query': query,
+                'region': region,
+                'results': results,
+                'count': len(results),
+                'max_results': 10,
+                'timestamp': datetime.now().isoformat()
+            }
+            if partial_errors:
+                search_result['partial_errors'] = partial_errors
+            return search_result
+        else:
+            return {
+                'query': query,
+                'region': region,
+                'results': [],
+                'count': 0,
+                'max_results': 10,
+                'message': '検索結果が見つかりませんでした',
+                'timestamp': datetime.now().isoformat()
+            }
+    except Exception as e:
+        return {'error': f'検索エラー: {str(e)}'}
+
+def _collect_sections(calls):
+    """全セクションを共有ワーカープールに投入してから、リクエストの残り時間まで待って集める
+
+    calls は 名前 → (関数, 引数...)。間に合わない・投入できない・例外になったセクションは
+    error の部分結果になる（間に合わなかった取得は手放し、他のセクションの結果には影響しない）。
+    """
+    results, futures = {}, {}
+    for name, (fn, *args) in calls.items():
+        try:
+            futures[submit(fn, *args)] = name
+        except WorkerPoolFull as e:
+            results[name] = {'error': str(e)}
+    done, not_done = concurrent.futures.wait(futures, timeout=remaining())
+    for future in done:
+        try:
+            results[futures[future]] = future.result()
+        except Exception as e:
+            results[futures[future]] = {'error': str(e)}
+    for future in not_done:
+        abandon(future)
+        results[futures[future]] = {'error': 'デッドライン超過'}
+    return results
+
+def get_stock_info_api(ticker, period='1mo'):
+    """包括的な株式情報取得API（統合版）- 各要素専用関数を呼び出し
+
+    各セクションは /home と同じ共有ワーカープールで並行に取得する。
+    デッドラインまでに取れなかったセクションは空のまま partial_errors に入る。
+    """
+    try:
+        # 各要素専用の関数を並行に呼び出して統合
+        sections = _collect_sections({
+            'basic': (get_stock_basic_info_api, ticker),
+            'price': (get_stock_price_api, ticker),
+            'history': (get_stock_history_api, ticker, period),
+            'financials': (get_stock_financials_api, ticker),
+            'analysts': (get_stock_analysts_api, ticker),
+            'holders': (get_stock_holders_api, ticker),
+            'events': (get_stock_events_api, ticker),
+            'news': (get_stock_news_api, ticker),
+            'options': (get_stock_options_api, ticker),
+            'sustainability': (get_stock_sustainability_api, ticker),
+        })
+        basic_info = sections['basic']
+        price_info = sections['price']
+        history_info = sections['history']
+        financials_info = sections['financials']
+        analysts_info = sections['analysts']
+        holders_info = sections['holders']
+        events_info = sections['events']
+        news_info = sections['news']
+        options_info = sections['options']
+        sustainability_info = sections['sustainability']
+
+        # 統合結果を作成
+        result = {
+            'ticker': ticker,
+            'period': period,
+            # 基本情報
+            'info': basic_info.get('info', {}),
+            'info_error': basic_info.get('info_error'),
+            'fast_info': basic_info.get('fast_info', {}),
+            'logo_url': basic_info.get('logo_url'),
+            'isin': basic_info.get('isin'),
+            # 株価情報
+            'price': price_info.get('price'),
+            # 履歴情報
+            'history': history_info.get('history', []),
+            # 財務情報
+            'financials': financials_info.get('financials', {}),
+            'earnings': financials_info.get('earnings', {}),
+            # アナリスト情報
+            'analysts': analysts_info.get('analysts', {}),
+            'recommendations': analysts_info.get('recommendations', []),
+            'analysis': analysts_info.get('analysis', {}),
+            'upgrades_downgrades': analysts_info.get('upgrades_downgrades', []),
+            # 株主情報
+            'holders': holders_info.get('holders', {}),
+            'shares': holders_info.get('shares', {}),
+            # イベント情報
+            'calendar': events_info.get('calendar', []),
+            'earnings_dates': events_info.get('earnings_dates', []),
+            'dividends': events_info.get('dividends', []),
+            'splits': events_info.get('splits', []),
+            # ニュース情報
+            'news': news_info.get('news', []),
+            # オプション情報
+            'options': options_info.get('options', []),
+            # ESG情報
+            'sustainability': sustainability_info.get('sustainability', {}),
+            # 実行情報
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+
+        # エラーがある場合は統合
+        errors = []
+        for name, data in [
+            ('基本情報', basic_info),
+            ('株価情報', price_info),
+            ('履歴情報', history_info),
+            ('財務情報', financials_info),
+            ('アナリスト情報', analysts_info),
+            ('株主情報', holders_info),
+            ('イベント情報', events_info),
+            ('ニュース情報', news_info),
+            ('オプション情報', options_info),
+            ('ESG情報', sustainability_info)
+        ]:
+            if data.get('error'):
+                errors.append(f"{name}: {data['error']}")
+
+        if errors:
+            result['partial_errors'] = errors
+        result['execution_info']['workers'] = worker_stats()
+
+        return result
+
+    except Exception as e:
+        return {'error': f'銘柄情報取得エラー: {str(e)}'}
+
+def get_stock_basic_info_api(ticker, fields=None):
+    """基本情報取得API（fields 指定時は fast_info のその項目だけを読む）"""
+    try:
+        upstream = UpstreamCalls()
+        stock = yf.Ticker(ticker)
+
+        # 詳細情報
+        try:
+            info = stock.info
+            if not info:
+                info = {}
+                info_error = "詳細情報が取得できませんでした"
+            else:
+                info_error = None
+        except Exception as e:
+            info = {}
+            info_error = f"詳細情報取得エラー: {str(e)}"
+
+        # 高速基本情報（指定項目のプロパティだけを読む。各プロパティは初回アクセス時に個別に取得される）
+        fast_info, _ = read_fast_info(stock, fields)
+
+        # ロゴURL (Clearbit使用)
+        logo_url = None
+        try:
+            if info:
+                # websiteからClearbitロゴURLを生成
+                website = (info.get('website') or
+                          info.get('webSite') or
+                          info.get('companyWebsite'))
+
+                if website:
+                    import re
+                    # ドメイン名を抽出
+                    m = re.search(r'https?://(?:www\.)?([^/]+)', website)
+                    if m:
+                        domain = m.group(1)
+                        logo_url = f"https://logo.clearbit.com/{domain}"
+
+                # websiteがない場合は主要企業を直接指定
+                if not logo_url:
+                    known_logos = {
+                        'AAPL': 'https://logo.clearbit.com/apple.com',
+                        'MSFT': 'https://logo.clearbit.com/microsoft.com',
+                        'GOOGL': 'https://logo.clearbit.com/google.com',
+                        'AMZN': 'https://logo.clearbit.com/amazon.com',
+                        'TSLA': 'https://logo.clearbit.com/tesla.com',
+                        'META': 'https://logo.clearbit.com/meta.com',
+                        'NVDA': 'https://logo.clearbit.com/nvidia.com',
+                        'JPM': 'https://logo.clearbit.com/jpmorganchase.com',
+                        'V': 'https://logo.clearbit.com/visa.com',
+                        'JNJ': 'https://logo.clearbit.com/jnj.com',
+                        'WMT': 'https://logo.clearbit.com/walmart.com',
+                        'PG': 'https://logo.clearbit.com/pg.com',
+                        'UNH': 'https://logo.clearbit.com/unitedhealthgroup.com',
+                        'HD': 'https://logo.clearbit.com/homedepot.com',
+                        'BAC': 'https://logo.clearbit.com/bankofamerica.com',
+                        'MA': 'https://logo.clearbit.com/mastercard.com',
+                        'DIS': 'https://logo.clearbit.com/disney.com',
+                        'ADBE': 'https://logo.clearbit.com/adobe.com',
+                        'CRM': 'https://logo.clearbit.com/salesforce.com',
+                        'NFLX': 'https://logo.clearbit.com/netflix.com'
+                    }
+                    if ticker.upper() in known_logos:
+                        logo_url = known_logos[ticker.upper()]
+        except Exception as e:
+            logo_url = None
+
+        # ISIN
+        isin = None
+        try:
+            isin = stock.isin
+        except Exception as e:
+            isin = {'error': f'ISIN取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'info': info,
+            'info_error': info_error,
+            'fast_info': fast_info,
+            'logo_url': logo_url,
+            'isin': isin,
+            'upstream_calls': upstream.count,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        return result
+    except Exception as e:
+        return {'error': f'基本情報取得エラー: {str(e)}'}
+
+def get_stock_prices_batch_api(tickers):
+    """複数銘柄の株価をまとめて取得するAPI（/ticker/price?tickers=A,B,C）
+
+    全銘柄を1回の一括ダウンロード（共有の株価キャッシュ経由）で取得する。
+    取得できなかった銘柄は errors に入り、他の銘柄の結果には影響しない。
+    """
+    from .quotes import get_quote_snapshots, quote_cache_stats
+
+    try:
+        upstream_before = quote_cache_stats()['upstream_calls']
+        snapshots, errors = get_quote_snapshots(tickers)
+        prices = []
+        for symbol in tickers:
+            snap = snapshots.get(symbol)
+            if snap is None:
+                continue
+            price = {
+                'ticker': symbol,
+                'current_price': round(snap['price'], 2),
+                'as_of': snap['as_of'],
+            }
+            if snap['previous_close'] is not None:
+                price['previous_close'] = round(snap['previous_close'], 2)
+                price['price_change'] = round(snap['change'], 2)
+                price['price_change_percent'] = snap['change_percent']
+                price['price_change_direction'] = get_price_change_direction(snap['change'])
+            prices.append(price)
+        return {
+            'tickers': tickers,
+            'prices': prices,
+            'errors': [{'ticker': s, 'error': e} for s, e in errors.items()],
+            'count': len(prices),
+            'upstream_calls': quote_cache_stats()['upstream_calls'] - upstream_before,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+    except Exception as e:
+        return {'error': f'株価情報取得エラー: {str(e)}'}
+
+def get_stock_price_api(ticker, tickers=None, fields=None):
+    """株価情報取得API（tickers 指定時は一括取得）
+
+    fast_info は fields（既定: last_price, previous_close, currency）のプロパティだけを読み、
+    現在値・前日終値が得られなかった場合だけ info を取得する。
+    """
+    if tickers:
+        return get_stock_prices_batch_api(tickers)
+    try:
+        upstream = UpstreamCalls()
+        stock = yf.Ticker(ticker)
+
+        fast_info, _ = read_fast_info(stock, fields or PRICE_FIELDS)
+        info = {}
+        if fast_info.get('last_price') is None or fast_info.get('previous_close') is None:
+            try:
+                info = stock.info or {}
+            except:
+                info = {}
+
+        # 株価情報
+        price = None
+        try:
+            current_price = fast_info.get('last_price') or info.get('currentPrice')
+            previous_close = fast_info.get('previous_close') or info.get('previousClose')
+
+            if current_price is not None:
+                current_price = float(current_price)
+                price = {
+                    'current_price': round(current_price, 2),
+                    'currency': fast_info.get('currency') or info.get('currency', 'USD'),
+                    'timestamp': datetime.now().isoformat()
+                }
+                if previous_close is not None:
+                    previous_close = float(previous_close)
+                    diff = current_price - previous_close
+                    price['previous_close'] = round(previous_close, 2)
+                    price['price_change'] = round(diff, 2)
+                    price['price_change_percent'] = round(diff / previous_close * 100, 2)
+                    price['price_change_direction'] = get_price_change_direction(diff)
+        except Exception as e:
+            price = {'error': f'価格情報取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'price': price,
+            'upstream_calls': upstream.count,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        if fields:
+            result['fast_info'] = fast_info
+        return result
+    except Exception as e:
+        return {'error': f'株価情報取得エラー: {str(e)}'}
+
+def get_stock_history_api(ticker, period='1mo', points=None, method='lttb'):
+    """株価履歴取得API
+
+    points 指定時は最大 points 件に間引く（method=lttb: 終値の形状を保つ実在バーを選択 / ohlc: 期間ごとにOHLC集約）
+    """
+    try:
+        stock = yf.Ticker(ticker)
+
+        # 履歴
+        history = []
+        downsampling = None
+        try:
+            valid_periods = ['1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max']
+            if period not in valid_periods:
+                period = '1mo'
+            if method not in ('lttb', 'ohlc'):
+                method = 'lttb'
+
+            hist_df = stock.history(period=period, timeout=fetch_timeout(UPSTREAM_TIMEOUT))
+            if points and len(hist_df) > points:
+                downsampling = {'method': method, 'points': points, 'original_points': len(hist_df)}
+                hist_df = downsample_history(hist_df, points, method)
+            if not hist_df.empty:
+                history = [{
+                    'date': idx.strftime('%Y-%m-%d'),
+                    'open': round(float(row['Open']), 2),
+                    'high': round(float(row['High']), 2),
+                    'low': round(float(row['Low']), 2),
+                    'close': round(float(row['Close']), 2),
+                    'volume': int(row['Volume'])
+                } for idx, row in hist_df.iterrows()]
+        except Exception as e:
+            history = {'error': f'履歴データ取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'period': period,
+            'history': history,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        if downsampling:
+            result['downsampling'] = downsampling
+        return result
+    except Exception as e:
+        return {'error': f'株価履歴取得エラー: {str(e)}'}
+
+def get_stock_financials_api(ticker):
+    """財務情報取得API"""
+    try:
+        stock = yf.Ticker(ticker)
+
+        # 財務諸表
+        financials = {}
+        try:
+            # 損益計算書
+            income_stmt = stock.income_stmt
+            if income_stmt is not None and hasattr(income_stmt, 'empty') and not income_stmt.empty:
+                income_stmt_data = safe_dataframe_to_dict(income_stmt)
+            else:
+                income_stmt_data = {}
+
+            # 貸借対照表
+            balance_sheet = stock.balance_sheet
+            if balance_sheet is not None and hasattr(balance_sheet, 'empty') and not balance_sheet.empty:
+                balance_sheet_data = safe_dataframe_to_dict(balance_sheet)
+            else:
+                balance_sheet_data = {}
+
+            # キャッシュフロー
+            cashflow = stock.cashflow
+            if cashflow is not None and hasattr(cashflow, 'empty') and not cashflow.empty:
+                cashflow_data = safe_dataframe_to_dict(cashflow)
+            else:
+                cashflow_data = {}
+
+            financials = {
+                'income_statement': income_stmt_data,
+                'balance_sheet': balance_sheet_data,
+                'cashflow': cashflow_data
+            }
+        except Exception as e:
+            financials = {'error': f'財務情報取得エラー: {str(e)}'}
+
+        # 決算情報
+        earnings = {}
+        try:
+            info = stock.info
+            if info:
+                earnings_keys = ['trailingEps', 'forwardEps', 'trailingPE', 'forwardPE', 'pegRatio']
+                for key in earnings_keys:
+                    if key in info and info[key] is not None:
+                        earnings[key] = info[key]
+        except Exception as e:
+            earnings = {'error': f'決算情報取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'financials': financials,
+            'earnings': earnings,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        return result
+    except Exception as e:
+        return {'error': f'財務情報取得エラー: {str(e)}'}
+
+def get_stock_analysts_api(ticker):
+    """アナリスト情報取得API"""
+    try:
+        stock = yf.Ticker(ticker)
+
+        # アナリスト予想
+        analysts = {}
+        try:
+            info = stock.info
+            if info:
+                if 'recommendationMean' in info:
+                    analysts['recommendation_mean'] = info['recommendationMean']
+                if 'targetMeanPrice' in info:
+                    analysts['target_mean_price'] = info['targetMeanPrice']
+                if 'numberOfAnalystOpinions' in info:
+                    analysts['number_of_analysts'] = info['numberOfAnalystOpinions']
+                keys = ['strongBuy', 'buy', 'hold', 'sell', 'strongSell']
+                ratings = {k: info[k] for k in keys if k in info}
+                if ratings:
+                    analysts['rating_distribution'] = ratings
+        except Exception as e:
+            analysts = {'error': f'アナリスト予想取得エラー: {str(e)}'}
+
+        # アナリスト推奨履歴
+        recommendations_data = []
+        try:
+            recommendations = stock.get_recommendations()
+            if not recommendations.empty:
+                recommendations_data = safe_dataframe_to_records(recommendations)
+        except Exception as e:
+            recommendations_data = {'error': f'推奨履歴取得エラー: {str(e)}'}
+
+        # アナリスト分析
+        analysis_data = {}
+        try:
+            analysis = stock.get_analysis()
+            if not analysis.empty:
+                analysis_data = safe_dataframe_to_dict(analysis)
+        except Exception as e:
+            analysis_data = {'error': f'アナリスト分析取得エラー: {str(e)}'}
+
+        # 格付け変更履歴
+        upgrades_downgrades_data = []
+        try:
+            upgrades_downgrades = stock.get_upgrades_downgrades()
+            if not upgrades_downgrades.empty:
+                upgrades_downgrades_data = safe_dataframe_to_records(upgrades_downgrades)
+        except Exception as e:
+            upgrades_downgrades_data = {'error': f'格付け変更履歴取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'analysts': analysts,
+            'recommendations': recommendations_data,
+            'analysis': analysis_data,
+            'upgrades_downgrades': upgrades_downgrades_data,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        return result
+    except Exception as e:
+        return {'error': f'アナリスト情報取得エラー: {str(e)}'}
+
+def get_stock_holders_api(ticker):
+    """株主情報取得API"""
+    try:
+        stock = yf.Ticker(ticker)
+
+        # 株主情報
+        holders_data = {}
+        try:
+            # 大株主
+            major_holders_data = safe_dataframe_to_records(stock.major_holders)
+
+            # 機関投資家
+            institutional_holders_data = safe_dataframe_to_records(stock.institutional_holders)
+
+            # 投資信託
+            mutualfund_holders_data = safe_dataframe_to_records(stock.mutualfund_holders)
+
+            holders_data = {
+                'major_holders': major_holders_data,
+                'institutional_holders': institutional_holders_data,
+                'mutualfund_holders': mutualfund_holders_data
+            }
+        except Exception as e:
+            holders_data = {'error': f'株主情報取得エラー: {str(e)}'}
+
+        # 株式数詳細
+        shares_data = {}
+        try:
+            shares_data = safe_dataframe_to_dict(stock.shares)
+        except Exception as e:
+            shares_data = {'error': f'株式数取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'holders': holders_data,
+            'shares': shares_data,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        return result
+    except Exception as e:
+        return {'error': f'株主情報取得エラー: {str(e)}'}
+
+def get_stock_events_api(ticker):
+    """イベント情報取得API"""
+    try:
+        stock = yf.Ticker(ticker)
+
+        # カレンダー（決算日など）
+        calendar_data = []
+        try:
+            calendar = stock.calendar
+            if calendar is not None:
+                calendar_data = safe_dataframe_to_records(calendar)
+        except Exception as e:
+            calendar_data = {'error': f'カレンダー取得エラー: {str(e)}'}
+
+        # 決算日
+        earnings_dates_data = []
+        try:
+            earnings_dates = stock.earnings_dates
+            if earnings_dates is not None:
+                earnings_dates_data = safe_dataframe_to_records(earnings_dates)
+        except Exception as e:
+            earnings_dates_data = {'error': f'決算日取得エラー: {str(e)}'}
+
+        # 配当
+        dividends = []
+        try:
+            dividends_series = stock.dividends
+            if dividends_series is not None and hasattr(dividends_series, 'empty') and not dividends_series.empty:
+                dividends = [{
+                    'date': idx.strftime('%Y-%m-%d'),
+                    'amount': float(val)
+                } for idx, val in dividends_series.items()]
+            elif dividends_series is not None and hasattr(dividends_series, 'items'):
+                dividends = [{
+                    'date': idx.strftime('%Y-%m-%d') if hasattr(idx, 'strftime') else str(idx),
+                    'amount': float(val)
+                } for idx, val in dividends_series.items()]
+        except Exception as e:
+            dividends = {'error': f'配当情報取得エラー: {str(e)}'}
+
+        # 株式分割
+        splits = []
+        try:
+            splits_series = stock.splits
+            if splits_series is not None and hasattr(splits_series, 'empty') and not splits_series.empty:
+                splits = [{
+                    'date': idx.strftime('%Y-%m-%d'),
+                    'ratio': float(val)
+                } for idx, val in splits_series.items()]
+            elif splits_series is not None and hasattr(splits_series, 'items'):
+                splits = [{
+                    'date': idx.strftime('%Y-%m-%d') if hasattr(idx, 'strftime') else str(idx),
+                    'ratio': float(val)
+                } for idx, val in splits_series.items()]
+        except Exception as e:
+            splits = {'error': f'株式分割取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'calendar': calendar_data,
+            'earnings_dates': earnings_dates_data,
+            'dividends': dividends,
+            'splits': splits,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        return result
+    except Exception as e:
+        return {'error': f'イベント情報取得エラー: {str(e)}'}
+
+def get_stock_news_api(ticker):
+    """ニュース情報取得API"""
+    try:
+        stock = yf.Ticker(ticker)
+
+        # ニュース
+        news = []
+        try:
+            news_data = stock.get_news()
+            if isinstance(news_data, list):
+                news = news_data
+            elif hasattr(news_data, 'empty') and not news_data.empty:
+                news = safe_dataframe_to_records(news_data)
+            elif news_data:
+                # その他のデータ型の場合
+                news = news_data if isinstance(news_data, list) else []
+        except Exception as e:
+            news = {'error': f'ニュース取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'news': news,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        return result
+    except Exception as e:
+        return {'error': f'ニュース情報取得エラー: {str(e)}'}
+
+def get_stock_options_api(ticker):
+    """オプション情報取得API"""
+    try:
+        stock = yf.Ticker(ticker)
+
+        # オプション
+        options_data = []
+        try:
+            options_dates = stock.options
+            if options_dates:
+                expiry = options_dates[0]
+                chain = stock.option_chain(expiry)
+                calls_data = [{
+                    'strike': float(r['strike']) if not pd.isna(r['strike']) else 0.0,
+                    'last_price': float(r['lastPrice']) if not pd.isna(r['lastPrice']) else 0.0,
+                    'bid': float(r['bid']) if not pd.isna(r['bid']) else 0.0,
+                    'ask': float(r['ask']) if not pd.isna(r['ask']) else 0.0,
+                    'volume': int(r['volume']) if not pd.isna(r['volume']) else 0,
+                    'open_interest': int(r['openInterest']) if not pd.isna(r['openInterest']) else 0
+                } for _, r in chain.calls.iterrows()]
+                puts_data = [{
+                    'strike': float(r['strike']) if not pd.isna(r['strike']) else 0.0,
+                    'last_price': float(r['lastPrice']) if not pd.isna(r['lastPrice']) else 0.0,
+                    'bid': float(r['bid']) if not pd.isna(r['bid']) else 0.0,
+                    'ask': float(r['ask']) if not pd.isna(r['ask']) else 0.0,
+                    'volume': int(r['volume']) if not pd.isna(r['volume']) else 0,
+                    'open_interest': int(r['openInterest']) if not pd.isna(r['openInterest']) else 0
+                } for _, r in chain.puts.iterrows()]
+                options_data = {'expiry_date': expiry, 'calls': calls_data, 'puts': puts_data}
+        except Exception as e:
+            options_data = {'error': f'オプション情報取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'options': options_data,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        return result
+    except Exception as e:
+        return {'error': f'オプション情報取得エラー: {str(e)}'}
+
+def get_stock_sustainability_api(ticker):
+    """ESG情報取得API"""
+    try:
+        stock = yf.Ticker(ticker)
+
+        # ESG情報
+        sustainability_data = {}
+        try:
+            sustainability = stock.get_sustainability()
+            if not sustainability.empty:
+                sustainability_data = safe_dataframe_to_dict(sustainability)
+        except Exception as e:
+            sustainability_data = {'error': f'ESG情報取得エラー: {str(e)}'}
+
+        result = {
+            'ticker': ticker,
+            'sustainability': sustainability_data,
+            'execution_info': get_execution_info('LAMBDA'),
+            'timestamp': datetime.now().isoformat()
+        }
+        return result
+    except Exception as e:
+        return {'error': f'ESG情報取得エラー: {str(e)}'}
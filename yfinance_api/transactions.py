@@ -0,0 +1,261 @@
+"""取引履歴ストア（TRANSACTIONS_TABLE: pk=email, sk=<timestamp>#<id>）
+
+取引は1件1アイテムで保存し、ユーザーアイテムの大きさ（400KB上限）に依存しない。
+一覧はカーソル（LastEvaluatedKey を base64url 化したもの）でページングする。
+
+旧形式（Users テーブルの transactions リスト）からの移行:
+  python -m yfinance_api.transactions migrate [--email EMAIL] [--dry-run]
+移行したユーザーの保有（HOLDINGS_TABLE）は移行後の取引履歴から作り直す。
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .dynamo import get_table
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# sk の上限側。ISO 8601 で使う文字（数字・-・T・:・.）より大きい
+_SK_UPPER = '~'
+
+
+def _get_transactions_table():
+    table_name = os.environ.get('TRANSACTIONS_TABLE', '')
+    if not table_name:
+        raise RuntimeError('TRANSACTIONS_TABLE is not configured')
+    return get_table(table_name)
+
+
+def transaction_sort_key(txn: Dict[str, Any]) -> str:
+    return f"{txn['timestamp']}#{txn['id']}"
+
+
+def _to_item(email: str, txn: Dict[str, Any]) -> Dict[str, Any]:
+    return {**txn, 'email': email, 'sk': transaction_sort_key(txn)}
+
+
+def _from_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in item.items() if k not in ('email', 'sk')}
+
+
+def put_transaction(email: str, txn: Dict[str, Any]) -> None:
+    """取引を1件追加する（同じ sk が既にあれば上書きしない）"""
+    _get_transactions_table().put_item(
+        Item=_to_item(email, txn),
+        ConditionExpression='attribute_not_exists(sk)',
+    )
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str, email: str) -> Dict[str, Any]:
+    """カーソルを ExclusiveStartKey に戻す（他ユーザーのキーや不正な値は ValueError）"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('cursor が不正です')
+    if not isinstance(key, dict) or key.get('email') != email or not isinstance(key.get('sk'), str):
+        raise ValueError('cursor が不正です')
+    return {'email': email, 'sk': key['sk']}
+
+
+def _parse_bound(value: Optional[str], name: str) -> Optional[str]:
+    if not value:
+        return None
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} は ISO 8601 形式（例: 2025-01-31 または 2025-01-31T09:00:00）で指定してください')
+    return value
+
+
+def query_transactions(email: str, since: Optional[str] = None, until: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                       descending: bool = False) -> Dict[str, Any]:
+    """取引履歴を1ページ取得する
+
+    since / until は timestamp の前方一致で比較する（until は当日・当該時刻を含む）。
+    """
+    since = _parse_bound(since, 'since')
+    until = _parse_bound(until, 'until')
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+    key_condition = 'email = :e'
+    values: Dict[str, Any] = {':e': email}
+    if since and until:
+        key_condition += ' AND sk BETWEEN :since AND :until'
+        values.update({':since': since, ':until': until + _SK_UPPER})
+    elif since:
+        key_condition += ' AND sk >= :since'
+        values[':since'] = since
+    elif until:
+        key_condition += ' AND sk <= :until'
+        values[':until'] = until + _SK_UPPER
+
+    params: Dict[str, Any] = {
+        'KeyConditionExpression': key_condition,
+        'ExpressionAttributeValues': values,
+        'Limit': limit,
+        'ScanIndexForward': not descending,
+    }
+    if cursor:
+        params['ExclusiveStartKey'] = decode_cursor(cursor, email)
+
+    res = _get_transactions_table().query(**params)
+    items = [_from_item(item) for item in res.get('Items', [])]
+    return {
+        'transactions': items,
+        'count': len(items),
+        'next_cursor': encode_cursor(res.get('LastEvaluatedKey')),
+    }
+
+
+def _iter_items(table: Any, email: str, projection: Optional[str] = None):
+    params: Dict[str, Any] = {
+        'KeyConditionExpression': 'email = :e',
+        'ExpressionAttributeValues': {':e': email},
+    }
+    if projection:
+        params['ProjectionExpression'] = projection
+    while True:
+        res = table.query(**params)
+        for item in res.get('Items', []):
+            yield item
+        if not res.get('LastEvaluatedKey'):
+            return
+        params['ExclusiveStartKey'] = res['LastEvaluatedKey']
+
+
+def _iter_keys(table: Any, email: str):
+    return _iter_items(table, email, 'email, sk')
+
+
+def iter_transactions(email: str):
+    """ユーザーの取引を時系列順にすべて返す（保有の再計算用）"""
+    for item in _iter_items(_get_transactions_table(), email):
+        yield _from_item(item)
+
+
+def delete_all_transactions(email: str) -> int:
+    """ユーザーの取引をすべて削除し、削除件数を返す"""
+    table = _get_transactions_table()
+    deleted = 0
+    with table.batch_writer() as batch:
+        for key in _iter_keys(table, email):
+            batch.delete_item(Key={'email': key['email'], 'sk': key['sk']})
+            deleted += 1
+    return deleted
+
+
+def migrate_embedded_transactions(users_table: Any, email: Optional[str] = None,
+                                  dry_run: bool = False) -> Dict[str, int]:
+    """Users テーブルの transactions リストを取引テーブルへ移し、元のリストを削除する
+
+    sk は取引の timestamp と id から決まるため、途中で失敗しても再実行すれば重複しない。
+    リストの削除は件数が移行時点と同じ場合だけ行う（移行中に追加された分は次回に回す）。
+    移行したユーザーは続けて保有を取引履歴から作り直す（dry_run では行わない）。
+    """
+    from botocore.exceptions import ClientError
+    from .holdings import rebuild_holdings
+
+    table = _get_transactions_table()
+    stats = {'users': 0, 'transactions': 0, 'skipped': 0, 'holdings_rebuilt': 0}
+
+    if email:
+        item = users_table.get_item(
+            Key={'email': email},
+            ProjectionExpression='email, transactions',
+        ).get('Item')
+        users = [item] if item else []
+    else:
+        users = []
+        params: Dict[str, Any] = {
+            'ProjectionExpression': 'email, transactions',
+            'FilterExpression': 'attribute_exists(transactions)',
+        }
+        while True:
+            res = users_table.scan(**params)
+            users.extend(res.get('Items', []))
+            if not res.get('LastEvaluatedKey'):
+                break
+            params['ExclusiveStartKey'] = res['LastEvaluatedKey']
+
+    for user in users:
+        txns: List[Dict[str, Any]] = [t for t in (user.get('transactions') or []) if t.get('id') and t.get('timestamp')]
+        stats['skipped'] += len(user.get('transactions') or []) - len(txns)
+        if dry_run:
+            stats['users'] += 1
+            stats['transactions'] += len(txns)
+            continue
+        with table.batch_writer(overwrite_by_pkeys=['email', 'sk']) as batch:
+            for txn in txns:
+                batch.put_item(Item=_to_item(user['email'], txn))
+        try:
+            users_table.update_item(
+                Key={'email': user['email']},
+                UpdateExpression='REMOVE transactions',
+                ConditionExpression='size(transactions) = :n',
+                ExpressionAttributeValues={':n': len(user.get('transactions') or [])},
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            print(f"{user['email']}: 移行中に取引が追加されたため、リストを残しました（再実行してください）")
+        report = rebuild_holdings(user['email'])
+        stats['holdings_rebuilt'] += 1
+        for rejected in report['rejected']:
+            print(f"{user['email']}: 保有に反映できない取引があります: {json.dumps(rejected, ensure_ascii=False)}")
+        stats['users'] += 1
+        stats['transactions'] += len(txns)
+    return stats
+
+
+def parse_page_parameters(query_parameters: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """GET /user/transactions のクエリを query_transactions の引数に変換（戻り値: (引数, エラー)）"""
+    q = query_parameters or {}
+    try:
+        limit = int(q.get('limit') or DEFAULT_PAGE_SIZE)
+    except (TypeError, ValueError):
+        return {}, 'limit は整数で指定してください'
+    order = str(q.get('order') or 'asc').lower()
+    if order not in ('asc', 'desc'):
+        return {}, 'order は asc または desc を指定してください'
+    return {
+        'since': q.get('since') or None,
+        'until': q.get('until') or None,
+        'limit': limit,
+        'cursor': q.get('cursor') or None,
+        'descending': order == 'desc',
+    }, None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='取引履歴テーブルの管理')
+    subparsers = parser.add_subparsers(dest='command')
+    migrate = subparsers.add_parser('migrate', help='Users テーブルの transactions リストを取引テーブルへ移行')
+    migrate.add_argument('--email', help='対象ユーザー（省略時は全ユーザー）')
+    migrate.add_argument('--dry-run', action='store_true', help='件数の確認のみ')
+    args = parser.parse_args(argv)
+
+    if args.command == 'migrate':
+        from .auth import _get_users_table
+        stats = migrate_embedded_transactions(_get_users_table(), args.email, args.dry_run)
+        print(json.dumps(stats, ensure_ascii=False))
+        return 0
+    parser.print_help()
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
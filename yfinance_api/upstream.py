@@ -0,0 +1,242 @@
+"""上流ホストごとのレートリミッター（トークンバケット）とサーキットブレーカー
+
+負荷が高いとコンテナが一斉に Yahoo に問い合わせて 429 を受け、各ループの例外処理で銘柄が
+黙って落ちる。ここではホストごとに送信レートを抑え、429 / 5xx / 接続エラーが続いたホストは
+一定時間ブレーカーを開いて即座に失敗させる（上流を叩き続けずにキャッシュ済みのデータを返す）。
+
+yfinance の HTTP リクエスト（YfData._make_request）と非同期取得層（aiofetch）の両方に掛かる。
+平常時以外のホストの状態は upstream_status() で応答（execution_info.upstream など）に載せる。
+ブレーカーの開閉と、リクエストごとの平常時以外のホストの状態は1行の JSON（logger=upstream）で出力する。
+
+環境変数:
+- UPSTREAM_RATE_PER_SEC     : ホストごとの送信レート（リクエスト/秒, 既定: 20。0 で無効）
+- UPSTREAM_BURST            : トークンバケットの容量（既定: 40）
+- UPSTREAM_MAX_THROTTLE_WAIT: トークン待ちの上限秒。超える場合は待たずに失敗（既定: 2）
+- BREAKER_FAILURE_THRESHOLD : ブレーカーを開く連続失敗数（既定: 5）
+- BREAKER_OPEN_SEC          : ブレーカーを開いておく秒数。経過後は1件だけ試す（既定: 30）
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from .deadline import remaining
+
+UPSTREAM_RATE_PER_SEC = float(os.environ.get('UPSTREAM_RATE_PER_SEC', '20'))
+UPSTREAM_BURST = float(os.environ.get('UPSTREAM_BURST', '40'))
+UPSTREAM_MAX_THROTTLE_WAIT = float(os.environ.get('UPSTREAM_MAX_THROTTLE_WAIT', '2'))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_OPEN_SEC = float(os.environ.get('BREAKER_OPEN_SEC', '30'))
+
+# yfinance が使う Yahoo Finance のホスト（キャッシュを返すかの判定に使う）
+YAHOO_HOSTS = ('query1.finance.yahoo.com', 'query2.finance.yahoo.com', 'fc.yahoo.com')
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+# スロットリング・拒否がこの秒数以内にあったホストは平常時ではないとして応答に載せる
+STATUS_WINDOW_SEC = 60
+
+
+class UpstreamUnavailable(RuntimeError):
+    """ブレーカーが開いている、またはレート制限の待ちが長すぎるため上流に送らなかった"""
+
+
+def _log(event: str, host: str, **fields: Any) -> None:
+    print(json.dumps({'logger': 'upstream', 'event': event, 'host': host, **fields}, ensure_ascii=False))
+
+
+class HostGuard:
+    """1ホスト分のトークンバケットとサーキットブレーカー"""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.lock = threading.Lock()
+        self.tokens = UPSTREAM_BURST
+        self.updated = time.monotonic()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.limited_at = None
+        self.stats = {'requests': 0, 'failures': 0, 'throttled': 0, 'throttle_wait_ms': 0,
+                      'rejected': 0, 'opened': 0}
+
+    def _admit(self) -> None:
+        """ブレーカーの判定（開いていれば UpstreamUnavailable。ロック内で呼ぶ）"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < BREAKER_OPEN_SEC:
+                self._count('rejected')
+                raise UpstreamUnavailable(f'{self.host}: サーキットブレーカー open（上流停止中）')
+            self.state = HALF_OPEN
+            self.trial_in_flight = False
+            _log('breaker_half_open', self.host)
+        if self.state == HALF_OPEN:
+            if self.trial_in_flight:
+                self._count('rejected')
+                raise UpstreamUnavailable(f'{self.host}: サーキットブレーカー half_open（試行中）')
+            self.trial_in_flight = True
+
+    def _reserve(self) -> float:
+        """トークンを1つ予約して送信までの待ち秒を返す（待ちが上限を超えれば UpstreamUnavailable。ロック内で呼ぶ）"""
+        if UPSTREAM_RATE_PER_SEC <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(UPSTREAM_BURST, self.tokens + (now - self.updated) * UPSTREAM_RATE_PER_SEC)
+        self.updated = now
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / UPSTREAM_RATE_PER_SEC
+        left = remaining()
+        limit = UPSTREAM_MAX_THROTTLE_WAIT if left is None else min(UPSTREAM_MAX_THROTTLE_WAIT, left)
+        if wait > limit:
+            self._count('rejected')
+            raise UpstreamUnavailable(f'{self.host}: レート制限（待ち {wait:.1f}秒）')
+        self.tokens -= 1
+        if wait > 0:
+            self._count('throttled')
+            self.stats['throttle_wait_ms'] += int(wait * 1000)
+        return wait
+
+    def _count(self, name: str) -> None:
+        self.stats[name] += 1
+        self.limited_at = time.monotonic()
+
+    def acquire(self) -> float:
+        """送信してよいか判定してトークンを予約する（戻り値: 送信前に待つ秒）"""
+        with self.lock:
+            self._admit()
+            try:
+                wait = self._reserve()
+            except UpstreamUnavailable:
+                self.trial_in_flight = False
+                raise
+            self.stats['requests'] += 1
+            return wait
+
+    def record(self, ok: bool) -> None:
+        with self.lock:
+            self.trial_in_flight = False
+            if ok:
+                if self.state != CLOSED:
+                    _log('breaker_closed', self.host)
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.stats['failures'] += 1
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= BREAKER_FAILURE_THRESHOLD:
+                if self.state != OPEN:
+                    self.stats['opened'] += 1
+                    _log('breaker_open', self.host, failures=self.failures, open_sec=BREAKER_OPEN_SEC)
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            state = self.state
+            if state == OPEN and time.monotonic() - self.opened_at >= BREAKER_OPEN_SEC:
+                state = HALF_OPEN
+            limited = self.limited_at is not None and time.monotonic() - self.limited_at < STATUS_WINDOW_SEC
+            return {'breaker': state, 'consecutive_failures': self.failures,
+                    'tokens': round(self.tokens, 1), 'recently_limited': limited, **self.stats}
+
+
+_guards: Dict[str, HostGuard] = {}
+_guards_lock = threading.Lock()
+_installed = False
+
+
+def guard_for(url_or_host: str) -> HostGuard:
+    host = urlsplit(url_or_host).hostname if '//' in url_or_host else url_or_host
+    host = host or ''
+    guard = _guards.get(host)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.setdefault(host, HostGuard(host))
+    return guard
+
+
+def is_failure_status(status: Optional[int]) -> bool:
+    return status is not None and (status == 429 or status >= 500)
+
+
+def before_request(url: str) -> HostGuard:
+    """同期の送信前処理（ブレーカー判定とレート制限の待ち）"""
+    guard = guard_for(url)
+    wait = guard.acquire()
+    if wait > 0:
+        time.sleep(wait)
+    return guard
+
+
+async def before_request_async(url: str) -> HostGuard:
+    """非同期版の送信前処理（待ちはイベントループを止めない）"""
+    # asyncio は非同期取得層を使うときだけ読み込む（他のルートのコールドスタートを重くしない）
+    import asyncio
+
+    guard = guard_for(url)
+    wait = guard.acquire()
+    if wait > 0:
+        await asyncio.sleep(wait)
+    return guard
+
+
+def upstream_open(hosts=YAHOO_HOSTS) -> bool:
+    """いずれかのホストのブレーカーが開いているか（キャッシュ済みデータを返す判定用）"""
+    for host in hosts:
+        guard = _guards.get(host)
+        if guard is not None and guard.snapshot()['breaker'] == OPEN:
+            return True
+    return False
+
+
+def upstream_status() -> Dict[str, Dict[str, Any]]:
+    """平常時（ブレーカーが閉じていて直近にスロットリングも拒否もない）以外のホストの状態（応答に載せる用）"""
+    status = {}
+    for host, guard in list(_guards.items()):
+        snapshot = guard.snapshot()
+        if snapshot['breaker'] != CLOSED or snapshot['recently_limited']:
+            status[host] = snapshot
+    return status
+
+
+def upstream_metrics() -> Dict[str, Dict[str, Any]]:
+    """全ホストの状態と累計件数"""
+    return {host: guard.snapshot() for host, guard in list(_guards.items())}
+
+
+def log_upstream_metrics(route: str) -> None:
+    """平常時以外のホストがあれば、そのリクエストの終わりに状態を1行の JSON で出力する（メトリクスフィルター用）"""
+    status = upstream_status()
+    if status:
+        print(json.dumps({'logger': 'upstream', 'event': 'status', 'route': route, 'hosts': status},
+                         ensure_ascii=False))
+
+
+def install_yfinance_guard() -> None:
+    """yfinance の HTTP リクエスト（YfData._make_request）にレート制限とブレーカーを組み込む"""
+    global _installed
+    if _installed:
+        return
+    with _guards_lock:
+        if _installed:
+            return
+        try:
+            from yfinance.data import YfData
+        except Exception:
+            _installed = True
+            return
+        original = YfData._make_request
+
+        def _guarded_make_request(self, url, *args, **kwargs):
+            guard = before_request(url)
+            try:
+                response = original(self, url, *args, **kwargs)
+            except Exception:
+                guard.record(False)
+                raise
+            guard.record(not is_failure_status(getattr(response, 'status_code', None)))
+            return response
+
+        YfData._make_request = _guarded_make_request
+        _installed = True
@@ -0,0 +1,136 @@
+"""ユーザーアイテム（USERS_TABLE: pk=email）の読み込み層
+
+ルートごとに必要な属性だけを ProjectionExpression で読む（パスワードハッシュやプロフィールなど、
+使わない属性を転送・デシリアライズしない）。消費キャパシティは項目全体のサイズで決まるため、
+RCU の削減は同じキーの重複読み込みをなくすことで行い、射影は応答サイズと処理時間を減らす。
+
+環境変数:
+- DYNAMODB_DEBUG_CAPACITY: 1 の場合、ReturnConsumedCapacity=TOTAL を付けて呼び出しごとに
+  消費キャパシティを JSON で出力し、リクエスト単位の合計を consumed_capacity() で返す
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+# ルート → 読み込む属性
+ROUTE_ATTRIBUTES = {
+    'user_base': ('base',),
+    'user_securities': ('securities',),
+    'user_favorites': ('favorite_symbols', 'favorites'),
+    'user_me': ('email', 'name', 'profile', 'created_at', 'updated_at'),
+    'user_profile': ('profile',),
+    'auth_login': ('email', 'password'),
+    'auth_exists': ('email',),
+}
+
+_capacity = threading.local()
+
+
+def capacity_debug_enabled() -> bool:
+    return os.environ.get('DYNAMODB_DEBUG_CAPACITY', '').lower() in ('1', 'true', 'yes')
+
+
+def reset_consumed_capacity() -> None:
+    _capacity.total = 0.0
+    _capacity.calls = []
+
+
+def consumed_capacity() -> Dict[str, Any]:
+    """reset_consumed_capacity() 以降にこのスレッドで記録した消費キャパシティ"""
+    return {
+        'capacity_units': round(getattr(_capacity, 'total', 0.0), 4),
+        'calls': list(getattr(_capacity, 'calls', [])),
+    }
+
+
+def call_table(table: Any, operation: str, label: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+    """Table のメソッドを呼ぶ（デバッグ時は消費キャパシティを付けて記録する）"""
+    if not capacity_debug_enabled():
+        return getattr(table, operation)(**params)
+    res = getattr(table, operation)(ReturnConsumedCapacity='TOTAL', **params)
+    units = float((res.get('ConsumedCapacity') or {}).get('CapacityUnits') or 0)
+    record = {'op': operation, 'table': table.name, 'route': label, 'capacity_units': units}
+    if 'ProjectionExpression' in params:
+        names = params.get('ExpressionAttributeNames') or {}
+        record['projection'] = [names.get(p.strip(), p.strip()) for p in params['ProjectionExpression'].split(',')]
+    if not hasattr(_capacity, 'calls'):
+        reset_consumed_capacity()
+    _capacity.total += units
+    _capacity.calls.append(record)
+    print(json.dumps({'logger': 'dynamodb', **record}, ensure_ascii=False))
+    return res
+
+
+def get_user_attributes(table: Any, email: str, attrs: Iterable[str],
+                        label: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """指定属性だけを読む（アイテムが無ければ None。キー属性 email は常に含む）"""
+    names = {'#k': 'email', **{f'#a{i}': a for i, a in enumerate(a for a in attrs if a != 'email')}}
+    return call_table(
+        table, 'get_item', label,
+        Key={'email': email},
+        ProjectionExpression=', '.join(names),
+        ExpressionAttributeNames=names,
+    ).get('Item')
+
+
+def get_route_attributes(table: Any, email: str, route: str) -> Optional[Dict[str, Any]]:
+    """ROUTE_ATTRIBUTES に宣言したルートの属性を読む"""
+    return get_user_attributes(table, email, ROUTE_ATTRIBUTES[route], label=route)
+
+
+def new_user_item(email: str) -> Dict[str, Any]:
+    now = datetime.utcnow().isoformat()
+    return {
+        'email': email,
+        'name': '',
+        'created_at': now,
+        'updated_at': now,
+        'profile': {},
+        'base': {},
+        'securities': {},
+    }
+
+
+class UserItem:
+    """1リクエスト内のユーザーアイテム読み込み
+
+    ルートが必要とする属性だけを読み、同じ属性は2回読まない。
+    アイテムが無ければ条件付き put 1回で最小項目を作る（同時作成された場合はそちらを読み直す）。
+    """
+
+    def __init__(self, email: str, table: Any):
+        self.email = email
+        self.table = table
+        self._item: Dict[str, Any] = {}
+        self._loaded: set = set()
+
+    def get(self, *attrs: str, label: Optional[str] = None) -> Dict[str, Any]:
+        """指定属性を返す（未読の属性だけを読む）"""
+        missing = [a for a in attrs if a not in self._loaded]
+        if missing:
+            item = get_user_attributes(self.table, self.email, missing, label=label)
+            if item is None:
+                item = self._create()
+            self._item.update({a: item.get(a) for a in missing})
+            self._loaded.update(missing)
+        return {a: self._item.get(a) for a in attrs}
+
+    def route(self, route: str) -> Dict[str, Any]:
+        """ROUTE_ATTRIBUTES に宣言したルートの属性を返す"""
+        return self.get(*ROUTE_ATTRIBUTES[route], label=route)
+
+    def _create(self) -> Dict[str, Any]:
+        from botocore.exceptions import ClientError
+
+        item = new_user_item(self.email)
+        try:
+            call_table(self.table, 'put_item', 'create_user',
+                       Item=item, ConditionExpression='attribute_not_exists(email)')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            return call_table(self.table, 'get_item', 'create_user', Key={'email': self.email}).get('Item') or item
+        return item
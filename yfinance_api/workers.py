@@ -0,0 +1,139 @@
+"""コンテナ共有のワーカープール（/home のセクション並行取得）
+
+リクエストごとに ThreadPoolExecutor を作って wait=False で捨てると、タイムアウトしたタスクの
+スレッドがウォーム起動をまたいで積み上がり、次のリクエストと CPU・接続を取り合う。
+ここではコンテナで1つのプールを使い回し、実行中＋待機中のタスク数（in-flight）に上限を設ける。
+
+呼び出し元が待つのをやめたタスクは abandon() で手放す。まだ始まっていなければ取り消し、
+実行中なら止めずに完了させる（結果は呼び出し元が add_done_callback で登録したキャッシュに入る）。
+
+/home のセクション・/tickerDetail のセクション（ticker._collect_sections）・銘柄プロファイルの
+取得（quotes.get_profiles）が同じプールを使う。プールのスレッドからの投入（セクションの中での
+プロファイル取得など）は、空きスレッドがなければ呼び出し元のスレッドでそのまま実行する
+（セクションがスレッドを埋めて内側のタスクが待ち続けるのを避ける）。
+
+環境変数:
+- WORKER_MAX_THREADS  : スレッド数（既定: 10）
+- WORKER_MAX_IN_FLIGHT: 実行中＋待機中のタスク上限（既定: 40。超えた投入は WorkerPoolFull）
+"""
+
+import concurrent.futures
+import os
+import threading
+from typing import Any, Callable, Dict
+
+from .deadline import submit as submit_with_deadline
+
+WORKER_MAX_THREADS = int(os.environ.get('WORKER_MAX_THREADS', '10'))
+WORKER_MAX_IN_FLIGHT = int(os.environ.get('WORKER_MAX_IN_FLIGHT', '40'))
+THREAD_NAME_PREFIX = 'yfapi-worker'
+
+_lock = threading.Lock()
+_executor = None
+_in_flight = 0
+_running = 0
+_abandoned = set()
+_stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'rejected': 0,
+          'abandoned': 0, 'abandoned_completed': 0, 'inline': 0}
+
+
+class WorkerPoolFull(RuntimeError):
+    """in-flight のタスク数が上限に達している"""
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=WORKER_MAX_THREADS, thread_name_prefix=THREAD_NAME_PREFIX)
+    return _executor
+
+
+def _on_done(future: concurrent.futures.Future) -> None:
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+        if future.cancelled():
+            _stats['cancelled'] += 1
+        elif future.exception() is not None:
+            _stats['failed'] += 1
+        else:
+            _stats['completed'] += 1
+        if future in _abandoned:
+            _abandoned.discard(future)
+            if not future.cancelled():
+                _stats['abandoned_completed'] += 1
+
+
+def _run_inline(fn: Callable, *args: Any, **kwargs: Any) -> concurrent.futures.Future:
+    """呼び出し元のスレッドで実行して完了済みの Future を返す"""
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    with _lock:
+        _stats['inline'] += 1
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except BaseException as e:
+        future.set_exception(e)
+    return future
+
+
+def submit(fn: Callable, *args: Any, **kwargs: Any) -> concurrent.futures.Future:
+    """共有プールにタスクを投入する（現在のデッドラインを引き継ぐ。上限超過は WorkerPoolFull）
+
+    プールのスレッドから呼ばれ、空きスレッドがなければ呼び出し元のスレッドで実行する。
+    """
+    global _in_flight
+
+    def _run():
+        global _running
+        with _lock:
+            _running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with _lock:
+                _running -= 1
+
+    executor = _get_executor()
+    if threading.current_thread().name.startswith(THREAD_NAME_PREFIX):
+        with _lock:
+            busy = _in_flight >= WORKER_MAX_THREADS
+        if busy:
+            return _run_inline(fn, *args, **kwargs)
+    with _lock:
+        if _in_flight >= WORKER_MAX_IN_FLIGHT:
+            _stats['rejected'] += 1
+            raise WorkerPoolFull(f'ワーカーが混雑しています（in-flight {_in_flight}/{WORKER_MAX_IN_FLIGHT}）')
+        _in_flight += 1
+        _stats['submitted'] += 1
+    future = submit_with_deadline(executor, _run)
+    future.add_done_callback(_on_done)
+    return future
+
+
+def abandon(future: concurrent.futures.Future) -> None:
+    """呼び出し元が結果を待たなくなったタスクを手放す（未開始なら取り消し、実行中なら完了させる）"""
+    if future.cancel():
+        return
+    with _lock:
+        if not future.done():
+            _abandoned.add(future)
+            _stats['abandoned'] += 1
+
+
+def worker_stats() -> Dict[str, int]:
+    """スレッド数・キューの深さ・in-flight 数と累計の件数"""
+    with _lock:
+        threads = len(getattr(_executor, '_threads', ())) if _executor is not None else 0
+        return {
+            'max_threads': WORKER_MAX_THREADS,
+            'threads': threads,
+            'running': _running,
+            'queued': _in_flight - _running,
+            'in_flight': _in_flight,
+            'max_in_flight': WORKER_MAX_IN_FLIGHT,
+            'abandoned_running': len(_abandoned),
+            **_stats,
+        }